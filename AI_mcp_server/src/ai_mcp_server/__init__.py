@@ -1,15 +1,23 @@
-"""
-AI MCP Server - Unified Rhino & Grasshopper Integration
-
-A unified Model Context Protocol (MCP) server that integrates both Rhino and Grasshopper
-functionality, providing AI agents with comprehensive 3D modeling and parametric design capabilities.
-"""
-
-__version__ = "1.0.0"
-__author__ = "AI MCP Server Team"
-__email__ = "team@ai-mcp-server.com"
-
-from .core.server import AIServer
-from .core.config import Config
-
-__all__ = ["AIServer", "Config"]
+"""
+AI MCP Server - Unified Rhino & Grasshopper Integration
+
+A unified Model Context Protocol (MCP) server that integrates both Rhino and Grasshopper
+functionality, providing AI agents with comprehensive 3D modeling and parametric design capabilities.
+"""
+
+__version__ = "1.0.0"
+__author__ = "AI MCP Server Team"
+__email__ = "team@ai-mcp-server.com"
+
+__all__ = ["AIServer", "Config"]
+
+
+def __getattr__(name):
+    # Imported on first access, so loading a submodule does not pull in the MCP SDK
+    if name == "AIServer":
+        from .core.server import AIServer
+        return AIServer
+    if name == "Config":
+        from .core.config import Config
+        return Config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,11 @@
+"""
+Throughput and latency benchmarks against the local simulators
+"""
+
+from .runner import BenchmarkResult, Scenario, compare, load_results, run_benchmarks, save_results
+from .scenarios import default_scenarios
+
+__all__ = [
+    "BenchmarkResult", "Scenario", "compare", "default_scenarios", "load_results",
+    "run_benchmarks", "save_results",
+]
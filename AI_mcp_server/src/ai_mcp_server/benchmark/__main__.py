@@ -0,0 +1,81 @@
+"""
+Run the benchmark scenarios and save the results as JSON
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from ..core.config import Config
+from ..simulator import SimulatorOptions
+from .runner import compare, load_results, run_benchmarks, save_results
+from .scenarios import default_scenarios
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the tools and bridges against simulated Rhino and Grasshopper plugins. "
+                    "Bridge settings are read from the usual RHINO_*, GRASSHOPPER_* and AI_MCP_* variables."
+    )
+    parser.add_argument("--output", "-o", type=Path, default=Path("benchmark-results.json"),
+                        help="Results file (default: benchmark-results.json)")
+    parser.add_argument("--scenario", "-k", action="append", default=[],
+                        help="Only run scenarios whose name contains this text (repeatable)")
+    parser.add_argument("--list", action="store_true", help="List the scenarios and exit")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of the iterations")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every scenario's iteration count")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated plugin latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Simulated latency spread in seconds")
+    parser.add_argument("--document-size", type=int, default=20000, help="Objects in the large document")
+    parser.add_argument("--object-padding", type=int, default=200, help="Extra bytes per large-document object")
+    parser.add_argument("--catalog-size", type=int, default=2000, help="Generated Grasshopper catalog components")
+    parser.add_argument("--sync-objects", type=int, default=1000, help="Objects in the sync scenarios")
+    parser.add_argument("--compare", type=Path, help="Baseline results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline as a fraction (default: 0.2)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    scenarios = default_scenarios(args.document_size, args.object_padding, args.sync_objects)
+    if args.scenario:
+        scenarios = [s for s in scenarios if any(text in s.name for text in args.scenario)]
+    if args.list or not scenarios:
+        for scenario in scenarios:
+            print(f"{scenario.name:<34} {scenario.description}")
+        return
+
+    scale = args.scale * (0.1 if args.quick else 1.0)
+    options = SimulatorOptions(latency=args.latency, jitter=args.jitter, catalog_size=args.catalog_size, seed=0)
+    config = Config.from_env()
+    # Keep the server's own logging out of the report
+    config.server.log_level = "WARNING"
+
+    results = asyncio.run(run_benchmarks(scenarios, config, options, scale, report=lambda r: print(r.line())))
+    settings = {
+        "scale": scale, "latency": args.latency, "jitter": args.jitter,
+        "document_size": args.document_size, "object_padding": args.object_padding,
+        "catalog_size": args.catalog_size, "sync_objects": args.sync_objects,
+        "rhino": config.rhino.model_dump(exclude={"host", "port", "catalog_path"}),
+        "grasshopper": config.grasshopper.model_dump(exclude={"host", "port", "catalog_path"}),
+    }
+    save_results(args.output, results, settings)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, load_results(args.compare), args.tolerance)
+        if regressions:
+            print(f"Regressions against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
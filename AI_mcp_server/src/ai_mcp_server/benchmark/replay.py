@@ -0,0 +1,223 @@
+"""
+Replay a recorded session against simulated or real platforms
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import Config
+from ..simulator import SimulatorOptions
+from ..utils.recording import read_recording
+from .runner import BenchmarkResult, BenchmarkSession, SimulatorThread, compare, load_results, save_results
+
+
+@dataclass
+class ReplayReport:
+    """Per-name latencies of a replay next to those of the recording"""
+    layer: str
+    speed: float
+    calls: int
+    seconds: float
+    recorded_seconds: float
+    max_lag_ms: float
+    replayed: List[BenchmarkResult]
+    recorded: List[BenchmarkResult]
+
+
+def load_trace(path: Path, layer: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """Records of one layer in start order, with ``at`` offsets in seconds
+
+    Sessions appended to the same file are laid end to end. Without
+    ``layer``, tool calls are replayed if the file has any, otherwise
+    bridge commands.
+    """
+    records: List[Dict[str, Any]] = []
+    base = end = 0.0
+    for entry in read_recording(path):
+        if "session" in entry:
+            base = end
+            continue
+        entry["at"] = base + entry["t"]
+        end = max(end, entry["at"] + entry["duration_ms"] / 1000)
+        records.append(entry)
+    if layer is None:
+        layer = "tool" if any(record["layer"] == "tool" for record in records) else "bridge"
+    selected = sorted((record for record in records if record["layer"] == layer), key=lambda r: r["at"])
+    return layer, selected
+
+
+def _results(samples: Dict[str, List[float]], errors: Dict[str, int]) -> List[BenchmarkResult]:
+    return [BenchmarkResult.from_latencies(name, latencies, 1, errors.get(name, 0))
+            for name, latencies in sorted(samples.items())]
+
+
+def _recorded(records: List[Dict[str, Any]]) -> List[BenchmarkResult]:
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for record in records:
+        samples[record["name"]].append(record["duration_ms"] / 1000)
+        if record["status"] != "success":
+            errors[record["name"]] += 1
+    return _results(samples, errors)
+
+
+async def replay(session: BenchmarkSession, records: List[Dict[str, Any]], layer: str,
+                 speed: float = 1.0, concurrency: int = 1,
+                 logger: Optional[logging.Logger] = None) -> ReplayReport:
+    """Send the recorded calls again and time them
+
+    With a positive ``speed`` each call starts at its recorded offset
+    divided by ``speed`` (1 is real time), whether or not earlier calls
+    have finished. With ``speed`` 0 calls run back to back, up to
+    ``concurrency`` at a time.
+    """
+    logger = logger or logging.getLogger(__name__)
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async def execute(record: Dict[str, Any]) -> None:
+        name = record["name"]
+        started = time.perf_counter()
+        try:
+            if layer == "tool":
+                await session.call_tool(name, **record["params"])
+            else:
+                bridge = session.rhino_bridge if record.get("platform") == "rhino" else session.grasshopper_bridge
+                await bridge.send_command(name, record["params"])
+        except Exception as e:
+            errors[name] += 1
+            logger.debug(f"Replayed {name} failed: {e}")
+        samples[name].append(time.perf_counter() - started)
+
+    first = records[0]["at"] if records else 0.0
+    max_lag = 0.0
+    started = time.perf_counter()
+    if speed > 0:
+        tasks = []
+        for record in records:
+            delay = (record["at"] - first) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            tasks.append(asyncio.create_task(execute(record)))
+        await asyncio.gather(*tasks)
+    else:
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def limited(record: Dict[str, Any]) -> None:
+            async with slots:
+                await execute(record)
+
+        await asyncio.gather(*(limited(record) for record in records))
+    seconds = time.perf_counter() - started
+
+    recorded_end = max((record["at"] + record["duration_ms"] / 1000 for record in records), default=first)
+    return ReplayReport(
+        layer=layer,
+        speed=speed,
+        calls=len(records),
+        seconds=round(seconds, 4),
+        recorded_seconds=round(recorded_end - first, 4),
+        max_lag_ms=round(max_lag * 1000, 3),
+        replayed=_results(samples, errors),
+        recorded=_recorded(records),
+    )
+
+
+async def run_replay(records: List[Dict[str, Any]], layer: str, config: Optional[Config] = None,
+                     options: Optional[SimulatorOptions] = None, speed: float = 1.0,
+                     concurrency: int = 1) -> ReplayReport:
+    """Replay against fresh simulators, or against the configured platforms without ``options``"""
+    config = config or Config()
+    # Replayed calls must not end up in a recording of their own
+    config.server.record_file = ""
+    simulators = SimulatorThread(options) if options is not None else None
+    if simulators is not None:
+        simulators.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="ai_mcp_replay_") as state_dir:
+            session = BenchmarkSession(config, simulators, Path(state_dir))
+            async with session.server._server_lifespan(session.server.mcp_server):
+                return await replay(session, records, layer, speed, concurrency)
+    finally:
+        if simulators is not None:
+            simulators.stop()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay a session recorded with AI_MCP_RECORD_FILE. Without --simulate the calls go to "
+                    "the platforms named by the usual RHINO_*, GRASSHOPPER_* and AI_MCP_* variables."
+    )
+    parser.add_argument("recording", type=Path, help="Recording file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--layer", choices=("tool", "bridge"),
+                        help="Replay tool calls or bridge commands (default: tool calls if recorded)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed: 1 is real time, 10 ten times faster, 0 as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Calls in flight at once at --speed 0 (default: 1)")
+    parser.add_argument("--simulate", action="store_true", help="Replay against the local simulators")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated plugin latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Simulated latency spread in seconds")
+    parser.add_argument("--output", "-o", type=Path, default=Path("replay-results.json"),
+                        help="Results file (default: replay-results.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier replay results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline as a fraction (default: 0.2)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    layer, records = load_trace(args.recording, args.layer)
+    if not records:
+        print(f"No {layer} calls in {args.recording}")
+        return
+    options = SimulatorOptions(latency=args.latency, jitter=args.jitter, seed=0) if args.simulate else None
+    config = Config.from_env()
+    config.server.log_level = "WARNING"
+
+    report = asyncio.run(run_replay(records, layer, config, options, args.speed, args.concurrency))
+    recorded = {result.name: result for result in report.recorded}
+    for result in report.replayed:
+        print(result.line())
+        print(f"{'  recorded':<34} {'':>16}  p50 {recorded[result.name].p50_ms:>9.3f} ms"
+              f"  p95 {recorded[result.name].p95_ms:>9.3f} ms  p99 {recorded[result.name].p99_ms:>9.3f} ms")
+    pace = f"{args.speed:g}x" if args.speed > 0 else f"as fast as possible, {args.concurrency} at a time"
+    print(f"Replayed {report.calls} {layer} calls in {report.seconds:.2f}s ({pace}); "
+          f"recorded over {report.recorded_seconds:.2f}s, max start lag {report.max_lag_ms:.1f} ms")
+
+    settings = {
+        "recording": str(args.recording), "layer": layer, "speed": args.speed,
+        "concurrency": args.concurrency, "simulated": args.simulate,
+        "latency": args.latency, "jitter": args.jitter,
+        "calls": report.calls, "seconds": report.seconds,
+        "recorded_seconds": report.recorded_seconds, "max_lag_ms": report.max_lag_ms,
+        "recorded": [asdict(result) for result in report.recorded],
+    }
+    save_results(args.output, report.replayed, settings)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(report.replayed, load_results(args.compare), args.tolerance)
+        if regressions:
+            print(f"Regressions against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
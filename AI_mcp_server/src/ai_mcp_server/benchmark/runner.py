@@ -0,0 +1,278 @@
+"""
+Benchmark session, timing loop and result files
+"""
+
+import asyncio
+import logging
+import platform
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..core.config import Config
+from ..simulator import GrasshopperSimulator, RhinoSimulator, SimulatorOptions
+from ..utils import codec
+from ..utils.lazy import optional_module
+
+RESULTS_FORMAT = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and latency of one scenario
+
+    ``ops_per_sec`` counts timed calls; ``items_per_sec`` counts the
+    objects they carried (e.g. 1000 per ``create_rhino_objects`` call).
+    Latencies are exact nearest-rank percentiles in milliseconds.
+    """
+    name: str
+    iterations: int
+    items: int
+    seconds: float
+    ops_per_sec: float
+    items_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    errors: int = 0
+
+    @classmethod
+    def from_latencies(cls, name: str, latencies: List[float], items: int, errors: int = 0) -> "BenchmarkResult":
+        total = sum(latencies)
+        ordered = sorted(latencies)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))] * 1000, 3)
+
+        return cls(
+            name=name,
+            iterations=len(latencies),
+            items=items,
+            seconds=round(total, 4),
+            ops_per_sec=round(len(latencies) / total, 2) if total else 0.0,
+            items_per_sec=round(len(latencies) * items / total, 2) if total else 0.0,
+            mean_ms=round(total / len(latencies) * 1000, 3) if latencies else 0.0,
+            p50_ms=percentile(0.50),
+            p95_ms=percentile(0.95),
+            p99_ms=percentile(0.99),
+            max_ms=round(ordered[-1] * 1000, 3) if ordered else 0.0,
+            errors=errors,
+        )
+
+    def line(self) -> str:
+        """One-line human readable summary"""
+        items = f"  {self.items_per_sec:>12,.0f} items/s" if self.items > 1 else ""
+        return (f"{self.name:<34} {self.ops_per_sec:>10,.1f} ops/s  p50 {self.p50_ms:>9.3f} ms"
+                f"  p95 {self.p95_ms:>9.3f} ms  p99 {self.p99_ms:>9.3f} ms{items}"
+                + (f"  errors {self.errors}" if self.errors else ""))
+
+
+class SimulatorThread:
+    """Rhino and Grasshopper simulators on their own event loop thread
+
+    Keeping them off the benchmark's loop means simulator work runs
+    alongside the client instead of queueing behind it, as a real plugin
+    would.
+    """
+
+    def __init__(self, options: SimulatorOptions):
+        self.options = options
+        self.rhino = RhinoSimulator(options)
+        self.grasshopper = GrasshopperSimulator(options)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="simulators", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self.call(self.rhino.start())
+        self.call(self.grasshopper.start())
+
+    def stop(self) -> None:
+        self.call(self.rhino.stop())
+        self.call(self.grasshopper.stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+
+    def call(self, coroutine: Awaitable[Any]) -> Any:
+        """Run a coroutine on the simulator loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def run(self, fn: Callable[[], Any]) -> Any:
+        """Run a function on the simulator loop, e.g. to change a document"""
+        async def wrapper() -> Any:
+            return fn()
+        return self.call(wrapper())
+
+
+class BenchmarkSession:
+    """An ``AIServer`` wired to simulators, with helpers for scenarios
+
+    Without ``simulators`` the server talks to the platforms named in
+    ``config``.
+    """
+
+    def __init__(self, config: Config, simulators: Optional[SimulatorThread], state_dir: Path):
+        # Imported here so ``--help`` does not pay for the MCP SDK import
+        from ..core.server import AIServer
+
+        if simulators is not None:
+            config.rhino.host = simulators.rhino.host
+            config.rhino.port = simulators.rhino.port
+            config.grasshopper.host = simulators.grasshopper.host
+            config.grasshopper.port = simulators.grasshopper.port
+        config.grasshopper.catalog_path = str(state_dir / "grasshopper_catalog.json")
+        config.server.sync_state_path = str(state_dir / "sync_state.json")
+        config.server.warm_up = False
+        self.config = config
+        self.simulators = simulators
+        self.server = AIServer(config)
+
+    @property
+    def rhino_bridge(self) -> Any:
+        return self.server.rhino_bridge
+
+    @property
+    def grasshopper_bridge(self) -> Any:
+        return self.server.grasshopper_bridge
+
+    async def call_tool(self, name: str, **arguments: Any) -> str:
+        """Call a tool through the MCP server; raises on an error message"""
+        result = await self.server.mcp_server.call_tool(name, arguments)
+        # Newer MCP SDKs return (content, structured output)
+        content = result[0] if isinstance(result, tuple) else result
+        text = "".join(getattr(block, "text", "") for block in content)
+        if text.startswith("Error"):
+            raise Exception(text)
+        return text
+
+    def reset(self) -> None:
+        """Empty both simulated documents and forget sync mappings and cached replies"""
+        if self.simulators is not None:
+            self.simulators.run(self.simulators.rhino.reset)
+            self.simulators.run(self.simulators.grasshopper.reset)
+        self.server.sync_engine.state.mappings.clear()
+        self.rhino_bridge.clear_cache()
+        self.grasshopper_bridge.clear_cache()
+        if self.rhino_bridge.mirror is not None:
+            self.rhino_bridge.mirror.mark_stale()
+
+
+@dataclass
+class Scenario:
+    """One benchmark: ``operation`` is timed, the hooks are not"""
+    name: str
+    description: str
+    operation: Callable[[BenchmarkSession], Awaitable[Any]]
+    iterations: int = 100
+    items: int = 1
+    warmup: int = 1
+    setup: Optional[Callable[[BenchmarkSession], Awaitable[None]]] = None
+    before_each: Optional[Callable[[BenchmarkSession], Awaitable[None]]] = None
+
+
+async def run_scenario(session: BenchmarkSession, scenario: Scenario, scale: float = 1.0,
+                       logger: Optional[logging.Logger] = None) -> BenchmarkResult:
+    """Run a scenario's warm-up and timed iterations, with ``scale`` times its iteration count"""
+    logger = logger or logging.getLogger(__name__)
+    iterations = max(1, round(scenario.iterations * scale))
+    session.reset()
+    if scenario.setup is not None:
+        await scenario.setup(session)
+
+    latencies: List[float] = []
+    errors = 0
+    for index in range(scenario.warmup + iterations):
+        if scenario.before_each is not None:
+            await scenario.before_each(session)
+        started = time.perf_counter()
+        try:
+            await scenario.operation(session)
+        except Exception as e:
+            errors += 1
+            logger.warning(f"{scenario.name} failed: {e}")
+        elapsed = time.perf_counter() - started
+        if index >= scenario.warmup:
+            latencies.append(elapsed)
+    return BenchmarkResult.from_latencies(scenario.name, latencies, scenario.items, errors)
+
+
+async def run_benchmarks(scenarios: List[Scenario], config: Optional[Config] = None,
+                         options: Optional[SimulatorOptions] = None, scale: float = 1.0,
+                         report: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+    """Run scenarios in order against freshly started simulators"""
+    simulators = SimulatorThread(options or SimulatorOptions())
+    simulators.start()
+    results: List[BenchmarkResult] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="ai_mcp_bench_") as state_dir:
+            session = BenchmarkSession(config or Config(), simulators, Path(state_dir))
+            async with session.server._server_lifespan(session.server.mcp_server):
+                for scenario in scenarios:
+                    result = await run_scenario(session, scenario, scale)
+                    results.append(result)
+                    if report is not None:
+                        report(result)
+    finally:
+        simulators.stop()
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Details of the machine and build that produced a run"""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "codec": codec.BACKEND,
+        "numpy": optional_module("numpy") is not None,
+    }
+
+
+def save_results(path: Path, results: List[BenchmarkResult], settings: Dict[str, Any]) -> None:
+    """Write results with the settings and environment they were taken under"""
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "format": RESULTS_FORMAT,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": settings,
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(codec.dumps_text(data, pretty=True), encoding="utf-8")
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Results of a saved run by scenario name"""
+    data = codec.loads(Path(path).expanduser().read_bytes())
+    return {result["name"]: result for result in data.get("results", [])}
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float = 0.2) -> List[str]:
+    """Regressions against a baseline run
+
+    A scenario regresses when its throughput drops, or its median or p95
+    latency rises, by more than ``tolerance`` (a fraction).
+    """
+    regressions: List[str] = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None:
+            continue
+        if before["ops_per_sec"] and result.ops_per_sec < before["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{result.name}: {result.ops_per_sec:,.1f} ops/s, was {before['ops_per_sec']:,.1f}")
+        for key in ("p50_ms", "p95_ms"):
+            if before[key] and getattr(result, key) > before[key] * (1 + tolerance):
+                regressions.append(f"{result.name}: {key} {getattr(result, key):.3f}, was {before[key]:.3f}")
+    return regressions
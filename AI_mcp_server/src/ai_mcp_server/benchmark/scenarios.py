@@ -0,0 +1,115 @@
+"""
+Standard benchmark scenarios over the tools and bridges
+"""
+
+import itertools
+from typing import Any, Dict, List
+
+from .runner import BenchmarkSession, Scenario
+
+SEARCH_QUERIES = ("circle", "cirlce", "divide crv", "slider", "extrude", "generated component 42", "pt")
+
+
+def _boxes(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"type": "BOX", "params": {"width": 1, "length": 1, "height": 1}, "translation": [index * 2.0, 0.0, 0.0]}
+        for index in range(count)
+    ]
+
+
+def create_objects(count: int, iterations: int) -> Scenario:
+    """``create_rhino_objects`` with ``count`` objects per call"""
+    objects = _boxes(count)
+    label = f"{count // 1000}k" if count >= 1000 else str(count)
+
+    async def operation(session: BenchmarkSession) -> None:
+        await session.call_tool("create_rhino_objects", objects=objects)
+
+    return Scenario(
+        f"create_rhino_objects_{label}", f"Create {count:,} boxes in one tool call", operation,
+        iterations=iterations, items=count, warmup=1 if count <= 1000 else 0,
+    )
+
+
+async def _create_one(session: BenchmarkSession) -> None:
+    await session.call_tool("create_rhino_object", type="BOX", params={"width": 1, "length": 1, "height": 1})
+
+
+def document_info(document_size: int, padding: int) -> List[Scenario]:
+    """Reading a large document, on the wire and through the tool"""
+    async def setup(session: BenchmarkSession) -> None:
+        simulator = session.simulators.rhino
+        session.simulators.run(lambda: simulator.populate(document_size, padding))
+
+    async def uncached(session: BenchmarkSession) -> None:
+        session.rhino_bridge.clear_cache()
+
+    async def wire(session: BenchmarkSession) -> None:
+        await session.rhino_bridge.send_command("get_document_info", {})
+
+    async def tool(session: BenchmarkSession) -> None:
+        await session.call_tool("get_rhino_document_info")
+
+    return [
+        Scenario("get_document_info_decode",
+                 f"Fetch and decode a {document_size:,} object document, bypassing caches",
+                 wire, iterations=20, items=document_size, setup=setup, before_each=uncached),
+        Scenario("get_rhino_document_info",
+                 f"get_rhino_document_info tool over a {document_size:,} object document",
+                 tool, iterations=20, items=document_size, setup=setup),
+    ]
+
+
+def search_components() -> Scenario:
+    queries = itertools.cycle(SEARCH_QUERIES)
+
+    async def operation(session: BenchmarkSession) -> None:
+        await session.call_tool("search_grasshopper_components", query=next(queries))
+
+    return Scenario("search_grasshopper_components", "Fuzzy search of the component catalog",
+                    operation, iterations=500)
+
+
+def sync(objects: int, changed: int) -> List[Scenario]:
+    """Full and incremental ``sync_platforms`` from Rhino to Grasshopper"""
+    async def fresh(session: BenchmarkSession) -> None:
+        session.reset()
+        session.simulators.run(lambda: session.simulators.rhino.populate(objects))
+
+    async def populated(session: BenchmarkSession) -> None:
+        await fresh(session)
+        await session.call_tool("sync_platforms")
+
+    async def add(session: BenchmarkSession) -> None:
+        simulator = session.simulators.rhino
+
+        def create() -> None:
+            for _ in range(changed):
+                simulator.handle_create_object({"type": "SPHERE", "params": {"radius": 1}})
+
+        session.simulators.run(create)
+        if session.rhino_bridge.mirror is not None:
+            session.rhino_bridge.mirror.mark_stale()
+
+    async def operation(session: BenchmarkSession) -> None:
+        await session.call_tool("sync_platforms", direction="rhino_to_grasshopper")
+
+    return [
+        Scenario("sync_platforms_full", f"Sync {objects:,} new Rhino objects to Grasshopper",
+                 operation, iterations=5, items=objects, before_each=fresh),
+        Scenario("sync_platforms_incremental", f"Sync {changed} objects added to {objects:,} synced ones",
+                 operation, iterations=50, items=changed, setup=populated, before_each=add),
+    ]
+
+
+def default_scenarios(document_size: int = 20000, padding: int = 200, sync_objects: int = 1000) -> List[Scenario]:
+    """Every standard scenario, in run order"""
+    return [
+        Scenario("create_rhino_object", "Create one box per tool call", _create_one, iterations=500),
+        create_objects(10, iterations=200),
+        create_objects(1000, iterations=20),
+        create_objects(100000, iterations=1),
+        *document_info(document_size, padding),
+        search_components(),
+        *sync(sync_objects, changed=10),
+    ]
@@ -1,9 +1,13 @@
-"""
-Bridge modules for platform connections
-"""
-
-from .base_bridge import BaseBridge, ConnectionConfig
-from .rhino_bridge import RhinoBridge
-from .grasshopper_bridge import GrasshopperBridge
-
-__all__ = ["BaseBridge", "ConnectionConfig", "RhinoBridge", "GrasshopperBridge"]
+"""
+Bridge modules for platform connections
+"""
+
+from .base_bridge import BaseBridge, ConnectionConfig, PlatformError
+from .rhino_bridge import RhinoBridge
+from .grasshopper_bridge import GrasshopperBridge
+from .resilience import CircuitOpenError, RetryPolicy
+
+__all__ = [
+    "BaseBridge", "ConnectionConfig", "PlatformError", "RhinoBridge", "GrasshopperBridge",
+    "CircuitOpenError", "RetryPolicy",
+]
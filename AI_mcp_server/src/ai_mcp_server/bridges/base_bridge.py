@@ -1,156 +1,534 @@
-"""
-Base bridge class for platform connections
-"""
-
-import asyncio
-import socket
-import json
-import logging
-from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
-
-
-@dataclass
-class ConnectionConfig:
-    """Connection configuration"""
-    host: str
-    port: int
-    timeout: float
-    auto_reconnect: bool
-
-
-class BaseBridge(ABC):
-    """Base class for platform bridges"""
-    
-    def __init__(self, config: ConnectionConfig, logger: logging.Logger):
-        self.config = config
-        self.logger = logger
-        self.socket: Optional[socket.socket] = None
-        self.connected = False
-        self._lock = asyncio.Lock()
-    
-    async def initialize(self) -> None:
-        """Initialize the bridge"""
-        self.logger.info(f"Initializing {self.__class__.__name__}")
-        await self.connect()
-    
-    async def cleanup(self) -> None:
-        """Cleanup the bridge"""
-        self.logger.info(f"Cleaning up {self.__class__.__name__}")
-        await self.disconnect()
-    
-    async def connect(self) -> bool:
-        """Connect to the platform"""
-        async with self._lock:
-            if self.connected:
-                return True
-            
-            try:
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.socket.settimeout(self.config.timeout)
-                self.socket.connect((self.config.host, self.config.port))
-                self.connected = True
-                self.logger.info(f"Connected to {self.config.host}:{self.config.port}")
-                return True
-            except Exception as e:
-                self.logger.error(f"Failed to connect to {self.config.host}:{self.config.port}: {e}")
-                self.connected = False
-                return False
-    
-    async def disconnect(self) -> None:
-        """Disconnect from the platform"""
-        async with self._lock:
-            if self.socket:
-                try:
-                    self.socket.close()
-                except Exception as e:
-                    self.logger.error(f"Error closing socket: {e}")
-                finally:
-                    self.socket = None
-                    self.connected = False
-                    self.logger.info("Disconnected")
-    
-    async def check_connection(self) -> bool:
-        """Check if connection is alive"""
-        if not self.connected or not self.socket:
-            return False
-        
-        try:
-            # Try to send a ping command
-            await self.send_command("ping", {})
-            return True
-        except Exception:
-            self.connected = False
-            return False
-    
-    async def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send command to the platform"""
-        if params is None:
-            params = {}
-        
-        # Ensure connection
-        if not self.connected:
-            if not await self.connect():
-                raise ConnectionError(f"Failed to connect to {self.config.host}:{self.config.port}")
-        
-        command = {
-            "type": command_type,
-            "params": params
-        }
-        
-        try:
-            # Send command
-            command_json = json.dumps(command)
-            self.socket.sendall((command_json + "\n").encode("utf-8"))
-            self.logger.debug(f"Sent command: {command_type}")
-            
-            # Receive response
-            response_data = await self._receive_response()
-            response = json.loads(response_data.decode("utf-8"))
-            
-            if response.get("status") == "error":
-                raise Exception(response.get("message", "Unknown error"))
-            
-            return response.get("result", {})
-            
-        except Exception as e:
-            self.logger.error(f"Error sending command {command_type}: {e}")
-            if self.config.auto_reconnect:
-                self.connected = False
-                await self.connect()
-            raise
-    
-    async def _receive_response(self) -> bytes:
-        """Receive response from the platform"""
-        if not self.socket:
-            raise ConnectionError("Socket not connected")
-        
-        chunks = []
-        buffer_size = 8192
-        
-        try:
-            while True:
-                chunk = self.socket.recv(buffer_size)
-                if not chunk:
-                    break
-                
-                chunks.append(chunk)
-                
-                # Check if we have complete JSON
-                try:
-                    data = b''.join(chunks)
-                    json.loads(data.decode('utf-8'))
-                    return data
-                except json.JSONDecodeError:
-                    continue
-                    
-        except socket.timeout:
-            raise Exception("Timeout waiting for response")
-        except Exception as e:
-            raise Exception(f"Error receiving response: {e}")
-    
-    @abstractmethod
-    async def ping(self) -> Dict[str, Any]:
-        """Platform-specific ping implementation"""
-        pass
+"""
+Base bridge class for platform connections
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, FrozenSet, List, Optional, Set, Tuple
+from dataclasses import dataclass
+
+from .binary import has_buffers
+from .cache import CacheStats, ResponseCache
+from .connection_pool import ConnectionPool
+from .framing import TransferStats
+from .health import HealthRecord
+from .resilience import Backoff, CircuitBreaker, ReconnectManager, RetryPolicy
+from ..utils import codec
+from ..utils.metrics import metrics
+from ..utils.recording import recorder
+from ..utils.tracing import background_task, tracer
+
+
+class PlatformError(Exception):
+    """Error reply from the platform: the command was received and refused"""
+
+
+@dataclass
+class ConnectionConfig:
+    """Connection configuration"""
+    host: str
+    port: int
+    timeout: float
+    auto_reconnect: bool
+    pipelining: bool = False
+    pipeline_depth: int = 32
+    pool_size: int = 1
+    pool_idle_timeout: float = 60.0
+    max_frame_size: int = 1048576
+    compression: bool = False
+    compression_threshold: int = 16384
+    binary_frames: bool = False
+    cache_max_bytes: int = 4194304
+    cache_ttls: Optional[Dict[str, float]] = None
+    deadlines: Optional[Dict[str, float]] = None
+    heartbeat_interval: float = 10.0
+
+
+class BaseBridge(ABC):
+    """Base class for platform bridges"""
+    
+    # Read-only commands whose replies are cached, with TTLs in seconds
+    CACHE_TTLS: Dict[str, float] = {}
+    # Parameter naming the document object a cached reply describes
+    CACHE_OBJECT_KEYS: Dict[str, str] = {}
+    # Cached commands whose replies do not depend on the open document
+    DOCUMENT_INDEPENDENT: FrozenSet[str] = frozenset()
+    # Commands that never change the document
+    READ_ONLY_COMMANDS: FrozenSet[str] = frozenset({"ping"})
+    # Commands safe to resend after a transport failure
+    IDEMPOTENT_COMMANDS: FrozenSet[str] = frozenset({"ping"})
+    # Commands that change only the objects named by these parameters
+    TARGETED_MUTATIONS: Dict[str, Tuple[str, ...]] = {}
+    # Deadline class of each command; unlisted commands are "standard",
+    # whose budget is the configured timeout
+    DEADLINE_CLASSES: Dict[str, str] = {"ping": "quick"}
+    # Budgets in seconds of the other deadline classes
+    DEADLINES: Dict[str, float] = {"quick": 5.0, "long": 120.0}
+    
+    def __init__(self, config: ConnectionConfig, logger: logging.Logger, retry: Optional[RetryPolicy] = None):
+        self.config = config
+        self.logger = logger
+        name = self.__class__.__name__.replace("Bridge", "")
+        # Label of this bridge's metrics
+        self.platform = name.lower()
+        self._pool = ConnectionPool(config, logger, self.platform)
+        # None until the peer has accepted or rejected a batch envelope
+        self._batch_supported: Optional[bool] = None
+        self.health = HealthRecord()
+        self._heartbeat: Optional[asyncio.Task] = None
+        
+        self.retry = retry or RetryPolicy()
+        self._backoff = Backoff(self.retry.retry_delay, self.retry.max_delay)
+        self.breaker = CircuitBreaker(name, self.retry, logger)
+        self._reconnect = ReconnectManager(self._reconnect_once, self.retry, logger, name)
+        
+        cache_max_bytes = getattr(config, "cache_max_bytes", 0)
+        self._cache = ResponseCache(cache_max_bytes) if cache_max_bytes > 0 else None
+        self._cache_ttls = dict(self.CACHE_TTLS)
+        for command_type, ttl in (getattr(config, "cache_ttls", None) or {}).items():
+            if command_type in self.CACHE_TTLS or command_type in self.READ_ONLY_COMMANDS:
+                self._cache_ttls[command_type] = ttl
+        
+        # Keys are deadline classes or command types
+        self._deadlines = dict(self.DEADLINES, standard=config.timeout)
+        self._deadlines.update(getattr(config, "deadlines", None) or {})
+    
+    @property
+    def connected(self) -> bool:
+        """Whether the bridge holds an open connection"""
+        return self._pool.open_connections > 0
+    
+    @property
+    def transfer_stats(self) -> TransferStats:
+        """Bytes sent and received, before and after compression"""
+        return self._pool.stats
+    
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Response cache counters, or None when caching is disabled"""
+        return self._cache.stats if self._cache else None
+    
+    def clear_cache(self) -> None:
+        """Drop every cached reply"""
+        if self._cache:
+            self._cache.clear()
+    
+    async def initialize(self) -> None:
+        """Initialize the bridge"""
+        self.logger.info(f"Initializing {self.__class__.__name__}")
+        await self.connect()
+        self._start_heartbeat()
+    
+    async def cleanup(self) -> None:
+        """Cleanup the bridge"""
+        self.logger.info(f"Cleaning up {self.__class__.__name__}")
+        await self.disconnect()
+    
+    async def connect(self) -> bool:
+        """Connect to the platform, warming the connection pool"""
+        connected = await self._pool.warm()
+        if connected:
+            self.health.record_success()
+            self.breaker.record_success()
+        else:
+            self.health.record_failure(f"Failed to connect to {self.config.host}:{self.config.port}")
+            self.breaker.record_failure()
+        return connected
+    
+    async def disconnect(self) -> None:
+        """Disconnect from the platform"""
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._reconnect.stop()
+        self.health.connected = False
+        if self.connected:
+            await self._pool.close()
+            self.logger.info("Disconnected")
+        # The document may change while we are not looking
+        self.clear_cache()
+    
+    async def check_connection(self) -> bool:
+        """Check if connection is alive
+        
+        While the heartbeat runs, this answers from the cached health
+        record without a round-trip.
+        """
+        if not self.connected:
+            return False
+        
+        if self._heartbeat and not self._heartbeat.done():
+            return self.health.connected
+        
+        try:
+            # Try to send a ping command
+            await self.send_command("ping", {})
+            return True
+        except Exception:
+            return False
+    
+    def _start_heartbeat(self) -> None:
+        """Start the heartbeat task unless it runs already or is disabled"""
+        interval = getattr(self.config, "heartbeat_interval", 0)
+        if interval and interval > 0 and (self._heartbeat is None or self._heartbeat.done()):
+            self._heartbeat = background_task(self._heartbeat_loop(interval))
+    
+    async def _heartbeat_loop(self, interval: float) -> None:
+        """Ping idle connections every ``interval`` seconds
+        
+        Dead sockets are found and dropped here rather than by the next
+        command, and the health record stays current for status queries.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.beat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug(f"Heartbeat failed: {e}")
+    
+    async def beat(self) -> None:
+        """Run one heartbeat now"""
+        self.health.heartbeats += 1
+        if not self.connected:
+            if self.health.connected:
+                self.health.record_failure("Connection lost")
+            return
+        answered, rtt = await self._pool.heartbeat()
+        if answered:
+            self.health.record_success(rtt)
+        elif not self.connected:
+            self.logger.warning(f"{self.__class__.__name__} heartbeat: connection lost")
+            self.health.record_failure("Heartbeat ping failed")
+            self._recover("heartbeat")
+    
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = None, read_only: bool = False) -> Dict[str, Any]:
+        """Send command to the platform
+        
+        Replies to commands listed in ``CACHE_TTLS`` are served from the
+        response cache while fresh. Any command that may change the document
+        drops the cached replies it could make stale, both before it is sent
+        and once it completes. ``read_only`` vouches that this call of a
+        command that may change the document leaves it alone.
+        
+        ``timeout`` overrides the command's deadline, in seconds. It covers
+        retries as well as the exchange itself.
+        """
+        started = time.perf_counter()
+        params = params or {}
+        try:
+            with tracer.span("send_command", platform=self.platform, command=command_type), \
+                    recorder.call("bridge", command_type, params, platform=self.platform) as call:
+                result = await self._send_command(command_type, params, timeout, read_only)
+                if call is not None:
+                    call.response = result
+                return result
+        except Exception:
+            metrics.inc("bridge_command_errors_total", platform=self.platform, command=command_type)
+            raise
+        finally:
+            metrics.observe("bridge_command_seconds", time.perf_counter() - started,
+                            platform=self.platform, command=command_type)
+    
+    async def _send_command(self, command_type: str, params: Dict[str, Any],
+                            timeout: Optional[float], read_only: bool = False) -> Dict[str, Any]:
+        """Serve a command from the cache or send it, keeping the cache current"""
+        if timeout is None:
+            timeout = self.deadline_for(command_type, params)
+        
+        ttl = self._cache_ttls.get(command_type) if self._cache else None
+        if ttl:
+            key = self._cache.key(command_type, params)
+            cached = self._cache.get(key)
+            if cached is not None:
+                metrics.inc("bridge_cache_hits_total", platform=self.platform, command=command_type)
+                span = tracer.current()
+                if span is not None:
+                    span.set(cache_hit=True)
+                return cached
+            generation = self._cache.generation
+            result = await self._request(command_type, params, timeout)
+            # Binary buffers are not cached: a hit would hand back plain lists
+            if result is not None and not has_buffers(result):
+                object_key = self.CACHE_OBJECT_KEYS.get(command_type)
+                self._cache.put(
+                    key, result, ttl,
+                    object_id=str(params[object_key]) if object_key in params else None,
+                    document=command_type not in self.DOCUMENT_INDEPENDENT,
+                    generation=generation
+                )
+            return result
+        
+        mutating, object_ids = (False, None) if read_only else self._mutation_scope(command_type, params)
+        if not mutating:
+            return await self._request(command_type, params, timeout)
+        self._invalidate(object_ids)
+        try:
+            return await self._request(command_type, params, timeout)
+        finally:
+            # Queries answered while the command ran may already be stale
+            self._invalidate(object_ids)
+    
+    def _invalidate(self, object_ids: Optional[Set[str]]) -> None:
+        """Drop local state a command may have made stale (None: any object)"""
+        if self._cache:
+            self._cache.invalidate(object_ids)
+    
+    def _mutation_scope(self, command_type: str, params: Dict[str, Any]) -> Tuple[bool, Optional[Set[str]]]:
+        """Whether a command may change the document, and which objects (None: any)"""
+        if command_type == "batch":
+            mutating, object_ids = False, set()
+            for command in params.get("commands", []):
+                command_mutating, command_ids = self._mutation_scope(command["type"], command.get("params") or {})
+                if command_mutating:
+                    if command_ids is None:
+                        return True, None
+                    mutating = True
+                    object_ids |= command_ids
+            return mutating, object_ids
+        
+        if command_type in self.READ_ONLY_COMMANDS or command_type in self._cache_ttls:
+            return False, None
+        
+        keys = self.TARGETED_MUTATIONS.get(command_type, ())
+        object_ids = {str(params[key]) for key in keys if params.get(key)}
+        return True, object_ids or None
+    
+    async def _request(self, command_type: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run one command on a pooled connection
+        
+        Transport failures count against the circuit breaker; while it is
+        open the command fails without touching the network. Idempotent
+        commands are retried with jittered exponential backoff, up to
+        ``max_retries`` times and within ``timeout`` seconds overall.
+        """
+        command = {
+            "type": command_type,
+            "params": params
+        }
+        retries = self.retry.max_retries if self._is_idempotent(command_type, params) else 0
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                response = await self._exchange(command, deadline - loop.time())
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+            except Exception as e:
+                self.breaker.record_failure()
+                if attempt >= retries or self.breaker.state != CircuitBreaker.CLOSED:
+                    raise
+                delay = self._backoff.delay(attempt)
+                if loop.time() + delay >= deadline:
+                    raise
+                attempt += 1
+                self.logger.warning(f"Retrying {command_type} in {delay:.2f}s ({attempt}/{retries}): {e}")
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            break
+        
+        if response.get("status") == "error":
+            raise PlatformError(response.get("message", "Unknown error"))
+        
+        return response.get("result", {})
+    
+    async def _exchange(self, command: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one command and read its reply
+        
+        Transport failures raise ``ConnectionError`` and an unanswered
+        command ``asyncio.TimeoutError``, so callers can tell them from the
+        ``PlatformError`` of an error reply. ``timeout`` covers the wait for
+        a pooled connection as well as the reply.
+        """
+        command_type = command["type"]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        
+        # Check out a connection, opening one if needed
+        queued = time.perf_counter()
+        try:
+            with tracer.span("queue_wait"):
+                connection = await self._pool.acquire(timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Timeout waiting for a connection to send {command_type}")
+            raise asyncio.TimeoutError(f"Timeout waiting for a connection to send {command_type}")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to {self.config.host}:{self.config.port}: {e}")
+            self.health.record_failure(str(e))
+            self._recover(command_type)
+            raise ConnectionError(f"Failed to connect to {self.config.host}:{self.config.port}")
+        finally:
+            metrics.observe("bridge_queue_wait_seconds", time.perf_counter() - queued,
+                            platform=self.platform, command=command_type)
+        self._start_heartbeat()
+        
+        try:
+            # Whatever the queue took comes off the reply's share
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                raise asyncio.TimeoutError()
+            self.logger.debug(f"Sent command: {command_type}")
+            response = await connection.request(command, timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Timeout waiting for response to {command_type} after {timeout:.1f}s")
+            self.health.record_failure(f"Timeout waiting for response to {command_type}", connected=True)
+            if connection.closed:
+                self._recover(command_type)
+            raise asyncio.TimeoutError(f"Timeout waiting for response to {command_type}")
+        except Exception as e:
+            self.logger.error(f"Error sending command {command_type}: {e}")
+            self.health.record_failure(str(e))
+            # The stream position is unknown after a transport error
+            await connection.close()
+            self._recover(command_type)
+            if isinstance(e, ConnectionError):
+                raise
+            raise ConnectionError(str(e) or type(e).__name__) from e
+        finally:
+            await self._pool.release(connection)
+        
+        self.health.record_success()
+        return response
+    
+    def deadline_for(self, command_type: str, params: Optional[Dict[str, Any]] = None) -> float:
+        """Deadline of a command in seconds, from its class or a configured override"""
+        if command_type == "batch" and params:
+            commands = params.get("commands", [])
+            if commands:
+                return max(self.deadline_for(command["type"], command.get("params")) for command in commands)
+        if command_type in self._deadlines:
+            return self._deadlines[command_type]
+        return self._deadlines.get(self.DEADLINE_CLASSES.get(command_type, "standard"), self.config.timeout)
+    
+    def _is_idempotent(self, command_type: str, params: Dict[str, Any]) -> bool:
+        """Whether a command may be resent after a transport failure"""
+        if command_type == "batch":
+            return all(
+                self._is_idempotent(command["type"], command.get("params") or {})
+                for command in params.get("commands", [])
+            )
+        return command_type in self.IDEMPOTENT_COMMANDS
+    
+    async def send_batch(self, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send many commands in batch envelopes
+        
+        Each command is a ``{"type", "params"}`` dict. Commands are packed
+        into envelopes no larger than ``max_frame_size`` bytes, which are
+        sent concurrently. Returns one entry per command, in order: either
+        ``{"status": "success", "result": ...}`` or
+        ``{"status": "error", "message": ...}``.
+        
+        Until the platform has answered an envelope, envelopes go out one at
+        a time. Only an error reply to the envelope itself switches to
+        sending commands individually; after a timeout or a lost connection
+        the platform may have run the envelope, so its commands are
+        reported as failed rather than sent again.
+        """
+        if not commands:
+            return []
+        
+        if self._batch_supported is False:
+            return await self._send_individually(commands)
+        
+        chunks = self._chunk_commands(commands)
+        chunk_results: List[List[Dict[str, Any]]] = []
+        while self._batch_supported is None and len(chunk_results) < len(chunks):
+            # Probe before sending the rest
+            results = await self._send_envelope(chunks[len(chunk_results)])
+            if self._batch_supported is False:
+                # Rejected, so none of its commands ran
+                remaining = [command for chunk in chunks[len(chunk_results):] for command in chunk]
+                chunk_results.append(await self._send_individually(remaining))
+                break
+            chunk_results.append(results)
+        else:
+            chunk_results.extend(await asyncio.gather(
+                *(self._send_envelope(chunk) for chunk in chunks[len(chunk_results):])
+            ))
+        
+        return [result for results in chunk_results for result in results]
+    
+    def _chunk_commands(self, commands: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split commands into envelopes that fit the maximum frame size"""
+        limit = self.config.max_frame_size
+        chunks: List[List[Dict[str, Any]]] = []
+        chunk: List[Dict[str, Any]] = []
+        size = 0
+        for command in commands:
+            command = {"type": command["type"], "params": command.get("params") or {}}
+            command_size = len(codec.dumps(command)) + 1
+            if chunk and size + command_size > limit:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(command)
+            size += command_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    async def _send_envelope(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send one batch envelope and unpack its per-command results"""
+        try:
+            result = await self.send_command("batch", {"commands": chunk})
+        except PlatformError as e:
+            if self._batch_supported is None:
+                self.logger.info(f"Peer rejected batch envelope ({e}); sending commands individually")
+                self._batch_supported = False
+                return []
+            return [{"status": "error", "message": str(e)} for _ in chunk]
+        except Exception as e:
+            # The outcome is unknown; resending could run the commands twice
+            message = str(e) or type(e).__name__
+            return [{"status": "error", "message": message} for _ in chunk]
+        
+        self._batch_supported = True
+        results = result.get("results", []) if isinstance(result, dict) else []
+        if len(results) != len(chunk):
+            message = f"Batch returned {len(results)} results for {len(chunk)} commands"
+            return [{"status": "error", "message": message} for _ in chunk]
+        
+        return [
+            {"status": "error", "message": item.get("message", "Unknown error")}
+            if item.get("status") == "error"
+            else {"status": "success", "result": item.get("result", {})}
+            for item in results
+        ]
+    
+    async def _send_individually(self, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fallback for peers without batch support"""
+        async def send(command: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                result = await self.send_command(command["type"], command.get("params"))
+                return {"status": "success", "result": result}
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+        
+        return list(await asyncio.gather(*(send(command) for command in commands)))
+    
+    def _recover(self, cause: str) -> None:
+        """Reconnect in the background after ``cause`` lost a connection, if enabled"""
+        if self.config.auto_reconnect:
+            metrics.inc("bridge_reconnects_total", platform=self.platform, command=cause)
+            self._reconnect.schedule()
+    
+    async def _reconnect_once(self) -> bool:
+        """One reconnect attempt; closes the circuit on success"""
+        if not self.connected and not await self._pool.warm(1):
+            return False
+        self.health.record_success()
+        self.breaker.record_success()
+        return True
+    
+    @abstractmethod
+    async def ping(self) -> Dict[str, Any]:
+        """Platform-specific ping implementation"""
+        pass
@@ -0,0 +1,165 @@
+"""
+Binary buffers carried alongside JSON messages
+"""
+
+import struct
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import codec
+from ..utils.lazy import loaded_module, optional_module
+
+
+# Element types a buffer may hold, with their struct/array type codes
+DTYPES = {"float32": "f", "int32": "i", "uint32": "I", "float64": "d"}
+ALIGNMENT = 8
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def is_buffer(value: Any) -> bool:
+    """Whether a value travels as a binary buffer rather than JSON"""
+    if isinstance(value, (memoryview, array)):
+        return True
+    np = loaded_module("numpy")
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def has_buffers(value: Any) -> bool:
+    """Whether a decoded result holds buffers at its top level"""
+    return isinstance(value, dict) and any(is_buffer(item) for item in value.values())
+
+
+def pack_rows(rows: Any, width: Optional[int], dtype: str) -> Any:
+    """Pack rows of ``width`` numbers into an N x ``width`` buffer
+
+    Returns a NumPy array when NumPy is available, else a typed
+    ``memoryview`` with the same shape. A ``width`` of None packs mesh
+    faces: three wide if every face is a triangle, else four wide with
+    triangles repeating their last index as Rhino does.
+    """
+    np = optional_module("numpy")
+    if is_buffer(rows):
+        if width is None:
+            shape = rows.shape if np is not None and isinstance(rows, np.ndarray) else memoryview(rows).shape
+            width = shape[-1] if len(shape) > 1 else 3
+        if np is not None:
+            return np.ascontiguousarray(rows, dtype=dtype).reshape(-1, width)
+        rows = memoryview(rows).tolist()
+    rows = [list(row) for row in rows]
+    if width is None:
+        width = 4 if any(len(row) == 4 for row in rows) else 3
+        if width == 4:
+            rows = [row + row[-1:] if len(row) == 3 else row for row in rows]
+    if any(len(row) != width for row in rows):
+        raise ValueError(f"Expected rows of {width} values")
+    if np is not None:
+        return np.array(rows, dtype=dtype).reshape(-1, width)
+    packed = array(DTYPES[dtype], (value for row in rows for value in row))
+    return memoryview(packed).cast("B").cast(DTYPES[dtype], [len(rows), width])
+
+
+def _pad(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _describe(value: Any) -> Tuple[str, List[int], memoryview]:
+    """Element type, shape and raw bytes of an outgoing buffer"""
+    np = loaded_module("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        dtype = value.dtype.name
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported buffer type: {dtype}")
+        value = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+        return dtype, list(value.shape), memoryview(value).cast("B")
+    view = memoryview(value)
+    code = view.format.lstrip("@=<")
+    dtype = next((name for name, c in DTYPES.items() if c == code), None)
+    if dtype is None or view.itemsize != struct.calcsize(code):
+        raise ValueError(f"Unsupported buffer format: {view.format}")
+    return dtype, list(view.shape or (len(view),)), view.cast("B")
+
+
+def _split(node: Dict[str, Any], path: List[str], found: List[Tuple[List[str], Any]]) -> Dict[str, Any]:
+    """Copy of a message with its buffers removed, collecting them by path"""
+    copy = {}
+    for key, value in node.items():
+        if is_buffer(value):
+            found.append((path + [key], value))
+        elif isinstance(value, dict):
+            copy[key] = _split(value, path + [key], found)
+        else:
+            copy[key] = value
+    return copy
+
+
+def find_buffers(message: Dict[str, Any]) -> bool:
+    """Whether any dict in a message holds a binary buffer"""
+    for value in message.values():
+        if is_buffer(value) or (isinstance(value, dict) and find_buffers(value)):
+            return True
+    return False
+
+
+def encode_binary(message: Dict[str, Any]) -> List[Any]:
+    """Encode a message with its buffers as the parts of a binary payload
+
+    Layout: a little-endian uint32 header length, the JSON header (the
+    message without its buffers, plus a ``buffers`` list describing each
+    one by ``path``, ``dtype``, ``shape``, ``offset`` and ``length``),
+    padding to 8 bytes, then the buffers, each 8-byte aligned and located
+    by its offset from the start of the buffer section.
+
+    The buffers are returned as views so they can be written to the
+    socket without being joined into one bytes object.
+    """
+    found: List[Tuple[List[str], Any]] = []
+    header = _split(message, [], found)
+    specs = []
+    views = []
+    offset = 0
+    for path, value in found:
+        dtype, shape, view = _describe(value)
+        specs.append({"path": path, "dtype": dtype, "shape": shape, "offset": offset, "length": len(view)})
+        views.append(view)
+        offset += len(view) + _pad(len(view))
+    header["buffers"] = specs
+
+    encoded = codec.dumps(header)
+    prefix = _HEADER_LENGTH.pack(len(encoded)) + encoded
+    parts: List[Any] = [prefix + bytes(_pad(len(prefix)))]
+    for view in views:
+        parts.append(view)
+        if _pad(len(view)):
+            parts.append(bytes(_pad(len(view))))
+    return parts
+
+
+def decode_binary(payload: Any) -> Dict[str, Any]:
+    """Decode a binary payload, exposing its buffers without copying them
+
+    Each buffer becomes a NumPy array (or, without NumPy, a typed
+    ``memoryview``) over the payload memory and is placed in the message at
+    its path. Arrays over a ``bytearray`` payload are writable.
+    """
+    np = optional_module("numpy")
+    view = memoryview(payload)
+    (header_length,) = _HEADER_LENGTH.unpack_from(view)
+    start = _HEADER_LENGTH.size + header_length
+    message = codec.loads(view[_HEADER_LENGTH.size:start])
+    start += _pad(start)
+
+    for spec in message.pop("buffers", None) or []:
+        offset = start + spec["offset"]
+        data = view[offset:offset + spec["length"]]
+        shape = spec.get("shape") or [spec["length"] // struct.calcsize(DTYPES[spec["dtype"]])]
+        if np is not None:
+            value: Any = np.frombuffer(data, dtype=np.dtype(spec["dtype"]).newbyteorder("<")).reshape(shape)
+        else:
+            value = data.cast(DTYPES[spec["dtype"]], shape)
+
+        *parents, name = spec["path"]
+        node = message
+        for key in parents:
+            node = node[int(key)] if isinstance(node, list) else node.setdefault(key, {})
+        node[int(name) if isinstance(node, list) else name] = value
+    return message
@@ -0,0 +1,125 @@
+"""
+Response cache for read-only bridge queries
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..utils import codec
+
+
+@dataclass
+class CacheStats:
+    """Counters for one response cache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "entries": self.entries,
+            "bytes": self.bytes,
+        }
+
+
+@dataclass
+class _Entry:
+    data: bytes
+    expires: float
+    # Document object the reply describes; None for document-independent replies
+    object_id: Optional[str]
+    document: bool
+
+
+class ResponseCache:
+    """LRU cache of encoded replies with per-entry TTLs and a byte budget
+
+    Replies are stored encoded, so the budget counts real bytes and every
+    hit decodes a fresh copy the caller is free to mutate. Entries that
+    depend on document contents are dropped by ``invalidate``; the
+    ``generation`` counter lets callers discard replies to queries that
+    were already in flight when the document changed.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Tuple[str, bytes], _Entry]" = OrderedDict()
+
+    @staticmethod
+    def key(command_type: str, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Cache key for a command"""
+        return command_type, codec.dumps(params)
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[Any]:
+        """Return a cached reply, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return codec.loads(entry.data)
+
+    def put(self, key: Tuple[str, bytes], value: Any, ttl: float,
+            object_id: Optional[str] = None, document: bool = True,
+            generation: Optional[int] = None) -> None:
+        """Store a reply unless the document changed since ``generation``"""
+        if ttl <= 0 or (generation is not None and generation != self.generation):
+            return
+        data = codec.dumps(value)
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(data, time.monotonic() + ttl, object_id, document)
+        self.stats.bytes += len(data)
+        self.stats.entries = len(self._entries)
+        while self.stats.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def invalidate(self, object_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop document-dependent entries, or only those for ``object_ids``"""
+        self.generation += 1
+        self.stats.invalidations += 1
+        targets = None if object_ids is None else {str(object_id) for object_id in object_ids}
+        for key, entry in list(self._entries.items()):
+            if entry.document and (targets is None or entry.object_id is None or entry.object_id in targets):
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self.generation += 1
+        self._entries.clear()
+        self.stats.entries = 0
+        self.stats.bytes = 0
+
+    def _remove(self, key: Tuple[str, bytes]) -> None:
+        entry = self._entries.pop(key)
+        self.stats.bytes -= len(entry.data)
+        self.stats.entries = len(self._entries)
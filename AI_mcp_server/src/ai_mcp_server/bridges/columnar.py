@@ -0,0 +1,122 @@
+"""
+Columnar geometry batches for bulk object creation
+"""
+
+import itertools
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils.lazy import optional_module
+
+
+def _flatten(values: Any, width: int, typecode: str) -> Tuple[Any, int]:
+    """Pack rows of ``width`` numbers into one flat buffer
+
+    Returns a 1-D NumPy array when NumPy is available, else an
+    ``array.array``. Nested rows are flattened without building a Python
+    object per row.
+    """
+    np = optional_module("numpy")
+    if np is not None:
+        dtype = np.float64 if typecode == "d" else np.int32
+        flat = np.ascontiguousarray(values, dtype=dtype).reshape(-1)
+    elif isinstance(values, array) and values.typecode == typecode:
+        flat = values
+    elif isinstance(values, (array, memoryview)):
+        flat = array(typecode, values)
+    else:
+        values = list(values) if not isinstance(values, Sequence) else values
+        if values and isinstance(values[0], (list, tuple)):
+            flat = array(typecode, itertools.chain.from_iterable(values))
+        else:
+            flat = array(typecode, values)
+    if len(flat) % width:
+        raise ValueError(f"Expected rows of {width} values, got {len(flat)} values")
+    return flat, len(flat) // width
+
+
+class ColumnarBatch:
+    """Many objects of one type described column by column
+
+    ``positions`` is an N x 3 array of insertion points (or a flat array of
+    3N floats). Each entry of ``params`` is either a column of N values or
+    a scalar shared by every object. ``colors`` (N x 3 ints) and ``names``
+    are optional per-row columns.
+
+    Columns stay in packed buffers; only the rows of the chunk being sent
+    are ever turned into Python objects.
+    """
+
+    def __init__(self, object_type: str, positions: Any,
+                 params: Optional[Dict[str, Any]] = None,
+                 colors: Optional[Any] = None, names: Optional[Sequence[str]] = None):
+        self.object_type = object_type
+        self.positions, self.count = _flatten(positions, 3, "d")
+        self.columns: Dict[str, Any] = {}
+        self.scalars: Dict[str, Any] = {}
+        for key, value in (params or {}).items():
+            if isinstance(value, (int, float, str, bool)) or value is None:
+                self.scalars[key] = value
+                continue
+            column, rows = _flatten(value, 1, "d")
+            if rows != self.count:
+                raise ValueError(f"Column '{key}' has {rows} values for {self.count} objects")
+            self.columns[key] = column
+        self.colors = None
+        if colors is not None:
+            self.colors, rows = _flatten(colors, 3, "i")
+            if rows != self.count:
+                raise ValueError(f"Got {rows} colors for {self.count} objects")
+        self.names = names
+        if names is not None and len(names) != self.count:
+            raise ValueError(f"Got {len(names)} names for {self.count} objects")
+
+    def row_size(self) -> int:
+        """Rough encoded size of one row in bytes"""
+        size = 20 * (3 + len(self.columns)) + (16 if self.colors is not None else 0)
+        if self.names:
+            size += 4 + max(len(name) for name in itertools.islice(self.names, 100))
+        return size
+
+    def chunks(self, max_bytes: int, max_rows: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Row ranges whose encoded size stays within ``max_bytes``"""
+        rows = max(1, max_bytes // self.row_size())
+        if max_rows:
+            rows = min(rows, max_rows)
+        for start in range(0, self.count, rows):
+            yield start, min(start + rows, self.count)
+
+    def chunk_params(self, start: int, stop: int) -> Dict[str, Any]:
+        """Parameters of one ``create_objects_columnar`` command"""
+        params: Dict[str, Any] = {
+            "type": self.object_type,
+            "count": stop - start,
+            "positions": self.positions[start * 3:stop * 3],
+            "params": dict(self.scalars, **{key: column[start:stop] for key, column in self.columns.items()}),
+        }
+        if self.colors is not None:
+            params["colors"] = self.colors[start * 3:stop * 3]
+        if self.names is not None:
+            params["names"] = list(self.names[start:stop])
+        return params
+
+    def chunk_commands(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """The same rows as individual ``create_object`` commands"""
+        positions = self.positions[start * 3:stop * 3].tolist()
+        columns = {key: column[start:stop].tolist() for key, column in self.columns.items()}
+        colors = self.colors[start * 3:stop * 3].tolist() if self.colors is not None else None
+        commands = []
+        for row in range(stop - start):
+            point = positions[row * 3:row * 3 + 3]
+            params = dict(self.scalars, **{key: column[row] for key, column in columns.items()})
+            command: Dict[str, Any] = {"type": self.object_type, "params": params}
+            if self.object_type.upper() == "POINT":
+                params.update(x=point[0], y=point[1], z=point[2])
+            else:
+                command["translation"] = point
+            if colors is not None:
+                command["color"] = colors[row * 3:row * 3 + 3]
+            if self.names is not None:
+                command["name"] = self.names[start + row]
+            commands.append({"type": "create_object", "params": command})
+        return commands
@@ -0,0 +1,312 @@
+"""
+Stream connection to a platform plugin
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Dict, Optional, Set, Tuple
+
+from .binary import DTYPES, find_buffers
+from .framing import FrameReader, TransferStats, encode_binary_frame, encode_frame
+from ..utils import codec
+from ..utils.metrics import metrics
+from ..utils.tracing import background_task, tracer
+
+
+class BridgeConnection:
+    """A single stream connection to a platform plugin
+
+    Without pipelining, one request/response exchange runs at a time. With
+    pipelining, every command carries a request ``id`` and replies are
+    matched to waiting futures by a background reader, so many commands can
+    be in flight on the socket at once. The first pipelined exchange runs
+    alone; if the reply does not echo the id, the connection falls back to
+    one exchange at a time and matches replies in order.
+
+    With ``compression`` enabled, a ``negotiate`` handshake runs when the
+    connection opens. If the plugin agrees to zlib, frames larger than
+    ``compression_threshold`` bytes are compressed in both directions.
+
+    With ``binary_frames`` enabled, the handshake also offers binary
+    frames. Once the plugin accepts, commands holding array buffers (mesh
+    vertices, faces, normals) send them raw in a ``#b`` frame instead of
+    as JSON number lists, and the plugin may reply the same way.
+
+    A request cancelled while waiting for its reply gives up its slot at
+    once. Pipelined connections to a plugin that echoes ids and accepted
+    ``cancel`` in the handshake send it a ``cancel`` message naming the
+    request id and drop the late reply. Otherwise the reply would be read
+    as the next request's, so the connection is closed.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 config: Any, logger: logging.Logger, stats: Optional[TransferStats] = None,
+                 name: str = "bridge"):
+        self.config = config
+        self.logger = logger
+        self.stats = stats
+        # Platform label of the socket metrics
+        self.name = name
+        self.frames = FrameReader(reader, stats=stats)
+        self.closed = False
+        # Set once the peer has agreed to compression
+        self.compress_threshold: Optional[int] = None
+        # Set once the peer has agreed to binary frames
+        self.binary = False
+        # Set once the peer has agreed to cancel messages
+        self.cancellable = False
+        # Pool bookkeeping
+        self.leases = 0
+        self.last_used = time.monotonic()
+        # None until the peer shows whether it echoes request ids
+        self.multiplexed: Optional[bool] = None
+        self._reader = reader
+        self._writer = writer
+        self._io_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._pending: Dict[int, asyncio.Future] = {}
+        # Command type of each pending request, for the metrics
+        self._pending_types: Dict[int, str] = {}
+        # Decode timing of replies read for pending requests, for tracing
+        self._decode_times: Dict[int, Tuple[int, int]] = {}
+        self._request_ids = itertools.count(1)
+        self._in_flight = asyncio.Semaphore(max(1, getattr(config, "pipeline_depth", 1)))
+        self._read_task: Optional[asyncio.Task] = None
+        self._cancels: Set[asyncio.Task] = set()
+        if getattr(config, "pipelining", False):
+            self._read_task = background_task(self._read_loop())
+
+    @classmethod
+    async def open(cls, config: Any, logger: logging.Logger,
+                   stats: Optional[TransferStats] = None, name: str = "bridge") -> "BridgeConnection":
+        """Open a connection to the configured host and port"""
+        started = time.perf_counter()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(config.host, config.port),
+            timeout=config.timeout
+        )
+        metrics.observe("socket_connect_seconds", time.perf_counter() - started, platform=name)
+        connection = cls(reader, writer, config, logger, stats, name)
+        if any(getattr(config, option, False) for option in ("compression", "binary_frames", "pipelining")):
+            await connection.negotiate()
+        return connection
+
+    async def negotiate(self) -> None:
+        """Agree on optional protocol features with the plugin"""
+        params: Dict[str, Any] = {}
+        threshold = getattr(self.config, "compression_threshold", 16384)
+        if getattr(self.config, "compression", False):
+            params.update(compression=["zlib"], compression_threshold=threshold)
+        if getattr(self.config, "binary_frames", False):
+            params["binary"] = sorted(DTYPES)
+        if getattr(self.config, "pipelining", False):
+            # Cancel messages name request ids, so they need pipelining
+            params["cancel"] = True
+        response = await self.request({"type": "negotiate", "params": params})
+        result = response.get("result") or {}
+        accepted = response.get("status") != "error"
+
+        if "compression" in params:
+            if accepted and result.get("compression") == "zlib":
+                self.compress_threshold = threshold
+                self.logger.info(f"Compression negotiated: zlib above {threshold} bytes")
+            else:
+                self.logger.info("Peer declined compression; sending uncompressed frames")
+        if "binary" in params:
+            self.binary = accepted and bool(result.get("binary"))
+            self.logger.info("Binary frames negotiated" if self.binary
+                             else "Peer declined binary frames; sending buffers as JSON")
+        if "cancel" in params:
+            self.cancellable = accepted and bool(result.get("cancel"))
+
+    @property
+    def pipelined(self) -> bool:
+        """Whether replies are matched by request id"""
+        return self._read_task is not None
+
+    @property
+    def healthy(self) -> bool:
+        """Cheap liveness check that needs no round-trip"""
+        return not (self.closed or self._reader.at_eof() or self._writer.is_closing())
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a reply"""
+        return len(self._pending)
+
+    async def request(self, command: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a command and wait at most ``timeout`` seconds for its reply
+
+        ``timeout`` defaults to the configured timeout.
+        """
+        if self.closed:
+            raise ConnectionError("Connection closed")
+
+        try:
+            return await self._exchange(command, self.config.timeout if timeout is None else timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Unless replies are matched by id, a late reply would be taken
+            # for the next request's, so the stream cannot be reused
+            if not self.multiplexed:
+                await self._abandon()
+            raise
+
+    async def close(self) -> None:
+        """Close the stream and fail any requests still waiting"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._read_task and self._read_task is not asyncio.current_task():
+            self._read_task.cancel()
+        self._fail_pending(ConnectionError("Connection closed"))
+        try:
+            self._writer.close()
+            await self._writer.wait_closed()
+        except Exception as e:
+            self.logger.error(f"Error closing socket: {e}")
+
+    async def _abandon(self) -> None:
+        """Close the stream from a request that timed out or was cancelled"""
+        # Shielded so a second cancellation cannot leave the stream half-closed
+        await asyncio.shield(self.close())
+
+    async def _exchange(self, command: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run one request/response exchange"""
+        command_type = command.get("type", "unknown")
+        if not self.pipelined:
+            async with self._io_lock:
+                await self._write(command, timeout)
+                response = await self._await_reply(self.frames.read_message(), command_type, timeout)
+                self._count_reply(command_type)
+                return response
+
+        async with self._in_flight:
+            request_id = next(self._request_ids)
+            command = dict(command, id=request_id)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            self._pending_types[request_id] = command_type
+            try:
+                if not self.multiplexed:
+                    # Probing or fallback mode: one exchange at a time
+                    async with self._io_lock:
+                        if not self.multiplexed:
+                            await self._write(command, timeout)
+                            return await self._await_reply(future, command_type, timeout, request_id)
+
+                await self._write(command, timeout)
+                return await self._await_reply(future, command_type, timeout, request_id)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                if self.multiplexed and self.cancellable and not self.closed:
+                    self._send_cancel(request_id)
+                raise
+            finally:
+                self._pending.pop(request_id, None)
+                self._pending_types.pop(request_id, None)
+                self._decode_times.pop(request_id, None)
+
+    def _send_cancel(self, request_id: int) -> None:
+        """Ask the plugin to stop working on a request nobody waits for"""
+        # The cancel has an id of its own, so a plugin that answers it is
+        # not taken for one that stopped echoing ids, and the reader drops
+        # the answer as a reply nobody waits for
+        cancel = {"id": next(self._request_ids), "type": "cancel", "params": {"id": request_id}}
+
+        async def send() -> None:
+            try:
+                await self._write(cancel, self.config.timeout)
+            except Exception as e:
+                self.logger.debug(f"Could not cancel request {request_id}: {e}")
+
+        task = background_task(send())
+        self._cancels.add(task)
+        task.add_done_callback(self._cancels.discard)
+
+    async def _write(self, command: Dict[str, Any], timeout: float) -> None:
+        """Write one command frame
+
+        Inside a recorded trace the command carries a W3C ``traceparent``,
+        so the plugin can attach its own spans to the trace.
+        """
+        span = tracer.current()
+        if span is not None:
+            command = dict(command, traceparent=span.traceparent)
+        labels = {"platform": self.name, "command": command.get("type", "unknown")}
+        with tracer.span("encode"):
+            if self.binary and find_buffers(command):
+                parts = encode_binary_frame(command, self.stats)
+            else:
+                parts = [encode_frame(codec.dumps(command), self.compress_threshold, self.stats)]
+        size = sum(len(part) for part in parts)
+        metrics.inc("socket_bytes_out_total", size, **labels)
+        started = time.perf_counter()
+        with tracer.span("send", bytes=size):
+            async with self._write_lock:
+                self._writer.writelines(parts)
+                await asyncio.wait_for(self._writer.drain(), timeout=timeout)
+        metrics.observe("socket_write_seconds", time.perf_counter() - started, **labels)
+
+    async def _await_reply(self, reply: Awaitable[Any], command_type: str, timeout: float,
+                           request_id: Optional[int] = None) -> Dict[str, Any]:
+        """Wait for a reply, recording its round-trip time
+
+        A plugin may report the time it spent on the command as
+        ``server_time_ms`` in the reply; it is added to the trace.
+        """
+        sent = time.perf_counter()
+        with tracer.span("recv") as span:
+            response = await asyncio.wait_for(reply, timeout=timeout)
+            if span is not None and isinstance(response, dict) and "server_time_ms" in response:
+                span.set(plugin_ms=response["server_time_ms"])
+        metrics.observe("socket_roundtrip_seconds", time.perf_counter() - sent,
+                        platform=self.name, command=command_type)
+        decoded = self.frames.last_decode if request_id is None else self._decode_times.pop(request_id, None)
+        if decoded is not None:
+            tracer.record("decode", *decoded)
+        return response
+
+    def _count_reply(self, command_type: str) -> None:
+        """Count the size of the reply just read"""
+        metrics.inc("socket_bytes_in_total", self.frames.last_wire_size, platform=self.name, command=command_type)
+
+    async def _read_loop(self) -> None:
+        """Dispatch replies to the futures waiting on them"""
+        try:
+            while True:
+                response = await self.frames.read_message()
+                request_id = response.get("id") if isinstance(response, dict) else None
+
+                if request_id is None:
+                    if self.multiplexed is None:
+                        self.logger.info("Peer does not echo request ids; pipelining disabled")
+                    self.multiplexed = False
+                    # Replies arrive in request order when ids are not echoed
+                    pending_id = next(iter(self._pending), None)
+                else:
+                    if self.multiplexed is None:
+                        self.multiplexed = True
+                    pending_id = request_id
+                future = self._pending.get(pending_id)
+                self._count_reply(self._pending_types.get(pending_id, "unknown"))
+
+                if future is None:
+                    self.logger.debug(f"Dropping reply with no waiting request: {request_id}")
+                elif not future.done():
+                    if tracer.enabled and self.frames.last_decode is not None:
+                        self._decode_times[pending_id] = self.frames.last_decode
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not self.closed:
+                self.logger.error(f"Connection reader stopped: {e}")
+            self._fail_pending(e if isinstance(e, ConnectionError) else ConnectionError(str(e)))
+            await self.close()
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a reply"""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
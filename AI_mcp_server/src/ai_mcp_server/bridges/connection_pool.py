@@ -0,0 +1,222 @@
+"""
+Connection pool for platform bridges
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, List, Optional, Tuple
+
+from .connection import BridgeConnection
+from .framing import TransferStats
+from ..utils.tracing import background_task
+
+
+class ConnectionPool:
+    """Bounded pool of connections to one platform plugin
+
+    A connection is leased to one caller at a time, except a connection whose
+    peer echoes request ids, which is shared until ``pipeline_depth`` requests
+    are in flight on it. Idle connections are health-checked on checkout and
+    closed after ``pool_idle_timeout`` seconds, keeping one warm connection.
+    """
+
+    # Idle time after which checkout pings a connection before using it
+    HEALTH_CHECK_AFTER = 5.0
+
+    def __init__(self, config: Any, logger: logging.Logger, name: str = "bridge"):
+        self.config = config
+        self.logger = logger
+        self.name = name
+        self.size = max(1, getattr(config, "pool_size", 1))
+        self.idle_timeout = getattr(config, "pool_idle_timeout", 60.0)
+        self._connections: List[BridgeConnection] = []
+        self._opening = 0
+        self._changed = asyncio.Condition()
+        self._reaper: Optional[asyncio.Task] = None
+        self.stats = TransferStats()
+
+    @property
+    def open_connections(self) -> int:
+        """Number of open connections"""
+        return sum(1 for connection in self._connections if not connection.closed)
+
+    async def warm(self, count: Optional[int] = None) -> bool:
+        """Open connections up to ``count`` (default: the pool size)"""
+        target = min(self.size, count or self.size)
+        missing = target - self.open_connections - self._opening
+        if missing > 0:
+            results = await asyncio.gather(
+                *(self._open() for _ in range(missing)), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(
+                        f"Failed to connect to {self.config.host}:{self.config.port}: {result}"
+                    )
+        if self._reaper is None and self.idle_timeout:
+            self._reaper = background_task(self._reap_loop())
+        return self.open_connections > 0
+
+    async def acquire(self, timeout: Optional[float] = None) -> BridgeConnection:
+        """Check out a healthy connection, opening one if the pool has room
+
+        Raises ``asyncio.TimeoutError`` if no connection could be checked
+        out within ``timeout`` seconds (default: no limit).
+        """
+        return await asyncio.wait_for(self._checkout(), timeout)
+
+    async def _checkout(self) -> BridgeConnection:
+        async with self._changed:
+            while True:
+                self._prune()
+                connection = self._pick()
+                if connection is not None:
+                    connection.leases += 1
+                    # Pass spare capacity on to the next waiter
+                    if self._pick() is not None:
+                        self._changed.notify(1)
+                    break
+                if len(self._connections) + self._opening < self.size:
+                    self._opening += 1
+                    connection = None
+                    break
+                await self._changed.wait()
+
+        if connection is None:
+            return await self._open(leased=True)
+
+        if time.monotonic() - connection.last_used > self.HEALTH_CHECK_AFTER and connection.leases == 1:
+            try:
+                alive = await self._ping(connection)
+            except asyncio.CancelledError:
+                # The ping may be half-read; do not hand the stream out again
+                await connection.close()
+                await self.release(connection)
+                raise
+            if not alive:
+                await self.release(connection)
+                return await self._checkout()
+        return connection
+
+    async def heartbeat(self) -> Tuple[int, Optional[float]]:
+        """Ping every idle connection, closing those that do not answer
+
+        Connections in use are skipped: their traffic shows they are alive.
+        Returns the number of connections that answered and the fastest
+        round-trip in seconds (None if none answered).
+        """
+        async with self._changed:
+            self._prune()
+            idle = [connection for connection in self._connections if connection.leases == 0]
+            for connection in idle:
+                connection.leases += 1
+
+        async def probe(connection: BridgeConnection) -> Optional[float]:
+            started = time.perf_counter()
+            return time.perf_counter() - started if await self._ping(connection) else None
+
+        try:
+            rtts = await asyncio.gather(*(probe(connection) for connection in idle))
+        finally:
+            async with self._changed:
+                # Released without touching last_used, so idle connections still age out
+                for connection in idle:
+                    connection.leases = max(0, connection.leases - 1)
+                self._prune()
+                self._changed.notify(len(idle))
+        answered = [rtt for rtt in rtts if rtt is not None]
+        return len(answered), min(answered) if answered else None
+
+    async def release(self, connection: BridgeConnection) -> None:
+        """Return a connection to the pool"""
+        async with self._changed:
+            connection.leases = max(0, connection.leases - 1)
+            connection.last_used = time.monotonic()
+            # One lease freed, one waiter woken
+            self._changed.notify(1)
+
+    async def close(self) -> None:
+        """Close every connection in the pool"""
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        connections, self._connections = self._connections, []
+        await asyncio.gather(*(connection.close() for connection in connections))
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _open(self, leased: bool = False) -> BridgeConnection:
+        """Open a new connection and add it to the pool"""
+        if not leased:
+            self._opening += 1
+        try:
+            connection = await BridgeConnection.open(self.config, self.logger, self.stats, self.name)
+            if leased:
+                connection.leases = 1
+            self._connections.append(connection)
+        finally:
+            self._opening -= 1
+            # Waiters counted this connection as on its way; whether it
+            # opened or failed, they must look again
+            async with self._changed:
+                self._changed.notify_all()
+        self.logger.info(
+            f"Connected to {self.config.host}:{self.config.port} "
+            f"({len(self._connections)}/{self.size} pooled)"
+        )
+        return connection
+
+    def _pick(self) -> Optional[BridgeConnection]:
+        """Choose the best available connection, if any"""
+        idle = [connection for connection in self._connections if connection.leases == 0]
+        if idle:
+            # Most recently used first, so surplus connections age out
+            return max(idle, key=lambda connection: connection.last_used)
+
+        depth = max(1, getattr(self.config, "pipeline_depth", 1))
+        shared = [
+            connection for connection in self._connections
+            if connection.multiplexed and connection.leases < depth
+        ]
+        if shared:
+            return min(shared, key=lambda connection: connection.leases)
+        return None
+
+    def _prune(self) -> None:
+        """Forget connections that closed or whose peer went away"""
+        for connection in list(self._connections):
+            if connection.leases == 0 and not connection.healthy:
+                self._connections.remove(connection)
+                asyncio.create_task(connection.close())
+
+    async def _ping(self, connection: BridgeConnection) -> bool:
+        """Verify an idle connection with a ping round-trip"""
+        try:
+            response = await connection.request({"type": "ping", "params": {}})
+            return response.get("status") != "error"
+        except Exception as e:
+            self.logger.warning(f"Discarding dead pooled connection: {e}")
+            await connection.close()
+            return False
+
+    async def _reap_loop(self) -> None:
+        """Close connections that stayed idle past the idle timeout"""
+        interval = max(1.0, self.idle_timeout / 2)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            async with self._changed:
+                self._prune()
+                idle = sorted(
+                    (c for c in self._connections if c.leases == 0),
+                    key=lambda connection: connection.last_used
+                )
+                # Keep one connection warm
+                surplus = max(0, len(idle) - 1) if len(idle) == len(self._connections) else len(idle)
+                expired = [c for c in idle[:surplus] if now - c.last_used > self.idle_timeout]
+                for connection in expired:
+                    self._connections.remove(connection)
+            for connection in expired:
+                self.logger.debug("Closing idle pooled connection")
+                await connection.close()
@@ -0,0 +1,316 @@
+"""
+Message framing for bridge connections
+"""
+
+import asyncio
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .binary import decode_binary, encode_binary
+from ..utils import codec
+
+
+FRAME_DELIMITER = b"\n"
+LENGTH_PREFIX = b"#"
+MAX_HEADER_SIZE = 32
+FLAG_ZLIB = b"z"
+FLAG_BINARY = b"b"
+FRAME_FLAGS = b"abcdefghijklmnopqrstuvwxyz"
+# Bytes that change brace balance or string state in an undelimited message
+_SCAN_TOKENS = re.compile(rb'[{}"\\]')
+
+
+@dataclass
+class TransferStats:
+    """Byte counters for one bridge, before and after compression"""
+    raw_bytes_out: int = 0
+    wire_bytes_out: int = 0
+    raw_bytes_in: int = 0
+    wire_bytes_in: int = 0
+    compressed_frames: int = 0
+    binary_frames: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes kept off the wire by compression"""
+        return (self.raw_bytes_out - self.wire_bytes_out) + (self.raw_bytes_in - self.wire_bytes_in)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Serialize the counters"""
+        return {
+            "raw_bytes_out": self.raw_bytes_out,
+            "wire_bytes_out": self.wire_bytes_out,
+            "raw_bytes_in": self.raw_bytes_in,
+            "wire_bytes_in": self.wire_bytes_in,
+            "compressed_frames": self.compressed_frames,
+            "binary_frames": self.binary_frames,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+def encode_frame(payload: bytes, compress_threshold: Optional[int] = None,
+                 stats: Optional[TransferStats] = None) -> bytes:
+    """Frame an outgoing payload, compressing it when worthwhile
+
+    Payloads are sent newline-delimited unless compression is enabled
+    (``compress_threshold`` is set), the payload exceeds the threshold and
+    zlib actually shrinks it; those go out as ``#z<length>\\n<zlib data>``.
+    """
+    frame = payload + FRAME_DELIMITER
+    if compress_threshold is not None and len(payload) > compress_threshold:
+        compressed = zlib.compress(payload, 6)
+        if len(compressed) < len(payload):
+            frame = LENGTH_PREFIX + FLAG_ZLIB + str(len(compressed)).encode("ascii") + FRAME_DELIMITER + compressed
+            if stats is not None:
+                stats.compressed_frames += 1
+    if stats is not None:
+        stats.raw_bytes_out += len(payload) + 1
+        stats.wire_bytes_out += len(frame)
+    return frame
+
+
+def encode_binary_frame(message: Dict[str, Any], stats: Optional[TransferStats] = None) -> List[Any]:
+    """Frame a message carrying binary buffers as ``#b<length>\\n<payload>``
+
+    Returns the frame as a list of parts for ``StreamWriter.writelines``,
+    so the buffers go to the socket without being copied into one frame.
+    """
+    parts = encode_binary(message)
+    length = sum(len(part) for part in parts)
+    header = LENGTH_PREFIX + FLAG_BINARY + str(length).encode("ascii") + FRAME_DELIMITER
+    if stats is not None:
+        stats.binary_frames += 1
+        stats.raw_bytes_out += length + len(header)
+        stats.wire_bytes_out += length + len(header)
+    return [header, *parts]
+
+
+class FrameReader:
+    """Incremental frame reader over an asyncio stream
+
+    Two frame formats are accepted on the same stream:
+
+    - newline-delimited: ``<json>\\n`` (the format requests are sent in)
+    - length-prefixed: ``#<flags><length>\\n<payload>`` with a decimal byte
+      count and optional flag letters; ``z`` marks a zlib-compressed payload
+      and ``b`` a binary payload (a JSON header followed by raw buffers,
+      see ``binary.encode_binary``)
+
+    Received bytes accumulate in one growing buffer. The delimiter scan
+    resumes where the previous one stopped, so every byte is inspected
+    once, and bytes that follow a frame stay buffered for the next read.
+
+    Until the peer has sent one delimited frame, messages are also
+    accepted without a trailing delimiter, as older plugins reply with a
+    bare (possibly pretty-printed) JSON object.
+
+    A binary frame is read into a ``bytearray`` allocated once at its full
+    size, and its buffers are exposed as arrays over that memory.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, chunk_size: int = 65536,
+                 stats: Optional[TransferStats] = None):
+        self._reader = reader
+        self._stats = stats
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._scan_pos = 0
+        # Brace balance of buffer[:scan_pos] while the peer is not known to
+        # delimit, ignoring braces inside JSON strings
+        self._scan_depth = 0
+        self._scan_in_string = False
+        # Position of the byte escaped by a backslash inside a string
+        self._scan_escaped = -1
+        self._delimited = False
+        # Binary frame being read straight into its own buffer:
+        # (payload, bytes filled, flags, wire size)
+        self._partial: Optional[Tuple[bytearray, int, bytes, int]] = None
+        # Wire size of the last frame read
+        self.last_wire_size = 0
+        # Start and end, in epoch nanoseconds, of the last message's decoding
+        self.last_decode: Optional[Tuple[int, int]] = None
+
+    @property
+    def buffered(self) -> int:
+        """Number of received bytes not yet consumed"""
+        return len(self._buffer)
+
+    async def read_frame(self) -> Union[bytes, bytearray]:
+        """Read the payload of the next frame"""
+        frame, _ = await self._read_payload()
+        return frame
+
+    async def read_message(self) -> Any:
+        """Read and decode the next message"""
+        frame, binary = await self._read_payload()
+        started = time.time_ns()
+        message = decode_binary(frame) if binary else codec.loads(frame)
+        self.last_decode = (started, time.time_ns())
+        return message
+
+    async def _read_payload(self) -> Tuple[Union[bytes, bytearray], bool]:
+        """Read the next frame's payload and whether it is binary"""
+        while True:
+            if self._partial is not None:
+                return await self._read_partial()
+            frame = self._next_frame()
+            if frame is not None:
+                return frame
+            if self._partial is not None:
+                continue
+            message = self._undelimited_message()
+            if message is not None:
+                self._count(len(message), len(message))
+                return message, False
+            await self._fill()
+
+    async def _read_partial(self) -> Tuple[Union[bytes, bytearray], bool]:
+        """Read the rest of a binary frame directly into its buffer"""
+        payload, filled, flags, wire_size = self._partial
+        view = memoryview(payload)
+        while filled < len(payload):
+            chunk = await self._reader.read(min(self._chunk_size, len(payload) - filled))
+            if not chunk:
+                raise ConnectionError("Connection closed by peer")
+            view[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+            self._partial = (payload, filled, flags, wire_size)
+        self._partial = None
+        return self._decode_payload(payload, flags, wire_size)
+
+    async def _fill(self) -> None:
+        """Append the next chunk from the stream to the buffer"""
+        chunk = await self._reader.read(self._chunk_size)
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        self._buffer += chunk
+
+    def _next_frame(self) -> Optional[Tuple[Union[bytes, bytearray], bool]]:
+        """Extract a complete frame from the buffer, if there is one"""
+        buffer = self._buffer
+
+        # Skip blank lines and stray carriage returns between frames
+        if self._scan_pos == 0:
+            start = 0
+            while start < len(buffer) and buffer[start] in b"\r\n":
+                start += 1
+            if start:
+                self._consume(start)
+        if not buffer:
+            return None
+
+        if buffer[:1] == LENGTH_PREFIX:
+            header_end = buffer.find(FRAME_DELIMITER, 0, MAX_HEADER_SIZE)
+            if header_end < 0:
+                if len(buffer) >= MAX_HEADER_SIZE:
+                    raise ValueError("Malformed length-prefixed frame header")
+                return None
+            header = bytes(buffer[1:header_end])
+            length_text = header.lstrip(FRAME_FLAGS)
+            flags = header[:len(header) - len(length_text)]
+            end = header_end + 1 + int(length_text)
+            if FLAG_BINARY in flags:
+                # Preallocate the payload and move what has arrived into it
+                payload = bytearray(end - header_end - 1)
+                received = buffer[header_end + 1:end]
+                payload[:len(received)] = received
+                self._consume(header_end + 1 + len(received))
+                if len(received) < len(payload):
+                    self._partial = (payload, len(received), flags, end)
+                    return None
+                return self._decode_payload(payload, flags, end)
+            if len(buffer) < end:
+                return None
+            frame = bytes(buffer[header_end + 1:end])
+            self._consume(end)
+            return self._decode_payload(frame, flags, end)
+
+        while True:
+            index = buffer.find(FRAME_DELIMITER, self._scan_pos)
+            if index < 0:
+                self._advance_scan(len(buffer))
+                return None
+            self._advance_scan(index)
+            if self._delimited or (self._scan_depth <= 0 and not self._scan_in_string):
+                break
+            # Newline inside an undelimited, pretty-printed message
+            self._scan_pos = index + 1
+
+        frame = bytes(buffer[:index])
+        self._consume(index + 1)
+        self._delimited = True
+        self._count(index + 1, index + 1)
+        return frame, False
+
+    def _decode_payload(self, frame: Union[bytes, bytearray], flags: bytes,
+                        wire_size: int) -> Tuple[Union[bytes, bytearray], bool]:
+        """Undo the encodings named by a frame's flags"""
+        binary = False
+        raw_size = wire_size
+        for flag in flags:
+            if flag == FLAG_ZLIB[0]:
+                frame = zlib.decompress(frame)
+                raw_size = len(frame)
+                if self._stats is not None:
+                    self._stats.compressed_frames += 1
+            elif flag == FLAG_BINARY[0]:
+                binary = True
+                if self._stats is not None:
+                    self._stats.binary_frames += 1
+            else:
+                raise ValueError(f"Unsupported frame flag: {chr(flag)}")
+        self._count(raw_size, wire_size)
+        return frame, binary
+
+    def _count(self, raw_size: int, wire_size: int) -> None:
+        """Record a received frame in the transfer stats"""
+        self.last_wire_size = wire_size
+        if self._stats is not None:
+            self._stats.raw_bytes_in += raw_size
+            self._stats.wire_bytes_in += wire_size
+
+    def _undelimited_message(self) -> Optional[bytes]:
+        """Extract a bare JSON message once its braces are balanced"""
+        buffer = self._buffer
+        if self._delimited or buffer[:1] == LENGTH_PREFIX or buffer[-1:] != b"}":
+            return None
+        self._advance_scan(len(buffer))
+        if self._scan_depth > 0 or self._scan_in_string:
+            return None
+        frame = bytes(buffer)
+        self._consume(len(buffer))
+        return frame
+
+    def _advance_scan(self, position: int) -> None:
+        """Move the scan position forward, tracking brace balance if needed"""
+        if not self._delimited:
+            depth, in_string, escaped = self._scan_depth, self._scan_in_string, self._scan_escaped
+            for match in _SCAN_TOKENS.finditer(self._buffer, self._scan_pos, position):
+                index = match.start()
+                token = self._buffer[index]
+                if in_string:
+                    if index == escaped:
+                        continue
+                    if token == 0x5C:  # backslash
+                        escaped = index + 1
+                    elif token == 0x22:  # quote
+                        in_string = False
+                elif token == 0x7B:  # {
+                    depth += 1
+                elif token == 0x7D:  # }
+                    depth -= 1
+                elif token == 0x22:
+                    in_string = True
+            self._scan_depth, self._scan_in_string, self._scan_escaped = depth, in_string, escaped
+        self._scan_pos = position
+
+    def _consume(self, count: int) -> None:
+        """Drop consumed bytes from the front of the buffer"""
+        del self._buffer[:count]
+        self._scan_pos = 0
+        self._scan_depth = 0
+        self._scan_in_string = False
+        self._scan_escaped = -1
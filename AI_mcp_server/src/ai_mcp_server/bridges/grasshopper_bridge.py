@@ -1,112 +1,324 @@
-"""
-Grasshopper bridge implementation
-"""
-
-import logging
-from typing import Dict, Any, List, Optional
-from .base_bridge import BaseBridge, ConnectionConfig
-
-
-class GrasshopperBridge(BaseBridge):
-    """Bridge to Grasshopper platform"""
-    
-    def __init__(self, config: ConnectionConfig, logger: logging.Logger):
-        super().__init__(config, logger)
-    
-    async def ping(self) -> Dict[str, Any]:
-        """Ping Grasshopper to check connection"""
-        try:
-            return await self.send_command("ping", {})
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
-    
-    async def add_component(self, component_type: str, x: float, y: float) -> Dict[str, Any]:
-        """Add component to Grasshopper canvas"""
-        return await self.send_command("add_component", {
-            "type": component_type,
-            "x": x,
-            "y": y
-        })
-    
-    async def connect_components(self, source_id: str, target_id: str, 
-                                source_param: Optional[str] = None, 
-                                target_param: Optional[str] = None,
-                                source_param_index: Optional[int] = None,
-                                target_param_index: Optional[int] = None) -> Dict[str, Any]:
-        """Connect two components"""
-        params = {
-            "sourceId": source_id,
-            "targetId": target_id
-        }
-        
-        if source_param:
-            params["sourceParam"] = source_param
-        elif source_param_index is not None:
-            params["sourceParamIndex"] = source_param_index
-            
-        if target_param:
-            params["targetParam"] = target_param
-        elif target_param_index is not None:
-            params["targetParamIndex"] = target_param_index
-        
-        return await self.send_command("connect_components", params)
-    
-    async def get_document_info(self) -> Dict[str, Any]:
-        """Get Grasshopper document information"""
-        return await self.send_command("get_document_info", {})
-    
-    async def get_all_components(self) -> Dict[str, Any]:
-        """Get all components in the document"""
-        return await self.send_command("get_all_components", {})
-    
-    async def get_component_info(self, component_id: str) -> Dict[str, Any]:
-        """Get component information"""
-        return await self.send_command("get_component_info", {"componentId": component_id})
-    
-    async def get_connections(self) -> Dict[str, Any]:
-        """Get all connections between components"""
-        return await self.send_command("get_connections", {})
-    
-    async def create_pattern(self, description: str) -> Dict[str, Any]:
-        """Create pattern based on description"""
-        return await self.send_command("create_pattern", {"description": description})
-    
-    async def get_available_patterns(self, query: str) -> Dict[str, Any]:
-        """Get available patterns matching query"""
-        return await self.send_command("get_available_patterns", {"query": query})
-    
-    async def search_components(self, query: str) -> Dict[str, Any]:
-        """Search for components by name or category"""
-        return await self.send_command("search_components", {"query": query})
-    
-    async def get_component_parameters(self, component_type: str) -> Dict[str, Any]:
-        """Get parameters for a component type"""
-        return await self.send_command("get_component_parameters", {"componentType": component_type})
-    
-    async def validate_connection(self, source_id: str, target_id: str,
-                                source_param: Optional[str] = None,
-                                target_param: Optional[str] = None) -> Dict[str, Any]:
-        """Validate if connection is possible"""
-        params = {
-            "sourceId": source_id,
-            "targetId": target_id
-        }
-        
-        if source_param:
-            params["sourceParam"] = source_param
-        if target_param:
-            params["targetParam"] = target_param
-        
-        return await self.send_command("validate_connection", params)
-    
-    async def clear_document(self) -> Dict[str, Any]:
-        """Clear the Grasshopper document"""
-        return await self.send_command("clear_document", {})
-    
-    async def save_document(self, path: str) -> Dict[str, Any]:
-        """Save the Grasshopper document"""
-        return await self.send_command("save_document", {"path": path})
-    
-    async def load_document(self, path: str) -> Dict[str, Any]:
-        """Load a Grasshopper document"""
-        return await self.send_command("load_document", {"path": path})
+"""
+Grasshopper bridge implementation
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional
+from .base_bridge import BaseBridge, ConnectionConfig, PlatformError
+from .resilience import Backoff, RetryPolicy
+from .paging import Page, iterate_pages, make_page, page_params
+from ..local.catalog import ComponentCatalog, normalize_component
+
+
+class GrasshopperBridge(BaseBridge):
+    """Bridge to Grasshopper platform"""
+    
+    CACHE_TTLS = {
+        "get_component_parameters": 300.0,
+        "search_components": 300.0,
+        "get_available_patterns": 300.0,
+        "get_component_info": 10.0,
+    }
+    CACHE_OBJECT_KEYS = {"get_component_info": "componentId"}
+    # Component library queries are unaffected by canvas edits
+    DOCUMENT_INDEPENDENT = frozenset({
+        "get_component_parameters", "search_components", "get_available_patterns"
+    })
+    READ_ONLY_COMMANDS = frozenset({
+        "ping", "get_document_info", "get_all_components", "get_component_info",
+        "get_connections", "get_available_patterns", "search_components",
+        "get_component_parameters", "validate_connection", "save_document",
+        "get_component_catalog",
+    })
+    # save_document writes a file, so it is read-only but not resent
+    IDEMPOTENT_COMMANDS = READ_ONLY_COMMANDS - {"save_document"}
+    DEADLINE_CLASSES = {
+        "ping": "quick",
+        "get_component_info": "quick",
+        "get_component_parameters": "quick",
+        "get_connections": "quick",
+        "search_components": "quick",
+        "validate_connection": "quick",
+        "create_pattern": "long",
+        "load_document": "long",
+        "save_document": "long",
+        "get_component_catalog": "long",
+    }
+    # delete_component is left out: it also removes connections listed in
+    # the cached info of every component wired to the deleted one
+    TARGETED_MUTATIONS = {
+        "connect_components": ("sourceId", "targetId"),
+    }
+    # Seconds before retrying a catalog sync that failed, doubling per failure
+    CATALOG_RETRY_BASE = 5.0
+    CATALOG_RETRY_MAX = 300.0
+    
+    def __init__(self, config: ConnectionConfig, logger: logging.Logger, retry: Optional[RetryPolicy] = None):
+        super().__init__(config, logger, retry)
+        self.catalog = ComponentCatalog(getattr(config, "catalog_path", None) or None, logger)
+        self._catalog_lock = asyncio.Lock()
+        # Whether the catalog was checked against Grasshopper this session
+        self._catalog_checked = False
+        # None until the plugin shows whether it has get_component_catalog
+        self.catalog_supported: Optional[bool] = None
+        self._catalog_failures = 0
+        self._catalog_retry_at = 0.0
+        self._catalog_backoff = Backoff(self.CATALOG_RETRY_BASE, self.CATALOG_RETRY_MAX)
+    
+    async def ping(self) -> Dict[str, Any]:
+        """Ping Grasshopper to check connection"""
+        try:
+            return await self.send_command("ping", {})
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    async def add_component(self, component_type: str, x: float, y: float) -> Dict[str, Any]:
+        """Add component to Grasshopper canvas"""
+        return await self.send_command("add_component", {
+            "type": component_type,
+            "x": x,
+            "y": y
+        })
+    
+    async def add_components(self, components: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add many components using batch envelopes
+        
+        Each component is a dict with ``type``, ``x`` and ``y``. Returns one
+        result entry per component (see ``send_batch``).
+        """
+        return await self.send_batch([
+            {"type": "add_component", "params": {"type": c["type"], "x": c["x"], "y": c["y"]}}
+            for c in components
+        ])
+    
+    async def delete_component(self, component_id: str) -> Dict[str, Any]:
+        """Remove a component from the canvas"""
+        return await self.send_command("delete_component", {"componentId": component_id})
+    
+    async def delete_components(self, component_ids: List[str]) -> List[Dict[str, Any]]:
+        """Remove many components using batch envelopes"""
+        return await self.send_batch([
+            {"type": "delete_component", "params": {"componentId": component_id}}
+            for component_id in component_ids
+        ])
+    
+    async def connect_components(self, source_id: str, target_id: str, 
+                                source_param: Optional[str] = None, 
+                                target_param: Optional[str] = None,
+                                source_param_index: Optional[int] = None,
+                                target_param_index: Optional[int] = None) -> Dict[str, Any]:
+        """Connect two components"""
+        params = {
+            "sourceId": source_id,
+            "targetId": target_id
+        }
+        
+        if source_param:
+            params["sourceParam"] = source_param
+        elif source_param_index is not None:
+            params["sourceParamIndex"] = source_param_index
+            
+        if target_param:
+            params["targetParam"] = target_param
+        elif target_param_index is not None:
+            params["targetParamIndex"] = target_param_index
+        
+        return await self.send_command("connect_components", params)
+    
+    async def get_document_info(self) -> Dict[str, Any]:
+        """Get Grasshopper document information"""
+        return await self.send_command("get_document_info", {})
+    
+    async def get_all_components(self) -> Dict[str, Any]:
+        """Get all components in the document"""
+        return await self.send_command("get_all_components", {})
+    
+    async def get_components_page(self, offset: int = 0, limit: int = 500,
+                                  cursor: Optional[str] = None) -> Page:
+        """Get one page of the components in the document"""
+        params = page_params(offset, limit, cursor)
+        result = await self.send_command("get_all_components", params)
+        return make_page(result, ("components", "result"), params["offset"], limit)
+    
+    async def iter_component_pages(self, page_size: int = 500) -> AsyncIterator[Page]:
+        """Stream the document's components page by page"""
+        async for page in iterate_pages(
+            lambda offset, cursor: self.get_components_page(offset, page_size, cursor)
+        ):
+            yield page
+    
+    async def get_component_info(self, component_id: str) -> Dict[str, Any]:
+        """Get component information"""
+        return await self.send_command("get_component_info", {"componentId": component_id})
+    
+    async def get_connections(self) -> Dict[str, Any]:
+        """Get all connections between components"""
+        return await self.send_command("get_connections", {})
+    
+    async def get_connections_page(self, offset: int = 0, limit: int = 500,
+                                   cursor: Optional[str] = None) -> Page:
+        """Get one page of the connections between components"""
+        params = page_params(offset, limit, cursor)
+        result = await self.send_command("get_connections", params)
+        return make_page(result, ("connections", "result"), params["offset"], limit)
+    
+    async def iter_connection_pages(self, page_size: int = 500) -> AsyncIterator[Page]:
+        """Stream the document's connections page by page"""
+        async for page in iterate_pages(
+            lambda offset, cursor: self.get_connections_page(offset, page_size, cursor)
+        ):
+            yield page
+    
+    async def create_pattern(self, description: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Create pattern based on description"""
+        return await self.send_command("create_pattern", {"description": description}, timeout=timeout)
+    
+    async def get_available_patterns(self, query: str) -> Dict[str, Any]:
+        """Get available patterns matching query"""
+        return await self.send_command("get_available_patterns", {"query": query})
+    
+    async def search_components(self, query: str) -> Dict[str, Any]:
+        """Search for components by name or category"""
+        return await self.send_command("search_components", {"query": query})
+    
+    async def get_component_parameters(self, component_type: str) -> Dict[str, Any]:
+        """Get parameters for a component type"""
+        return await self.send_command("get_component_parameters", {"componentType": component_type})
+    
+    async def validate_connection(self, source_id: str, target_id: str,
+                                source_param: Optional[str] = None,
+                                target_param: Optional[str] = None) -> Dict[str, Any]:
+        """Validate if connection is possible"""
+        params = {
+            "sourceId": source_id,
+            "targetId": target_id
+        }
+        
+        if source_param:
+            params["sourceParam"] = source_param
+        if target_param:
+            params["targetParam"] = target_param
+        
+        return await self.send_command("validate_connection", params)
+    
+    async def clear_document(self) -> Dict[str, Any]:
+        """Clear the Grasshopper document"""
+        return await self.send_command("clear_document", {})
+    
+    async def save_document(self, path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Save the Grasshopper document"""
+        return await self.send_command("save_document", {"path": path}, timeout=timeout)
+    
+    async def load_document(self, path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Load a Grasshopper document"""
+        return await self.send_command("load_document", {"path": path}, timeout=timeout)
+    
+    async def get_catalog(self, refresh: bool = False) -> ComponentCatalog:
+        """Get the component catalog, syncing it with Grasshopper once per session
+        
+        The catalog persisted on disk is loaded first. The plugin is then
+        asked for ``get_component_catalog`` with the version key on hand and
+        only sends the catalog when it changed. Plugins without that command
+        are listed through ``search_components`` with an empty query.
+        
+        After a failed sync with no catalog on disk, calls fail without
+        contacting Grasshopper until a backoff has passed.
+        """
+        async with self._catalog_lock:
+            if refresh or not self._catalog_checked:
+                if not self.catalog.loaded:
+                    self.catalog.load()
+                if not refresh and time.monotonic() < self._catalog_retry_at:
+                    raise Exception("Component catalog unavailable; retrying later")
+                try:
+                    await self._sync_catalog()
+                except Exception:
+                    self._catalog_retry_at = time.monotonic() + self._catalog_backoff.ceiling(self._catalog_failures)
+                    self._catalog_failures += 1
+                    raise
+                self._catalog_failures = 0
+                self._catalog_retry_at = 0.0
+        return self.catalog
+    
+    async def find_components(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search the local component catalog"""
+        catalog = await self.get_catalog()
+        return catalog.search(query, limit)
+    
+    async def get_component_signature(self, component_type: str) -> Dict[str, Any]:
+        """Get the ``inputs`` and ``outputs`` of a component type, from the catalog when known"""
+        try:
+            catalog = await self.get_catalog()
+        except Exception as e:
+            self.logger.debug(f"Component catalog unavailable: {e}")
+            return _signature(await self.get_component_parameters(component_type))
+        
+        signature = catalog.signature(component_type)
+        if signature is None:
+            signature = _signature(await self.get_component_parameters(component_type))
+            catalog.set_signature(component_type, signature)
+            catalog.save()
+        return signature
+    
+    async def _sync_catalog(self) -> None:
+        """Bring the catalog up to date with the plugin"""
+        result = None
+        if self.catalog_supported is not False:
+            try:
+                result = await self.send_command("get_component_catalog", {"known_version": self.catalog.version})
+                self.catalog_supported = True
+            except ConnectionError as e:
+                if not self.catalog.loaded:
+                    raise Exception(f"Component catalog unavailable: {e}")
+                self.logger.warning(f"Using component catalog from disk; Grasshopper unreachable: {e}")
+                self._catalog_checked = True
+                return
+            except PlatformError as e:
+                self.logger.info(f"get_component_catalog unsupported ({e}); listing components instead")
+                self.catalog_supported = False
+            except Exception as e:
+                self.logger.debug(f"get_component_catalog failed ({e}); listing components instead")
+        
+        if result and result.get("unchanged") and self.catalog.loaded:
+            self._catalog_checked = True
+            return
+        
+        components = _component_list(result) if result else []
+        version = result.get("version") if result else None
+        if not components:
+            try:
+                components = _component_list(await self.search_components(""))
+            except Exception as e:
+                if not self.catalog.loaded:
+                    raise Exception(f"Component catalog unavailable: {e}")
+                self.logger.warning(f"Using component catalog from disk; Grasshopper unreachable: {e}")
+                self._catalog_checked = True
+                return
+            version = ComponentCatalog.version_of(normalize_component(c) for c in components)
+        
+        if not components:
+            if not self.catalog.loaded:
+                raise Exception("Grasshopper returned an empty component catalog")
+        elif version is None or version != self.catalog.version:
+            self.catalog.replace(components, version)
+            self.catalog.save()
+            self.logger.info(f"Component catalog updated: {len(components)} components")
+        self._catalog_checked = True
+
+
+def _signature(result: Any) -> Dict[str, Any]:
+    """Catalog signature from a get_component_parameters reply"""
+    component = normalize_component(result) if isinstance(result, dict) else {}
+    return component.get("signature") or {"inputs": [], "outputs": []}
+
+
+def _component_list(result: Any) -> List[Dict[str, Any]]:
+    """Extract the component list from a catalog or search reply"""
+    if isinstance(result, dict):
+        result = next(
+            (result[key] for key in ("components", "results", "result") if isinstance(result.get(key), list)),
+            []
+        )
+    return [item for item in result if isinstance(item, dict)] if isinstance(result, list) else []
@@ -0,0 +1,51 @@
+"""
+Cached connection health for platform bridges
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class HealthRecord:
+    """Last known health of one bridge
+
+    Updated by the heartbeat and by every command exchange, so reading it
+    costs no round-trip. Times are wall-clock seconds since the epoch.
+    """
+    connected: bool = False
+    last_rtt_ms: Optional[float] = None
+    last_success: Optional[float] = None
+    last_failure: Optional[float] = None
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+    heartbeats: int = 0
+
+    def record_success(self, rtt: Optional[float] = None) -> None:
+        """Note a completed exchange, with its round-trip time in seconds if measured"""
+        self.connected = True
+        self.last_success = time.time()
+        self.consecutive_failures = 0
+        if rtt is not None:
+            self.last_rtt_ms = rtt * 1000
+
+    def record_failure(self, error: str, connected: bool = False) -> None:
+        """Note a failed exchange or a lost connection"""
+        self.connected = connected
+        self.last_failure = time.time()
+        self.last_error = error
+        self.consecutive_failures += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the record, with ages instead of timestamps"""
+        now = time.time()
+        return {
+            "connected": self.connected,
+            "last_rtt_ms": round(self.last_rtt_ms, 2) if self.last_rtt_ms is not None else None,
+            "last_success_age_s": round(now - self.last_success, 1) if self.last_success else None,
+            "last_failure_age_s": round(now - self.last_failure, 1) if self.last_failure else None,
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "heartbeats": self.heartbeats,
+        }
@@ -0,0 +1,100 @@
+"""
+Cursor pagination for large bridge listings
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class Page:
+    """One page of a listing"""
+    items: List[Dict[str, Any]]
+    offset: int
+    limit: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    # Non-list fields of the reply, e.g. document name or units
+    info: Dict[str, Any] = field(default_factory=dict)
+    # Whole listing, when the plugin ignored paging and returned all of it
+    listing: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+
+    def to_dict(self, key: str) -> Dict[str, Any]:
+        """Serialize with the listing stored under ``key``"""
+        data = dict(self.info)
+        data.update({
+            key: self.items,
+            "offset": self.offset,
+            "limit": self.limit,
+            "next_cursor": self.next_cursor,
+        })
+        if self.total is not None:
+            data["total"] = self.total
+        return data
+
+
+def page_params(offset: int, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Build paging parameters for a listing command"""
+    # Cursors synthesized by make_page are plain offsets
+    if cursor is not None and cursor.isdigit():
+        offset = int(cursor)
+    params: Dict[str, Any] = {"offset": offset, "limit": limit}
+    if cursor is not None:
+        params["cursor"] = cursor
+    return params
+
+
+def make_page(result: Dict[str, Any], keys: Sequence[str], offset: int, limit: int) -> Page:
+    """Normalize a listing reply into a page
+
+    Plugins that support paging return at most ``limit`` items along with
+    ``next_cursor``, ``total`` or ``offset``. A reply with none of these
+    came from a plugin that ignored the paging parameters and returned the
+    whole listing, which is then sliced here and kept in ``listing``.
+    Without a plugin cursor, the cursor for the next page is the next
+    offset.
+    """
+    key = next((k for k in keys if isinstance(result.get(k), list)), None)
+    items: List[Dict[str, Any]] = result.get(key, []) if key else []
+    reserved = (*keys, "next_cursor", "total", "offset", "limit")
+    info = {k: v for k, v in result.items() if k not in reserved}
+    total = result.get("total")
+    listing = None
+
+    if not any(k in result for k in ("next_cursor", "total", "offset")):
+        # Paging parameters were ignored
+        listing = items
+        total = len(items)
+        items = items[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < total else None
+    else:
+        next_cursor = result.get("next_cursor")
+        if "next_cursor" not in result and len(items) == limit and (total is None or offset + limit < total):
+            next_cursor = str(offset + limit)
+
+    return Page(items=items, offset=offset, limit=limit,
+                next_cursor=next_cursor, total=total, info=info, listing=listing)
+
+
+async def iterate_pages(fetch_page: Callable[[int, Optional[str]], Awaitable[Page]],
+                        start_offset: int = 0) -> AsyncIterator[Page]:
+    """Follow cursors from ``fetch_page(offset, cursor)`` until exhausted
+
+    When the plugin ignores paging, the remaining pages are cut from the
+    listing it already returned instead of fetching it again per page.
+    """
+    offset, cursor = start_offset, None
+    while True:
+        page = await fetch_page(offset, cursor)
+        yield page
+        if not page.next_cursor or not page.items:
+            return
+        if page.listing is not None:
+            listing, limit = page.listing, page.limit
+            for start in range(page.offset + len(page.items), len(listing), limit):
+                yield Page(items=listing[start:start + limit], offset=start, limit=limit,
+                           next_cursor=str(start + limit) if start + limit < len(listing) else None,
+                           total=page.total, info=page.info, listing=listing)
+            return
+        cursor = page.next_cursor
+        offset = page.offset + len(page.items)
@@ -0,0 +1,171 @@
+"""
+Retry backoff, circuit breaking and background reconnects for bridges
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..utils.tracing import background_task
+
+
+@dataclass
+class RetryPolicy:
+    """Retry and circuit breaker settings shared by a bridge's components"""
+    max_retries: int = 3
+    retry_delay: float = 1.0
+    max_delay: float = 30.0
+    failure_threshold: int = 3
+    reset_timeout: float = 5.0
+
+
+class Backoff:
+    """Exponential backoff with full jitter
+
+    Attempt ``n`` waits a random time between zero and
+    ``min(cap, base * 2**n)``, so clients that failed together do not
+    retry together.
+    """
+
+    def __init__(self, base: float, cap: float):
+        self.base = base
+        self.cap = max(base, cap)
+
+    def ceiling(self, attempt: int) -> float:
+        """Longest wait for an attempt"""
+        return min(self.cap, self.base * (2 ** min(attempt, 32)))
+
+    def delay(self, attempt: int) -> float:
+        """Wait before an attempt (0 for the first retry is possible)"""
+        return random.uniform(0, self.ceiling(attempt))
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without contacting the platform while its circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over transport failures
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail at once. Once the open period has passed a single probe
+    call is let through (half-open): success closes the circuit, failure
+    opens it again for twice as long, up to ``max_delay``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, policy: RetryPolicy, logger: Optional[logging.Logger] = None):
+        self.name = name
+        self.failure_threshold = max(1, policy.failure_threshold)
+        self.logger = logger or logging.getLogger(__name__)
+        self._backoff = Backoff(policy.reset_timeout, policy.max_delay)
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_until = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """Let a call through or raise ``CircuitOpenError``"""
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.OPEN:
+            remaining = self._opened_until - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} is unavailable; next attempt in {remaining:.1f}s")
+            self.state = self.HALF_OPEN
+        if self._probing:
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} is unavailable; a reconnect attempt is in progress")
+        self._probing = True
+
+    def record_success(self) -> None:
+        """Close the circuit"""
+        if self.state != self.CLOSED:
+            self.logger.info(f"{self.name} circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a transport failure, opening the circuit at the threshold"""
+        self._probing = False
+        self.failures += 1
+        if self.state == self.OPEN:
+            # A call that started before the circuit opened
+            return
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            # Jitter only lengthens the wait, so the breaker never opens for
+            # less than the configured reset timeout
+            open_for = self._backoff.ceiling(self.trips) + self._backoff.delay(self.trips) / 4
+            self._opened_until = time.monotonic() + open_for
+            self.trips += 1
+            if self.state != self.OPEN:
+                self.logger.warning(f"{self.name} circuit open for {open_for:.1f}s after {self.failures} failures")
+            self.state = self.OPEN
+
+    def abandon(self) -> None:
+        """Release the half-open probe slot of a call that was cancelled"""
+        self._probing = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Breaker state for status reports"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in_s": round(max(0.0, self._opened_until - time.monotonic()), 1) if self.state == self.OPEN else None,
+            "rejected": self.rejected,
+        }
+
+
+class ReconnectManager:
+    """Reopen a lost connection in the background with backoff
+
+    Commands never wait on a reconnect: they either find the connection
+    restored or are rejected by the circuit breaker.
+    """
+
+    def __init__(self, connect: Callable[[], Awaitable[bool]], policy: RetryPolicy,
+                 logger: Optional[logging.Logger] = None, name: str = "bridge"):
+        self._connect = connect
+        self._backoff = Backoff(policy.retry_delay, policy.max_delay)
+        self.max_attempts = max(1, policy.max_retries)
+        self.logger = logger or logging.getLogger(__name__)
+        self.name = name
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a reconnect is in progress"""
+        return self._task is not None and not self._task.done()
+
+    def schedule(self) -> None:
+        """Start reconnecting unless already doing so"""
+        if not self.active:
+            self._task = background_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel a reconnect in progress"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        for attempt in range(self.max_attempts):
+            await asyncio.sleep(self._backoff.delay(attempt))
+            try:
+                if await self._connect():
+                    self.logger.info(f"{self.name} reconnected after {attempt + 1} attempt(s)")
+                    return
+            except Exception as e:
+                self.logger.debug(f"{self.name} reconnect attempt {attempt + 1} failed: {e}")
+        self.logger.warning(f"{self.name} still unreachable after {self.max_attempts} reconnect attempts")
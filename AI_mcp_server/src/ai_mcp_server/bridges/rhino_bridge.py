@@ -1,77 +1,335 @@
-"""
-Rhino bridge implementation
-"""
-
-import logging
-from typing import Dict, Any
-from .base_bridge import BaseBridge, ConnectionConfig
-
-
-class RhinoBridge(BaseBridge):
-    """Bridge to Rhino platform"""
-    
-    def __init__(self, config: ConnectionConfig, logger: logging.Logger):
-        super().__init__(config, logger)
-    
-    async def ping(self) -> Dict[str, Any]:
-        """Ping Rhino to check connection"""
-        try:
-            return await self.send_command("ping", {})
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
-    
-    async def create_object(self, object_type: str, params: Dict[str, Any], **kwargs) -> Dict[str, Any]:
-        """Create object in Rhino"""
-        command_params = {
-            "type": object_type,
-            "params": params
-        }
-        
-        # Add optional parameters
-        for key, value in kwargs.items():
-            if value is not None:
-                command_params[key] = value
-        
-        return await self.send_command("create_object", command_params)
-    
-    async def get_document_info(self) -> Dict[str, Any]:
-        """Get Rhino document information"""
-        return await self.send_command("get_document_info", {})
-    
-    async def get_object_info(self, object_id: str) -> Dict[str, Any]:
-        """Get object information"""
-        return await self.send_command("get_object_info", {"object_id": object_id})
-    
-    async def modify_object(self, object_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Modify object in Rhino"""
-        return await self.send_command("modify_object", {
-            "object_id": object_id,
-            "params": params
-        })
-    
-    async def delete_object(self, object_id: str) -> Dict[str, Any]:
-        """Delete object in Rhino"""
-        return await self.send_command("delete_object", {"object_id": object_id})
-    
-    async def select_objects(self, filters: Dict[str, Any]) -> Dict[str, Any]:
-        """Select objects based on filters"""
-        return await self.send_command("select_objects", {"filters": filters})
-    
-    async def execute_script(self, script: str) -> Dict[str, Any]:
-        """Execute RhinoScript Python code"""
-        return await self.send_command("execute_rhinoscript_python_code", {"script": script})
-    
-    async def create_layer(self, name: str, color: list = None) -> Dict[str, Any]:
-        """Create layer in Rhino"""
-        params = {"name": name}
-        if color:
-            params["color"] = color
-        return await self.send_command("create_layer", params)
-    
-    async def get_current_layer(self) -> Dict[str, Any]:
-        """Get current layer information"""
-        return await self.send_command("get_or_set_current_layer", {})
-    
-    async def set_current_layer(self, layer_name: str) -> Dict[str, Any]:
-        """Set current layer"""
-        return await self.send_command("get_or_set_current_layer", {"layer_name": layer_name})
+"""
+Rhino bridge implementation
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence, Set, Tuple
+from .base_bridge import BaseBridge, ConnectionConfig, PlatformError
+from .resilience import RetryPolicy
+from .binary import pack_rows
+from .columnar import ColumnarBatch
+from .paging import Page, iterate_pages, make_page, page_params
+from ..local.mirror import DocumentMirror
+from ..local.spatial import SpatialIndex
+from ..utils import codec
+
+
+class RhinoBridge(BaseBridge):
+    """Bridge to Rhino platform"""
+    
+    CACHE_TTLS = {"get_object_info": 10.0}
+    CACHE_OBJECT_KEYS = {"get_object_info": "object_id"}
+    READ_ONLY_COMMANDS = frozenset({
+        "ping", "get_document_info", "get_object_info", "get_document_changes", "get_document_hash"
+    })
+    IDEMPOTENT_COMMANDS = READ_ONLY_COMMANDS
+    DEADLINE_CLASSES = {
+        "ping": "quick",
+        "get_object_info": "quick",
+        "get_document_hash": "quick",
+        "get_document_changes": "quick",
+        "get_or_set_current_layer": "quick",
+        "select_objects": "quick",
+        "execute_rhinoscript_python_code": "long",
+        "create_objects_columnar": "long",
+    }
+    TARGETED_MUTATIONS = {
+        "modify_object": ("object_id",),
+        "delete_object": ("object_id",),
+    }
+    
+    # Columnar chunks in flight at once
+    COLUMNAR_CONCURRENCY = 4
+    
+    def __init__(self, config: ConnectionConfig, logger: logging.Logger, retry: Optional[RetryPolicy] = None):
+        super().__init__(config, logger, retry)
+        self.mirror: Optional[DocumentMirror] = None
+        if getattr(config, "mirror", False):
+            self.mirror = DocumentMirror(
+                self, logger,
+                max_age=getattr(config, "mirror_max_age", 1.0),
+                verify_interval=getattr(config, "mirror_verify_interval", 30.0)
+            )
+        self._spatial: Optional[SpatialIndex] = None
+        self._spatial_revision = -1
+        # None until the plugin has accepted or rejected a columnar chunk
+        self._columnar_supported: Optional[bool] = None
+    
+    async def ping(self) -> Dict[str, Any]:
+        """Ping Rhino to check connection"""
+        try:
+            return await self.send_command("ping", {})
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    async def create_object(self, object_type: str, params: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Create object in Rhino"""
+        return await self.send_command("create_object", _create_object_params(object_type, params, **kwargs))
+    
+    async def create_mesh(self, vertices: Any, faces: Any, normals: Optional[Any] = None,
+                          **kwargs) -> Dict[str, Any]:
+        """Create a mesh from vertex, face and optional normal arrays
+        
+        Vertices and normals are packed as float32 and faces as int32 (quads
+        with triangles padded). With binary frames negotiated they travel as
+        raw buffers; otherwise they are sent as JSON number lists.
+        """
+        params = {"vertices": pack_rows(vertices, 3, "float32")}
+        params["faces"] = pack_rows(faces, None, "int32")
+        if normals is not None:
+            params["normals"] = pack_rows(normals, 3, "float32")
+        return await self.create_object("MESH", params, **kwargs)
+    
+    async def create_objects(self, objects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many objects in Rhino using batch envelopes
+        
+        Each object is a dict with ``type``, ``params`` and optional ``name``,
+        ``color``, ``translation``, ``rotation`` and ``scale``. Returns one
+        result entry per object (see ``send_batch``).
+        """
+        commands = []
+        for obj_data in objects:
+            extra = {key: value for key, value in obj_data.items() if key not in ("type", "params")}
+            commands.append({
+                "type": "create_object",
+                "params": _create_object_params(obj_data.get("type", "BOX"), obj_data.get("params", {}), **extra)
+            })
+        return await self.send_batch(commands)
+    
+    async def create_objects_columnar(self, object_type: str, positions: Any,
+                                      params: Optional[Dict[str, Any]] = None,
+                                      colors: Optional[Any] = None,
+                                      names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Create many objects of one type from columnar arrays
+        
+        See ``ColumnarBatch`` for the column layout. Rows are sent in
+        ``create_objects_columnar`` chunks sized to ``max_frame_size``; a
+        plugin that rejects that command gets each chunk as a batch of
+        ``create_object`` commands instead. Rows whose chunk timed out or
+        lost its connection are reported as errors, not sent again, as the
+        plugin may have created them. Returns the number of objects
+        created, their ids and any errors.
+        """
+        batch = ColumnarBatch(object_type, positions, params, colors, names)
+        chunks = list(batch.chunks(self.config.max_frame_size))
+        if not chunks:
+            return {"type": object_type, "count": 0, "created": 0, "ids": [], "errors": []}
+        
+        probed: List[Tuple[int, List[str], List[str]]] = []
+        while self._columnar_supported is None and chunks:
+            # Probe one chunk at a time until the plugin answers
+            probed.append(await self._send_columnar_chunk(batch, *chunks.pop(0)))
+        
+        limit = asyncio.Semaphore(self.COLUMNAR_CONCURRENCY)
+        
+        async def send(chunk: Tuple[int, int]) -> Tuple[int, List[str], List[str]]:
+            async with limit:
+                return await self._send_columnar_chunk(batch, *chunk)
+        
+        results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        created = 0
+        ids: List[str] = []
+        errors: List[str] = []
+        for chunk_created, chunk_ids, chunk_errors in probed + list(results):
+            created += chunk_created
+            ids.extend(chunk_ids)
+            errors.extend(chunk_errors)
+        return {"type": object_type, "count": batch.count, "created": created, "ids": ids, "errors": errors}
+    
+    async def _send_columnar_chunk(self, batch: ColumnarBatch, start: int,
+                                   stop: int) -> Tuple[int, List[str], List[str]]:
+        """Create one chunk of rows; returns the created count, ids and errors"""
+        if self._columnar_supported is not False:
+            try:
+                result = await self.send_command("create_objects_columnar", batch.chunk_params(start, stop))
+                self._columnar_supported = True
+                ids = [str(object_id) for object_id in result.get("ids", [])]
+                return result.get("created", len(ids)), ids, list(result.get("errors", []))
+            except PlatformError as e:
+                if self._columnar_supported:
+                    return 0, [], [f"Rows {start}-{stop - 1}: {e}"]
+                # Rejected, so none of the rows were created
+                self.logger.info(f"Peer rejected columnar creation ({e}); sending batches instead")
+                self._columnar_supported = False
+            except Exception as e:
+                # The outcome is unknown; resending could create the rows twice
+                return 0, [], [f"Rows {start}-{stop - 1}: {str(e) or type(e).__name__}"]
+        
+        created = 0
+        ids: List[str] = []
+        errors: List[str] = []
+        results = await self.send_batch(batch.chunk_commands(start, stop))
+        for row, result in enumerate(results, start):
+            if result["status"] == "error":
+                errors.append(f"Row {row}: {result['message']}")
+                continue
+            created += 1
+            if isinstance(result["result"], dict) and result["result"].get("id") is not None:
+                ids.append(str(result["result"]["id"]))
+        return created, ids, errors
+    
+    async def get_document_info(self) -> Dict[str, Any]:
+        """Get Rhino document information, from the local mirror when enabled"""
+        if self.mirror is not None:
+            return await self.mirror.document_info()
+        return await self.send_command("get_document_info", {})
+    
+    async def get_document_info_page(self, offset: int = 0, limit: int = 500,
+                                     cursor: Optional[str] = None) -> Page:
+        """Get one page of the Rhino document's objects"""
+        params = page_params(offset, limit, cursor)
+        result = await self.send_command("get_document_info", params)
+        return make_page(result, ("objects",), params["offset"], limit)
+    
+    async def iter_document_pages(self, page_size: int = 500) -> AsyncIterator[Page]:
+        """Stream the Rhino document's objects page by page"""
+        async for page in iterate_pages(
+            lambda offset, cursor: self.get_document_info_page(offset, page_size, cursor)
+        ):
+            yield page
+    
+    async def get_object_info(self, object_id: str) -> Dict[str, Any]:
+        """Get object information
+        
+        Over binary frames, mesh ``vertices``, ``faces`` and ``normals`` come
+        back as arrays over the received frame rather than nested lists.
+        """
+        return await self.send_command("get_object_info", {"object_id": object_id})
+    
+    async def get_objects_info(self, object_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get information about many objects using batch envelopes"""
+        return await self.send_batch([
+            {"type": "get_object_info", "params": {"object_id": object_id}}
+            for object_id in object_ids
+        ])
+    
+    async def modify_object(self, object_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Modify object in Rhino"""
+        return await self.send_command("modify_object", {
+            "object_id": object_id,
+            "params": params
+        })
+    
+    async def modify_objects(self, modifications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Modify many objects using batch envelopes
+        
+        Each modification is a dict with ``object_id`` and ``params``.
+        """
+        return await self.send_batch([
+            {"type": "modify_object", "params": {"object_id": item["object_id"], "params": item.get("params", {})}}
+            for item in modifications
+        ])
+    
+    async def delete_object(self, object_id: str) -> Dict[str, Any]:
+        """Delete object in Rhino"""
+        return await self.send_command("delete_object", {"object_id": object_id})
+    
+    async def delete_objects(self, object_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete many objects using batch envelopes"""
+        return await self.send_batch([
+            {"type": "delete_object", "params": {"object_id": object_id}}
+            for object_id in object_ids
+        ])
+    
+    async def select_objects(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Select objects based on filters"""
+        return await self.send_command("select_objects", {"filters": filters})
+    
+    async def spatial_index(self) -> SpatialIndex:
+        """Spatial index over the document's object bounding boxes
+        
+        Built from the document mirror and rebuilt only when the mirrored
+        objects change; without a mirror, each call indexes a snapshot.
+        """
+        if self.mirror is None:
+            result = await self.send_command("get_document_info", {})
+            return SpatialIndex(result.get("objects", []))
+        
+        await self.mirror.refresh()
+        if self._spatial is None or self._spatial_revision != self.mirror.revision:
+            self._spatial = SpatialIndex(self.mirror.objects.values())
+            self._spatial_revision = self.mirror.revision
+        return self._spatial
+    
+    async def find_objects(self, window: Optional[List[float]] = None,
+                           crossing: Optional[List[float]] = None,
+                           near: Optional[List[float]] = None, count: int = 10,
+                           layer: Optional[str] = None,
+                           object_type: Optional[str] = None) -> List[str]:
+        """Find object ids locally by region, proximity, layer and type
+        
+        ``window`` and ``crossing`` are boxes given as
+        ``[min_x, min_y, min_z, max_x, max_y, max_z]``: window matches
+        objects entirely inside, crossing also those touching the box.
+        ``near`` is a point; the ``count`` closest objects are returned.
+        """
+        index = await self.spatial_index()
+        if window is not None:
+            return index.window(tuple(window), layer, object_type)
+        if crossing is not None:
+            return index.crossing(tuple(crossing), layer, object_type)
+        if near is not None:
+            return index.nearest(near, count, layer, object_type)
+        return index.select(layer, object_type)
+    
+    async def select_object_ids(self, object_ids: List[str]) -> Dict[str, Any]:
+        """Replace Rhino's selection with the given objects
+        
+        Selecting changes no object, so unlike other scripts this one
+        leaves the response cache and the document mirror alone and runs
+        under the quick deadline.
+        """
+        script = (
+            "import rhinoscriptsyntax as rs\n"
+            "rs.UnselectAllObjects()\n"
+            f"rs.SelectObjects({codec.dumps([str(i) for i in object_ids]).decode('utf-8')})\n"
+        )
+        return await self.send_command("execute_rhinoscript_python_code", {"script": script},
+                                       timeout=self.deadline_for("select_objects"), read_only=True)
+    
+    async def execute_script(self, script: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute RhinoScript Python code"""
+        return await self.send_command("execute_rhinoscript_python_code", {"script": script}, timeout=timeout)
+    
+    async def create_layer(self, name: str, color: list = None) -> Dict[str, Any]:
+        """Create layer in Rhino"""
+        params = {"name": name}
+        if color:
+            params["color"] = color
+        return await self.send_command("create_layer", params)
+    
+    async def get_current_layer(self) -> Dict[str, Any]:
+        """Get current layer information"""
+        return await self.send_command("get_or_set_current_layer", {})
+    
+    async def set_current_layer(self, layer_name: str) -> Dict[str, Any]:
+        """Set current layer"""
+        return await self.send_command("get_or_set_current_layer", {"layer_name": layer_name})
+    
+    async def disconnect(self) -> None:
+        """Disconnect from Rhino"""
+        await super().disconnect()
+        if self.mirror is not None:
+            self.mirror.clear()
+    
+    def _invalidate(self, object_ids: Optional[Set[str]]) -> None:
+        """Drop cached replies and mark the document mirror stale"""
+        super()._invalidate(object_ids)
+        if self.mirror is not None:
+            self.mirror.mark_stale()
+
+
+def _create_object_params(object_type: str, params: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    """Build the create_object command parameters"""
+    command_params = {
+        "type": object_type,
+        "params": params
+    }
+    
+    # Add optional parameters
+    for key, value in kwargs.items():
+        if value is not None:
+            command_params[key] = value
+    
+    return command_params
@@ -1,8 +1,16 @@
-"""
-Core modules for AI MCP Server
-"""
-
-from .config import Config
-from .server import AIServer
-
-__all__ = ["Config", "AIServer"]
+"""
+Core modules for AI MCP Server
+"""
+
+__all__ = ["Config", "AIServer"]
+
+
+def __getattr__(name):
+    # Imported on first access, so loading the config does not pull in the server
+    if name == "Config":
+        from .config import Config
+        return Config
+    if name == "AIServer":
+        from .server import AIServer
+        return AIServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,83 +1,187 @@
-"""
-Configuration management for AI MCP Server
-"""
-
-import os
-from typing import Optional
-from pydantic import BaseModel, Field
-from pathlib import Path
-
-
-class RhinoConfig(BaseModel):
-    """Rhino connection configuration"""
-    host: str = Field(default="127.0.0.1", description="Rhino host address")
-    port: int = Field(default=1999, description="Rhino port")
-    timeout: float = Field(default=15.0, description="Connection timeout in seconds")
-    auto_reconnect: bool = Field(default=True, description="Auto-reconnect on connection loss")
-
-
-class GrasshopperConfig(BaseModel):
-    """Grasshopper connection configuration"""
-    host: str = Field(default="127.0.0.1", description="Grasshopper host address")
-    port: int = Field(default=8080, description="Grasshopper port")
-    timeout: float = Field(default=15.0, description="Connection timeout in seconds")
-    auto_reconnect: bool = Field(default=True, description="Auto-reconnect on connection loss")
-
-
-class ServerConfig(BaseModel):
-    """Main server configuration"""
-    name: str = Field(default="AI MCP Server", description="Server name")
-    version: str = Field(default="1.0.0", description="Server version")
-    debug: bool = Field(default=False, description="Enable debug mode")
-    log_level: str = Field(default="INFO", description="Logging level")
-    max_retries: int = Field(default=3, description="Maximum retry attempts")
-    retry_delay: float = Field(default=1.0, description="Delay between retries in seconds")
-
-
-class Config(BaseModel):
-    """Main configuration class"""
-    server: ServerConfig = Field(default_factory=ServerConfig)
-    rhino: RhinoConfig = Field(default_factory=RhinoConfig)
-    grasshopper: GrasshopperConfig = Field(default_factory=GrasshopperConfig)
-    
-    @classmethod
-    def from_env(cls) -> "Config":
-        """Create configuration from environment variables"""
-        return cls(
-            server=ServerConfig(
-                name=os.getenv("AI_MCP_SERVER_NAME", "AI MCP Server"),
-                debug=os.getenv("AI_MCP_DEBUG", "false").lower() == "true",
-                log_level=os.getenv("AI_MCP_LOG_LEVEL", "INFO"),
-            ),
-            rhino=RhinoConfig(
-                host=os.getenv("RHINO_HOST", "127.0.0.1"),
-                port=int(os.getenv("RHINO_PORT", "1999")),
-                timeout=float(os.getenv("RHINO_TIMEOUT", "15.0")),
-            ),
-            grasshopper=GrasshopperConfig(
-                host=os.getenv("GRASSHOPPER_HOST", "127.0.0.1"),
-                port=int(os.getenv("GRASSHOPPER_PORT", "8080")),
-                timeout=float(os.getenv("GRASSHOPPER_TIMEOUT", "15.0")),
-            ),
-        )
-    
-    @classmethod
-    def from_file(cls, config_path: Path) -> "Config":
-        """Create configuration from file"""
-        import json
-        
-        if not config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        
-        with open(config_path, 'r') as f:
-            data = json.load(f)
-        
-        return cls(**data)
-    
-    def save_to_file(self, config_path: Path) -> None:
-        """Save configuration to file"""
-        import json
-        
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(self.model_dump(), f, indent=2)
+"""
+Configuration management for AI MCP Server
+"""
+
+import os
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+from pathlib import Path
+
+
+class RhinoConfig(BaseModel):
+    """Rhino connection configuration"""
+    host: str = Field(default="127.0.0.1", description="Rhino host address")
+    port: int = Field(default=1999, description="Rhino port")
+    timeout: float = Field(default=15.0, description="Connection timeout in seconds")
+    auto_reconnect: bool = Field(default=True, description="Auto-reconnect on connection loss")
+    pipelining: bool = Field(default=False, description="Tag commands with request ids and keep several in flight")
+    pipeline_depth: int = Field(default=32, description="Maximum in-flight commands when pipelining")
+    pool_size: int = Field(default=1, description="Maximum concurrent connections to the plugin")
+    pool_idle_timeout: float = Field(default=60.0, description="Seconds before an idle pooled connection is closed")
+    max_frame_size: int = Field(default=1048576, description="Maximum bytes per batch envelope")
+    compression: bool = Field(default=False, description="Negotiate zlib compression for large frames")
+    compression_threshold: int = Field(default=16384, description="Minimum frame size in bytes to compress")
+    binary_frames: bool = Field(default=False, description="Negotiate binary frames for mesh vertex, face and normal buffers")
+    cache_max_bytes: int = Field(default=4194304, description="Byte budget of the response cache (0 disables it)")
+    cache_ttls: Dict[str, float] = Field(default_factory=dict, description="Per-command cache TTL overrides in seconds")
+    deadlines: Dict[str, float] = Field(default_factory=dict, description="Deadline overrides in seconds, by class (quick, standard, long) or command")
+    heartbeat_interval: float = Field(default=10.0, description="Seconds between background pings of idle connections (0 disables them)")
+    mirror: bool = Field(default=True, description="Serve document reads from a local mirror kept current with deltas")
+    mirror_max_age: float = Field(default=1.0, description="Seconds a synced mirror is trusted without asking for changes")
+    mirror_verify_interval: float = Field(default=30.0, description="Seconds between mirror hash checks (0 disables them)")
+
+
+class GrasshopperConfig(BaseModel):
+    """Grasshopper connection configuration"""
+    host: str = Field(default="127.0.0.1", description="Grasshopper host address")
+    port: int = Field(default=8080, description="Grasshopper port")
+    timeout: float = Field(default=15.0, description="Connection timeout in seconds")
+    auto_reconnect: bool = Field(default=True, description="Auto-reconnect on connection loss")
+    pipelining: bool = Field(default=False, description="Tag commands with request ids and keep several in flight")
+    pipeline_depth: int = Field(default=32, description="Maximum in-flight commands when pipelining")
+    pool_size: int = Field(default=1, description="Maximum concurrent connections to the plugin")
+    pool_idle_timeout: float = Field(default=60.0, description="Seconds before an idle pooled connection is closed")
+    max_frame_size: int = Field(default=1048576, description="Maximum bytes per batch envelope")
+    compression: bool = Field(default=False, description="Negotiate zlib compression for large frames")
+    compression_threshold: int = Field(default=16384, description="Minimum frame size in bytes to compress")
+    cache_max_bytes: int = Field(default=4194304, description="Byte budget of the response cache (0 disables it)")
+    cache_ttls: Dict[str, float] = Field(default_factory=dict, description="Per-command cache TTL overrides in seconds")
+    deadlines: Dict[str, float] = Field(default_factory=dict, description="Deadline overrides in seconds, by class (quick, standard, long) or command")
+    heartbeat_interval: float = Field(default=10.0, description="Seconds between background pings of idle connections (0 disables them)")
+    catalog_path: str = Field(default="", description="Component catalog file (default: ~/.ai_mcp_server/grasshopper_catalog.json)")
+    catalog_preload: bool = Field(default=False, description="Sync the component catalog at startup instead of on first use")
+
+
+class ServerConfig(BaseModel):
+    """Main server configuration"""
+    name: str = Field(default="AI MCP Server", description="Server name")
+    version: str = Field(default="1.0.0", description="Server version")
+    debug: bool = Field(default=False, description="Enable debug mode")
+    log_level: str = Field(default="INFO", description="Logging level")
+    max_retries: int = Field(default=3, description="Maximum retry attempts")
+    retry_delay: float = Field(default=1.0, description="Delay between retries in seconds")
+    retry_max_delay: float = Field(default=30.0, description="Upper bound of the exponential retry and reconnect backoff in seconds")
+    circuit_failure_threshold: int = Field(default=3, description="Consecutive transport failures before a bridge fails fast")
+    circuit_reset_timeout: float = Field(default=5.0, description="Seconds a tripped bridge fails fast before probing the platform again")
+    pretty_json: bool = Field(default=False, description="Indent JSON in tool results instead of compact output")
+    sync_state_path: str = Field(default="", description="Sync id mapping file (default: ~/.ai_mcp_server/sync_state.json)")
+    sync_batch_size: int = Field(default=500, description="Items per sync batch")
+    sync_concurrency: int = Field(default=4, description="Sync batches in flight at once")
+    fanout_deadline: float = Field(default=5.0, description="Seconds cross-platform tools wait before returning partial results")
+    warm_up: bool = Field(default=True, description="Connect to both platforms in the background at startup")
+    metrics_port: int = Field(default=0, description="Serve Prometheus metrics over HTTP on this port (0 disables it)")
+    metrics_host: str = Field(default="127.0.0.1", description="Address of the metrics endpoint")
+    metrics_file: str = Field(default="", description="Write Prometheus metrics to this file (empty disables it)")
+    metrics_interval: float = Field(default=15.0, description="Seconds between metrics file writes")
+    trace_sample_rate: float = Field(default=0.0, description="Fraction of tool calls to trace, 0 to 1 (0 disables tracing)")
+    trace_file: str = Field(default="", description="JSONL trace file (default: ~/.ai_mcp_server/traces.jsonl)")
+    trace_otlp_endpoint: str = Field(default="", description="OTLP/HTTP collector URL; traces go there instead of the file")
+    record_file: str = Field(default="", description="Record tool calls and bridge commands to this .jsonl or .jsonl.gz file for replay (empty disables it)")
+    record_layers: str = Field(default="tool,bridge", description="Comma-separated layers to record: tool, bridge")
+
+
+class Config(BaseModel):
+    """Main configuration class"""
+    server: ServerConfig = Field(default_factory=ServerConfig)
+    rhino: RhinoConfig = Field(default_factory=RhinoConfig)
+    grasshopper: GrasshopperConfig = Field(default_factory=GrasshopperConfig)
+    
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Create configuration from environment variables"""
+        return cls(
+            server=ServerConfig(
+                name=os.getenv("AI_MCP_SERVER_NAME", "AI MCP Server"),
+                debug=os.getenv("AI_MCP_DEBUG", "false").lower() == "true",
+                log_level=os.getenv("AI_MCP_LOG_LEVEL", "INFO"),
+                max_retries=int(os.getenv("AI_MCP_MAX_RETRIES", "3")),
+                retry_delay=float(os.getenv("AI_MCP_RETRY_DELAY", "1.0")),
+                retry_max_delay=float(os.getenv("AI_MCP_RETRY_MAX_DELAY", "30.0")),
+                circuit_failure_threshold=int(os.getenv("AI_MCP_CIRCUIT_FAILURE_THRESHOLD", "3")),
+                circuit_reset_timeout=float(os.getenv("AI_MCP_CIRCUIT_RESET_TIMEOUT", "5.0")),
+                pretty_json=os.getenv("AI_MCP_PRETTY_JSON", "false").lower() == "true",
+                sync_state_path=os.getenv("AI_MCP_SYNC_STATE_PATH", ""),
+                sync_batch_size=int(os.getenv("AI_MCP_SYNC_BATCH_SIZE", "500")),
+                sync_concurrency=int(os.getenv("AI_MCP_SYNC_CONCURRENCY", "4")),
+                fanout_deadline=float(os.getenv("AI_MCP_FANOUT_DEADLINE", "5.0")),
+                warm_up=os.getenv("AI_MCP_WARM_UP", "true").lower() == "true",
+                metrics_port=int(os.getenv("AI_MCP_METRICS_PORT", "0")),
+                metrics_host=os.getenv("AI_MCP_METRICS_HOST", "127.0.0.1"),
+                metrics_file=os.getenv("AI_MCP_METRICS_FILE", ""),
+                metrics_interval=float(os.getenv("AI_MCP_METRICS_INTERVAL", "15.0")),
+                trace_sample_rate=float(os.getenv("AI_MCP_TRACE_SAMPLE_RATE", "0.0")),
+                trace_file=os.getenv("AI_MCP_TRACE_FILE", ""),
+                trace_otlp_endpoint=os.getenv("AI_MCP_TRACE_OTLP_ENDPOINT", ""),
+                record_file=os.getenv("AI_MCP_RECORD_FILE", ""),
+                record_layers=os.getenv("AI_MCP_RECORD_LAYERS", "tool,bridge"),
+            ),
+            rhino=RhinoConfig(
+                host=os.getenv("RHINO_HOST", "127.0.0.1"),
+                port=int(os.getenv("RHINO_PORT", "1999")),
+                timeout=float(os.getenv("RHINO_TIMEOUT", "15.0")),
+                pipelining=os.getenv("RHINO_PIPELINING", "false").lower() == "true",
+                pipeline_depth=int(os.getenv("RHINO_PIPELINE_DEPTH", "32")),
+                pool_size=int(os.getenv("RHINO_POOL_SIZE", "1")),
+                pool_idle_timeout=float(os.getenv("RHINO_POOL_IDLE_TIMEOUT", "60.0")),
+                max_frame_size=int(os.getenv("RHINO_MAX_FRAME_SIZE", "1048576")),
+                compression=os.getenv("RHINO_COMPRESSION", "false").lower() == "true",
+                compression_threshold=int(os.getenv("RHINO_COMPRESSION_THRESHOLD", "16384")),
+                binary_frames=os.getenv("RHINO_BINARY_FRAMES", "false").lower() == "true",
+                cache_max_bytes=int(os.getenv("RHINO_CACHE_MAX_BYTES", "4194304")),
+                cache_ttls=_parse_ttls(os.getenv("RHINO_CACHE_TTLS", "")),
+                deadlines=_parse_ttls(os.getenv("RHINO_DEADLINES", "")),
+                heartbeat_interval=float(os.getenv("RHINO_HEARTBEAT_INTERVAL", "10.0")),
+                mirror=os.getenv("RHINO_MIRROR", "true").lower() == "true",
+                mirror_max_age=float(os.getenv("RHINO_MIRROR_MAX_AGE", "1.0")),
+                mirror_verify_interval=float(os.getenv("RHINO_MIRROR_VERIFY_INTERVAL", "30.0")),
+            ),
+            grasshopper=GrasshopperConfig(
+                host=os.getenv("GRASSHOPPER_HOST", "127.0.0.1"),
+                port=int(os.getenv("GRASSHOPPER_PORT", "8080")),
+                timeout=float(os.getenv("GRASSHOPPER_TIMEOUT", "15.0")),
+                pipelining=os.getenv("GRASSHOPPER_PIPELINING", "false").lower() == "true",
+                pipeline_depth=int(os.getenv("GRASSHOPPER_PIPELINE_DEPTH", "32")),
+                pool_size=int(os.getenv("GRASSHOPPER_POOL_SIZE", "1")),
+                pool_idle_timeout=float(os.getenv("GRASSHOPPER_POOL_IDLE_TIMEOUT", "60.0")),
+                max_frame_size=int(os.getenv("GRASSHOPPER_MAX_FRAME_SIZE", "1048576")),
+                compression=os.getenv("GRASSHOPPER_COMPRESSION", "false").lower() == "true",
+                compression_threshold=int(os.getenv("GRASSHOPPER_COMPRESSION_THRESHOLD", "16384")),
+                cache_max_bytes=int(os.getenv("GRASSHOPPER_CACHE_MAX_BYTES", "4194304")),
+                cache_ttls=_parse_ttls(os.getenv("GRASSHOPPER_CACHE_TTLS", "")),
+                deadlines=_parse_ttls(os.getenv("GRASSHOPPER_DEADLINES", "")),
+                heartbeat_interval=float(os.getenv("GRASSHOPPER_HEARTBEAT_INTERVAL", "10.0")),
+                catalog_path=os.getenv("GRASSHOPPER_CATALOG_PATH", ""),
+                catalog_preload=os.getenv("GRASSHOPPER_CATALOG_PRELOAD", "false").lower() == "true",
+            ),
+        )
+    
+    @classmethod
+    def from_file(cls, config_path: Path) -> "Config":
+        """Create configuration from file"""
+        import json
+        
+        if not config_path.exists():
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        
+        with open(config_path, 'r') as f:
+            data = json.load(f)
+        
+        return cls(**data)
+    
+    def save_to_file(self, config_path: Path) -> None:
+        """Save configuration to file"""
+        import json
+        
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(config_path, 'w') as f:
+            json.dump(self.model_dump(), f, indent=2)
+
+
+def _parse_ttls(value: str) -> Dict[str, float]:
+    """Parse ``name=seconds`` pairs separated by commas"""
+    ttls = {}
+    for item in value.split(","):
+        if "=" in item:
+            command_type, ttl = item.split("=", 1)
+            ttls[command_type.strip()] = float(ttl)
+    return ttls
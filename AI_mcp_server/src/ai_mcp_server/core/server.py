@@ -1,134 +1,308 @@
-"""
-Main AI MCP Server implementation
-"""
-
-import asyncio
-import logging
-from typing import Dict, Any, Optional
-from contextlib import asynccontextmanager
-
-from mcp.server.fastmcp import FastMCP, Context
-from .config import Config
-from ..bridges.rhino_bridge import RhinoBridge
-from ..bridges.grasshopper_bridge import GrasshopperBridge
-from ..tools.unified_tools import register_unified_tools
-from ..tools.rhino_tools import register_rhino_tools
-from ..tools.grasshopper_tools import register_grasshopper_tools
-
-
-class AIServer:
-    """Main AI MCP Server class"""
-    
-    def __init__(self, config: Optional[Config] = None):
-        self.config = config or Config.from_env()
-        self.logger = self._setup_logging()
-        
-        # Initialize bridges
-        self.rhino_bridge = RhinoBridge(self.config.rhino, self.logger)
-        self.grasshopper_bridge = GrasshopperBridge(self.config.grasshopper, self.logger)
-        
-        # Initialize MCP server
-        self.mcp_server = FastMCP(
-            self.config.server.name,
-            lifespan=self._server_lifespan
-        )
-        
-        # Register tools
-        self._register_tools()
-        
-        self.logger.info(f"AI MCP Server initialized: {self.config.server.name} v{self.config.server.version}")
-    
-    def _setup_logging(self) -> logging.Logger:
-        """Setup logging configuration"""
-        logging.basicConfig(
-            level=getattr(logging, self.config.server.log_level),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        return logging.getLogger("AIServer")
-    
-    def _register_tools(self) -> None:
-        """Register all MCP tools"""
-        # Register unified tools (smart routing)
-        register_unified_tools(self.mcp_server, self.rhino_bridge, self.grasshopper_bridge)
-        
-        # Register platform-specific tools
-        register_rhino_tools(self.mcp_server, self.rhino_bridge)
-        register_grasshopper_tools(self.mcp_server, self.grasshopper_bridge)
-        
-        self.logger.info("All MCP tools registered")
-    
-    @asynccontextmanager
-    async def _server_lifespan(self, server: FastMCP) -> Dict[str, Any]:
-        """Manage server startup and shutdown lifecycle"""
-        try:
-            self.logger.info("Starting AI MCP Server...")
-            
-            # Initialize bridges
-            await self.rhino_bridge.initialize()
-            await self.grasshopper_bridge.initialize()
-            
-            # Check connections
-            rhino_status = await self.rhino_bridge.check_connection()
-            grasshopper_status = await self.grasshopper_bridge.check_connection()
-            
-            self.logger.info(f"Rhino connection: {'Connected' if rhino_status else 'Disconnected'}")
-            self.logger.info(f"Grasshopper connection: {'Connected' if grasshopper_status else 'Disconnected'}")
-            
-            if not rhino_status and not grasshopper_status:
-                self.logger.warning("Neither Rhino nor Grasshopper is connected. Some tools may not work.")
-            
-            yield {}
-            
-        except Exception as e:
-            self.logger.error(f"Error during server startup: {e}")
-            raise
-        finally:
-            self.logger.info("Shutting down AI MCP Server...")
-            await self.rhino_bridge.cleanup()
-            await self.grasshopper_bridge.cleanup()
-            self.logger.info("AI MCP Server shutdown complete")
-    
-    def start(self) -> None:
-        """Start the MCP server"""
-        try:
-            self.logger.info("Starting MCP server...")
-            # Use stdio transport for MCP
-            self.mcp_server.run(transport="stdio")
-        except Exception as e:
-            self.logger.error(f"Error starting MCP server: {e}")
-            raise
-    
-    def run(self) -> None:
-        """Run the server (blocking)"""
-        try:
-            self.start()
-        except KeyboardInterrupt:
-            self.logger.info("Server stopped by user")
-        except Exception as e:
-            self.logger.error(f"Server error: {e}")
-            raise
-    
-    async def get_status(self) -> Dict[str, Any]:
-        """Get server status"""
-        rhino_status = await self.rhino_bridge.check_connection()
-        grasshopper_status = await self.grasshopper_bridge.check_connection()
-        
-        return {
-            "server": {
-                "name": self.config.server.name,
-                "version": self.config.server.version,
-                "status": "running"
-            },
-            "connections": {
-                "rhino": {
-                    "connected": rhino_status,
-                    "host": self.config.rhino.host,
-                    "port": self.config.rhino.port
-                },
-                "grasshopper": {
-                    "connected": grasshopper_status,
-                    "host": self.config.grasshopper.host,
-                    "port": self.config.grasshopper.port
-                }
-            }
-        }
+"""
+Main AI MCP Server implementation
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager, suppress
+
+from mcp.server.fastmcp import FastMCP, Context
+from .config import Config
+from .startup import StartupReport
+from ..bridges.rhino_bridge import RhinoBridge
+from ..bridges.grasshopper_bridge import GrasshopperBridge
+from ..bridges.resilience import RetryPolicy
+from ..local.sync import SyncEngine
+from ..utils import codec
+from ..utils.fanout import FanOut
+from ..utils.metrics import export_loop, serve_prometheus, write_prometheus
+from ..utils.recording import recorder
+from ..utils.tracing import JsonlExporter, OtlpExporter, tracer
+
+
+class AIServer:
+    """Main AI MCP Server class"""
+    
+    def __init__(self, config: Optional[Config] = None, startup: Optional[StartupReport] = None):
+        self.config = config or Config.from_env()
+        self.logger = self._setup_logging()
+        self.startup = startup or StartupReport()
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self._metrics_server: Optional[asyncio.AbstractServer] = None
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._trace_task: Optional[asyncio.Task] = None
+        self._record_task: Optional[asyncio.Task] = None
+        codec.set_pretty(self.config.server.pretty_json)
+        self.logger.debug(f"JSON codec: {codec.BACKEND}")
+        
+        # Initialize bridges; connections are opened later, in the background
+        # or on first use
+        bridges_started = time.perf_counter()
+        retry = RetryPolicy(
+            max_retries=self.config.server.max_retries,
+            retry_delay=self.config.server.retry_delay,
+            max_delay=self.config.server.retry_max_delay,
+            failure_threshold=self.config.server.circuit_failure_threshold,
+            reset_timeout=self.config.server.circuit_reset_timeout
+        )
+        self.rhino_bridge = RhinoBridge(self.config.rhino, self.logger, retry)
+        self.grasshopper_bridge = GrasshopperBridge(self.config.grasshopper, self.logger, retry)
+        self.sync_engine = SyncEngine(
+            self.rhino_bridge, self.grasshopper_bridge, self.logger,
+            state_path=self.config.server.sync_state_path or None,
+            batch_size=self.config.server.sync_batch_size,
+            concurrency=self.config.server.sync_concurrency
+        )
+        self.fan_out = FanOut(self.config.server.fanout_deadline, self.logger)
+        self.startup.record("bridges", time.perf_counter() - bridges_started)
+        
+        # Initialize MCP server
+        self.mcp_server = FastMCP(
+            self.config.server.name,
+            lifespan=self._server_lifespan
+        )
+        
+        # Register tools
+        with self.startup.phase("registration"):
+            self._register_tools()
+        
+        self.logger.info(f"AI MCP Server initialized: {self.config.server.name} v{self.config.server.version}")
+    
+    def _setup_logging(self) -> logging.Logger:
+        """Setup logging configuration"""
+        logging.basicConfig(
+            level=getattr(logging, self.config.server.log_level),
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        return logging.getLogger("AIServer")
+    
+    def _register_tools(self) -> None:
+        """Register all MCP tools"""
+        # Tool modules are imported here rather than with the server module,
+        # so that importing core.server alone does not load them. They are
+        # still imported before the server answers: the "registration" phase
+        # covers these imports and the schema FastMCP builds for each tool.
+        from ..tools.unified_tools import register_unified_tools
+        from ..tools.rhino_tools import register_rhino_tools
+        from ..tools.grasshopper_tools import register_grasshopper_tools
+        
+        # Register unified tools (smart routing)
+        register_unified_tools(self.mcp_server, self.rhino_bridge, self.grasshopper_bridge,
+                               self.sync_engine, self.fan_out)
+        
+        # Register platform-specific tools
+        register_rhino_tools(self.mcp_server, self.rhino_bridge)
+        register_grasshopper_tools(self.mcp_server, self.grasshopper_bridge)
+        
+        self.logger.info("All MCP tools registered")
+    
+    @asynccontextmanager
+    async def _server_lifespan(self, server: FastMCP) -> Dict[str, Any]:
+        """Manage server startup and shutdown lifecycle"""
+        try:
+            self.logger.info("Starting AI MCP Server...")
+            
+            # Connect in the background so clients get an answer right away;
+            # tools used before then connect on demand
+            if self.config.server.warm_up:
+                self._warm_up_task = asyncio.create_task(self._warm_up())
+            else:
+                self.logger.info(f"Startup: {self.startup.summary()}; bridges connect on first use")
+            
+            await self._start_metrics_export()
+            self._start_tracing()
+            self._start_recording()
+            
+            yield {}
+            
+        except Exception as e:
+            self.logger.error(f"Error during server startup: {e}")
+            raise
+        finally:
+            self.logger.info("Shutting down AI MCP Server...")
+            if self._warm_up_task and not self._warm_up_task.done():
+                self._warm_up_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self._warm_up_task
+            await self._stop_metrics_export()
+            await self._stop_tracing()
+            await self._stop_recording()
+            await self.rhino_bridge.cleanup()
+            await self.grasshopper_bridge.cleanup()
+            self.logger.info("AI MCP Server shutdown complete")
+    
+    async def _start_metrics_export(self) -> None:
+        """Start the optional Prometheus endpoint and file writer"""
+        server_config = self.config.server
+        if server_config.metrics_port:
+            try:
+                self._metrics_server = await serve_prometheus(
+                    server_config.metrics_host, server_config.metrics_port, logger=self.logger
+                )
+            except OSError as e:
+                self.logger.warning(f"Could not serve metrics on port {server_config.metrics_port}: {e}")
+        if server_config.metrics_file:
+            self._metrics_task = asyncio.create_task(
+                export_loop(Path(server_config.metrics_file), server_config.metrics_interval, logger=self.logger)
+            )
+    
+    async def _stop_metrics_export(self) -> None:
+        """Stop metrics export, writing the file one last time"""
+        if self._metrics_server:
+            self._metrics_server.close()
+            await self._metrics_server.wait_closed()
+            self._metrics_server = None
+        if self._metrics_task:
+            self._metrics_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._metrics_task
+            self._metrics_task = None
+            with suppress(OSError):
+                write_prometheus(Path(self.config.server.metrics_file))
+    
+    def _start_tracing(self) -> None:
+        """Configure the tracer and start exporting spans, if sampling is on"""
+        server_config = self.config.server
+        if server_config.trace_sample_rate <= 0:
+            return
+        if server_config.trace_otlp_endpoint:
+            exporter = OtlpExporter(server_config.trace_otlp_endpoint, service_name=server_config.name)
+            destination = exporter.endpoint
+        else:
+            exporter = JsonlExporter(Path(server_config.trace_file or "~/.ai_mcp_server/traces.jsonl"))
+            destination = str(exporter.path)
+        tracer.configure(min(1.0, server_config.trace_sample_rate), exporter)
+        self._trace_task = asyncio.create_task(tracer.flush_loop(1.0, self.logger))
+        self.logger.info(f"Tracing {server_config.trace_sample_rate:.0%} of tool calls to {destination}")
+    
+    async def _stop_tracing(self) -> None:
+        """Export the remaining spans and turn tracing off"""
+        if self._trace_task is None:
+            return
+        self._trace_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._trace_task
+        self._trace_task = None
+        try:
+            await tracer.flush()
+        except Exception as e:
+            self.logger.warning(f"Could not export traces: {e}")
+        tracer.configure(0.0, None)
+    
+    def _start_recording(self) -> None:
+        """Start recording tool calls and bridge commands, if a file is set"""
+        server_config = self.config.server
+        if not server_config.record_file:
+            return
+        layers = [layer.strip() for layer in server_config.record_layers.split(",") if layer.strip()]
+        try:
+            recorder.configure(Path(server_config.record_file), layers)
+        except ValueError as e:
+            self.logger.warning(f"Session recording disabled: {e}")
+            return
+        self._record_task = asyncio.create_task(recorder.flush_loop(1.0, self.logger))
+        self.logger.info(f"Recording {', '.join(sorted(recorder.layers))} calls to {recorder.path}")
+    
+    async def _stop_recording(self) -> None:
+        """Write the remaining records and stop recording"""
+        if self._record_task is None:
+            return
+        self._record_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._record_task
+        self._record_task = None
+        try:
+            await recorder.flush()
+        except Exception as e:
+            self.logger.warning(f"Could not write the session recording: {e}")
+        recorder.configure(None)
+    
+    async def _warm_up(self) -> None:
+        """Connect both bridges concurrently and report the startup phases"""
+        async def connect(name: str, bridge: Any) -> bool:
+            with self.startup.phase(f"connect.{name}"):
+                await bridge.initialize()
+            return bridge.connected
+        
+        with self.startup.phase("connect"):
+            rhino_status, grasshopper_status = await asyncio.gather(
+                connect("rhino", self.rhino_bridge),
+                connect("grasshopper", self.grasshopper_bridge)
+            )
+        
+        self.logger.info(f"Rhino connection: {'Connected' if rhino_status else 'Disconnected'}")
+        self.logger.info(f"Grasshopper connection: {'Connected' if grasshopper_status else 'Disconnected'}")
+        
+        if not rhino_status and not grasshopper_status:
+            self.logger.warning("Neither Rhino nor Grasshopper is connected. Some tools may not work.")
+        
+        if grasshopper_status and self.config.grasshopper.catalog_preload:
+            try:
+                catalog = await self.grasshopper_bridge.get_catalog()
+                self.logger.info(f"Component catalog ready: {len(catalog.components)} components")
+            except Exception as e:
+                self.logger.warning(f"Could not load component catalog: {e}")
+        
+        self.logger.info(f"Startup: {self.startup.summary()}")
+    
+    def start(self) -> None:
+        """Start the MCP server"""
+        try:
+            self.logger.info("Starting MCP server...")
+            # Use stdio transport for MCP
+            self.mcp_server.run(transport="stdio")
+        except Exception as e:
+            self.logger.error(f"Error starting MCP server: {e}")
+            raise
+    
+    def run(self) -> None:
+        """Run the server (blocking)"""
+        try:
+            self.start()
+        except KeyboardInterrupt:
+            self.logger.info("Server stopped by user")
+        except Exception as e:
+            self.logger.error(f"Server error: {e}")
+            raise
+    
+    async def get_status(self) -> Dict[str, Any]:
+        """Get server status"""
+        checks = await self.fan_out.run({
+            "rhino": self.rhino_bridge.check_connection,
+            "grasshopper": self.grasshopper_bridge.check_connection
+        })
+        
+        return {
+            "server": {
+                "name": self.config.server.name,
+                "version": self.config.server.version,
+                "status": "running"
+            },
+            "connections": {
+                "rhino": {
+                    "connected": checks.sections["rhino"].value,
+                    "host": self.config.rhino.host,
+                    "port": self.config.rhino.port,
+                    "health": self.rhino_bridge.health.to_dict(),
+                    "circuit": self.rhino_bridge.breaker.to_dict(),
+                    "transfer": self.rhino_bridge.transfer_stats.to_dict(),
+                    "cache": self.rhino_bridge.cache_stats.to_dict() if self.rhino_bridge.cache_stats else None,
+                    "mirror": self.rhino_bridge.mirror.stats() if self.rhino_bridge.mirror else None
+                },
+                "grasshopper": {
+                    "connected": checks.sections["grasshopper"].value,
+                    "host": self.config.grasshopper.host,
+                    "port": self.config.grasshopper.port,
+                    "health": self.grasshopper_bridge.health.to_dict(),
+                    "circuit": self.grasshopper_bridge.breaker.to_dict(),
+                    "transfer": self.grasshopper_bridge.transfer_stats.to_dict(),
+                    "cache": self.grasshopper_bridge.cache_stats.to_dict() if self.grasshopper_bridge.cache_stats else None
+                }
+            },
+            "timing": {name: section.timing() for name, section in checks.sections.items()},
+            "partial": checks.partial,
+            "startup": self.startup.to_dict()
+        }
@@ -0,0 +1,41 @@
+"""
+Startup phase timing
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StartupReport:
+    """Durations of the server startup phases
+
+    Phases are recorded in the order they finish. Import, config, bridges
+    and registration all run before the server answers its first request.
+    Connect phases run in the background and are added when the bridges
+    have been warmed up.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record the duration of a phase"""
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Phase durations in milliseconds"""
+        return {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+
+    def summary(self) -> str:
+        """One-line description of the phases"""
+        return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
@@ -0,0 +1,10 @@
+"""
+Local indexes of platform data
+"""
+
+from .catalog import ComponentCatalog
+from .mirror import DocumentMirror
+from .spatial import SpatialIndex
+from .sync import SyncEngine, SyncReport
+
+__all__ = ["ComponentCatalog", "DocumentMirror", "SpatialIndex", "SyncEngine", "SyncReport"]
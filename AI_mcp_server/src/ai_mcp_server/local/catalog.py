@@ -0,0 +1,246 @@
+"""
+Local Grasshopper component catalog with fuzzy search
+"""
+
+import hashlib
+import heapq
+import logging
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..utils import codec
+
+
+# Bumped when the on-disk layout changes
+CATALOG_FORMAT = 1
+
+DEFAULT_CATALOG_PATH = Path.home() / ".ai_mcp_server" / "grasshopper_catalog.json"
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text with punctuation collapsed to single spaces"""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigrams of normalized text, padded so word starts weigh more"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _field(data: Dict[str, Any], *names: str) -> Any:
+    """First present value among alternative key spellings"""
+    for name in names:
+        for key in (name, name[:1].upper() + name[1:]):
+            if data.get(key) is not None:
+                return data[key]
+    return None
+
+
+def normalize_component(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a plugin component description onto the catalog layout"""
+    component = {
+        "name": str(_field(data, "name", "fullName", "type") or ""),
+        "nickname": str(_field(data, "nickname", "nickName") or ""),
+        "category": str(_field(data, "category") or ""),
+        "subcategory": str(_field(data, "subcategory", "subCategory") or ""),
+        "description": str(_field(data, "description") or ""),
+        "guid": str(_field(data, "guid", "id", "componentGuid") or ""),
+    }
+    inputs = _field(data, "inputs")
+    outputs = _field(data, "outputs")
+    if inputs is not None or outputs is not None:
+        component["signature"] = {"inputs": inputs or [], "outputs": outputs or []}
+    return component
+
+
+class TrigramIndex:
+    """Inverted trigram index over component names
+
+    Names and nicknames are split into padded trigrams, each mapped to the
+    components containing it. A query is scored against every component
+    sharing at least one trigram with the Dice coefficient of the two
+    trigram sets, then boosted for exact, prefix and category/description
+    word matches.
+    """
+
+    # Minimum Dice similarity for a trigram-only match
+    MIN_SIMILARITY = 0.25
+
+    def __init__(self, components: List[Dict[str, Any]]):
+        self._components: List[Dict[str, Any]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._words: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts: List[int] = []
+        self._names: List[Set[str]] = []
+
+        for component in components:
+            self.add(component)
+
+    def add(self, component: Dict[str, Any]) -> None:
+        """Index one more component"""
+        index = len(self._components)
+        self._components.append(component)
+        names = {_normalize(component["name"]), _normalize(component["nickname"])} - {""}
+        grams: Set[str] = set()
+        for name in names:
+            grams |= _trigrams(name)
+        for gram in grams:
+            self._postings[gram].append(index)
+        self._gram_counts.append(len(grams))
+        self._names.append(names)
+
+        text = " ".join((component["category"], component["subcategory"], component["description"]))
+        for word in set(_normalize(text).split()):
+            self._words[word].append(index)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` components ranked by similarity to ``query``"""
+        query = _normalize(query)
+        if not query:
+            return []
+
+        query_grams = _trigrams(query)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for index in self._postings.get(gram, ()):
+                shared[index] += 1
+
+        word_hits: Dict[int, int] = defaultdict(int)
+        for word in query.split():
+            for index in self._words.get(word, ()):
+                word_hits[index] += 1
+
+        scores: Dict[int, float] = {}
+        for index, count in shared.items():
+            similarity = 2.0 * count / (len(query_grams) + self._gram_counts[index])
+            names = self._names[index]
+            if query in names:
+                similarity += 1.0
+            elif any(name.startswith(query) for name in names):
+                similarity += 0.5
+            if similarity >= self.MIN_SIMILARITY:
+                scores[index] = similarity
+        for index, hits in word_hits.items():
+            scores[index] = scores.get(index, 0.0) + 0.1 * hits
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            dict(_summary(self._components[index]), score=round(score, 3))
+            for index, score in best
+        ]
+
+
+def _summary(component: Dict[str, Any]) -> Dict[str, Any]:
+    """Component fields returned by searches"""
+    return {key: value for key, value in component.items() if key != "signature"}
+
+
+class ComponentCatalog:
+    """Component catalog held in memory and persisted to disk
+
+    The catalog is tagged with a version key reported by the plugin (or
+    derived from the component list), so a copy loaded from disk can be
+    validated with one round-trip and reused across sessions. Parameter
+    signatures fetched individually are added to the catalog as they are
+    seen.
+    """
+
+    def __init__(self, path: Optional[Path] = None, logger: Optional[logging.Logger] = None):
+        self.path = Path(path) if path else DEFAULT_CATALOG_PATH
+        self.logger = logger or logging.getLogger(__name__)
+        self.version: Optional[str] = None
+        self.components: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._index = TrigramIndex([])
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the catalog holds any components"""
+        return bool(self.components)
+
+    @staticmethod
+    def version_of(components: Iterable[Dict[str, Any]]) -> str:
+        """Version key derived from the component list itself"""
+        digest = hashlib.sha1()
+        for name in sorted(f"{c['guid']}:{c['name']}" for c in components):
+            digest.update(name.encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def replace(self, components: List[Dict[str, Any]], version: Optional[str] = None) -> None:
+        """Replace the catalog contents and rebuild the indexes"""
+        self.components = [normalize_component(c) for c in components]
+        self.version = version or self.version_of(self.components)
+        self._reindex()
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Ranked fuzzy search over component names, categories and descriptions"""
+        return self._index.search(query, limit)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a component by name, nickname or guid"""
+        return self._by_name.get(name.lower()) or self._by_name.get(_normalize(name))
+
+    def signature(self, name: str) -> Optional[Dict[str, Any]]:
+        """Input and output parameters of a component type, if known"""
+        component = self.get(name)
+        return component.get("signature") if component else None
+
+    def set_signature(self, name: str, signature: Dict[str, Any]) -> None:
+        """Record the parameters of a component type"""
+        component = self.get(name)
+        if component is None:
+            component = normalize_component({"name": name})
+            self.components.append(component)
+            self._add_names(component)
+            self._index.add(component)
+        component["signature"] = signature
+
+    def load(self) -> bool:
+        """Load the catalog persisted on disk, if any"""
+        try:
+            data = codec.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable component catalog {self.path}: {e}")
+            return False
+
+        if data.get("format") != CATALOG_FORMAT:
+            self.logger.info("Ignoring component catalog in an older format")
+            return False
+        self.components = data.get("components", [])
+        self.version = data.get("version")
+        self._reindex()
+        self.logger.info(f"Loaded {len(self.components)} components from {self.path}")
+        return True
+
+    def save(self) -> None:
+        """Persist the catalog to disk"""
+        data = {"format": CATALOG_FORMAT, "version": self.version, "components": self.components}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_bytes(codec.dumps(data))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save component catalog to {self.path}: {e}")
+
+    def _reindex(self) -> None:
+        """Rebuild the lookup tables and the search index"""
+        self._by_name = {}
+        for component in self.components:
+            self._add_names(component)
+        self._index = TrigramIndex(self.components)
+
+    def _add_names(self, component: Dict[str, Any]) -> None:
+        """Make a component findable by its guid, nickname and name"""
+        for key in (component["guid"], component["nickname"], component["name"]):
+            if key:
+                self._by_name[key.lower()] = component
+                self._by_name.setdefault(_normalize(key), component)
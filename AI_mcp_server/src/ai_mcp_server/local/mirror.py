@@ -0,0 +1,205 @@
+"""
+Incremental local mirror of the Rhino document
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+
+def document_hash(objects: Iterable[Dict[str, Any]]) -> str:
+    """Digest the plugin computes over the same document
+
+    SHA-256 over the sorted object ids, one per line, each followed by
+    ``:<version>`` when the object reports a ``version``.
+    """
+    lines = sorted(
+        f"{obj['id']}:{obj['version']}" if obj.get("version") is not None else str(obj["id"])
+        for obj in objects
+    )
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+class DocumentMirror:
+    """Shadow copy of the Rhino document kept current with deltas
+
+    The mirror is loaded once from a full ``get_document_info`` snapshot.
+    After that, ``get_document_changes`` is asked for what changed since
+    the document version the mirror holds:
+
+        {"version": ..., "added": [...], "modified": [...], "deleted": [ids]}
+
+    A reply with ``"resync": true`` (history no longer available) or a
+    plugin without the command triggers a new snapshot. Reads within
+    ``max_age`` seconds of the last sync are answered from memory unless a
+    command sent through the bridge may have changed the document.
+
+    Every ``verify_interval`` seconds the mirror's ``document_hash`` is
+    compared with the plugin's ``get_document_hash``; on a mismatch the
+    mirror is rebuilt from a snapshot.
+    """
+
+    def __init__(self, bridge: Any, logger: logging.Logger,
+                 max_age: float = 1.0, verify_interval: float = 30.0):
+        self.bridge = bridge
+        self.logger = logger
+        self.max_age = max_age
+        self.verify_interval = verify_interval
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.info: Dict[str, Any] = {}
+        self.version: Any = None
+        self.loaded = False
+        # Bumped whenever the mirrored objects change
+        self.revision = 0
+        self.snapshots = 0
+        self.deltas = 0
+        self.resyncs = 0
+        # None until the plugin shows whether it supports the command
+        self.deltas_supported: Optional[bool] = None
+        self.hash_supported: Optional[bool] = None
+        self._stale = True
+        self._synced_at = 0.0
+        self._verified_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def mark_stale(self) -> None:
+        """Note that the document may have changed"""
+        self._stale = True
+
+    def clear(self) -> None:
+        """Forget the mirrored document"""
+        self.objects.clear()
+        self.info = {}
+        self.version = None
+        self.loaded = False
+        self._stale = True
+
+    async def document_info(self) -> Dict[str, Any]:
+        """Document information in the shape ``get_document_info`` returns"""
+        await self.refresh()
+        info = dict(self.info)
+        info["objects"] = [dict(obj) for obj in self.objects.values()]
+        return info
+
+    async def get_object(self, object_id: str) -> Optional[Dict[str, Any]]:
+        """One mirrored object, or None if the document has no such object"""
+        await self.refresh()
+        obj = self.objects.get(object_id)
+        return dict(obj) if obj is not None else None
+
+    async def refresh(self, force: bool = False) -> None:
+        """Bring the mirror up to date with the plugin"""
+        async with self._lock:
+            now = time.monotonic()
+            if not force and self.loaded and not self._stale and now - self._synced_at < self.max_age:
+                return
+
+            # Cleared first so changes made while syncing mark the mirror stale again
+            self._stale = False
+            try:
+                if not self.loaded or self.deltas_supported is False or not await self._apply_changes():
+                    await self._snapshot()
+                if self.verify_interval and now - self._verified_at >= self.verify_interval:
+                    await self._verify()
+            except Exception:
+                self._stale = True
+                raise
+            self._synced_at = time.monotonic()
+
+    async def verify(self) -> bool:
+        """Compare the mirror with the plugin's document hash, resyncing on a mismatch"""
+        async with self._lock:
+            if not self.loaded:
+                await self._snapshot()
+            return await self._verify()
+
+    async def _snapshot(self) -> None:
+        """Replace the mirror with a full copy of the document"""
+        result = await self.bridge.send_command("get_document_info", {})
+        objects = result.get("objects", []) if isinstance(result, dict) else []
+        self.info = {k: v for k, v in result.items() if k != "objects"} if isinstance(result, dict) else {}
+        self.objects = {str(obj["id"]): obj for obj in objects if isinstance(obj, dict) and "id" in obj}
+        self.version = self.info.get("version")
+        self.loaded = True
+        self.revision += 1
+        self.snapshots += 1
+        self._verified_at = time.monotonic()
+        self.logger.debug(f"Mirrored Rhino document: {len(self.objects)} objects")
+
+    async def _apply_changes(self) -> bool:
+        """Apply the changes since the mirrored version; False if a snapshot is needed"""
+        if self.version is None:
+            # The snapshot carried no version to ask for changes since
+            self.deltas_supported = False
+            return False
+        try:
+            delta = await self.bridge.send_command("get_document_changes", {"since": self.version})
+        except (ConnectionError, asyncio.TimeoutError):
+            # Says nothing about the command; the sync fails and is retried
+            raise
+        except Exception as e:
+            # An error reply: the plugin does not have the command
+            if self.deltas_supported is None:
+                self.logger.info(f"Document deltas unavailable ({e}); mirroring with snapshots")
+                self.deltas_supported = False
+            return False
+
+        self.deltas_supported = True
+        if not isinstance(delta, dict) or delta.get("resync"):
+            self.resyncs += 1
+            return False
+
+        changed = (*delta.get("added", []), *delta.get("modified", []))
+        for obj in changed:
+            if isinstance(obj, dict) and "id" in obj:
+                self.objects[str(obj["id"])] = obj
+        for object_id in delta.get("deleted", []):
+            self.objects.pop(str(object_id), None)
+        if changed or delta.get("deleted"):
+            self.revision += 1
+        if "info" in delta and isinstance(delta["info"], dict):
+            self.info.update(delta["info"])
+        self.version = delta.get("version", self.version)
+        self.info["version"] = self.version
+        self.deltas += 1
+        return True
+
+    async def _verify(self) -> bool:
+        """Run the hash consistency check"""
+        self._verified_at = time.monotonic()
+        if self.hash_supported is False:
+            return True
+        try:
+            result = await self.bridge.send_command("get_document_hash", {})
+        except (ConnectionError, asyncio.TimeoutError):
+            raise
+        except Exception as e:
+            if self.hash_supported is None:
+                self.logger.info(f"Document hash unavailable ({e}); skipping consistency checks")
+                self.hash_supported = False
+            return True
+
+        self.hash_supported = True
+        if result.get("version") is not None and result["version"] != self.version:
+            # The document moved on since the last sync; compare next time
+            self._stale = True
+            return True
+        if result.get("hash") == document_hash(self.objects.values()):
+            return True
+        self.logger.warning("Rhino document mirror diverged; resyncing")
+        self.resyncs += 1
+        await self._snapshot()
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Mirror counters"""
+        return {
+            "objects": len(self.objects),
+            "version": self.version,
+            "snapshots": self.snapshots,
+            "deltas": self.deltas,
+            "resyncs": self.resyncs,
+            "deltas_supported": self.deltas_supported,
+        }
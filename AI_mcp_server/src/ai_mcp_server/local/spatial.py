@@ -0,0 +1,218 @@
+"""
+R-tree over Rhino object bounding boxes
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# (min_x, min_y, min_z, max_x, max_y, max_z)
+Bounds = Tuple[float, float, float, float, float, float]
+
+
+def object_bounds(obj: Dict[str, Any]) -> Optional[Bounds]:
+    """Bounding box of a document object, if it reports one
+
+    Accepts ``bounding_box`` (or ``bbox``) given as ``[min, max]``, as
+    ``{"min": ..., "max": ...}``, as the eight corner points, or as six
+    numbers.
+    """
+    box = obj.get("bounding_box", obj.get("bbox", obj.get("BoundingBox")))
+    if box is None:
+        return None
+    try:
+        if isinstance(box, dict):
+            box = [box["min"], box["max"]]
+        if len(box) == 6 and not isinstance(box[0], (list, tuple)):
+            return tuple(float(v) for v in box)  # type: ignore[return-value]
+        xs, ys, zs = zip(*((float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else 0.0) for p in box))
+        return (min(xs), min(ys), min(zs), max(xs), max(ys), max(zs))
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def _union(bounds: Iterable[Bounds]) -> Bounds:
+    mins_x, mins_y, mins_z, maxs_x, maxs_y, maxs_z = zip(*bounds)
+    return (min(mins_x), min(mins_y), min(mins_z), max(maxs_x), max(maxs_y), max(maxs_z))
+
+
+def _intersects(a: Bounds, b: Bounds) -> bool:
+    return (a[0] <= b[3] and b[0] <= a[3] and a[1] <= b[4] and b[1] <= a[4]
+            and a[2] <= b[5] and b[2] <= a[5])
+
+
+def _contains(outer: Bounds, inner: Bounds) -> bool:
+    return (outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] <= inner[2]
+            and inner[3] <= outer[3] and inner[4] <= outer[4] and inner[5] <= outer[5])
+
+
+def _distance_sq(bounds: Bounds, point: Sequence[float]) -> float:
+    """Squared distance from a point to a box (zero inside it)"""
+    total = 0.0
+    for axis in range(3):
+        low, high, value = bounds[axis], bounds[axis + 3], point[axis]
+        if value < low:
+            total += (low - value) ** 2
+        elif value > high:
+            total += (value - high) ** 2
+    return total
+
+
+class _Node:
+    __slots__ = ("bounds", "children", "leaf")
+
+    def __init__(self, bounds: Bounds, children: List[Any], leaf: bool):
+        self.bounds = bounds
+        self.children = children
+        self.leaf = leaf
+
+
+class SpatialIndex:
+    """Static R-tree bulk-loaded with Sort-Tile-Recursive packing
+
+    Leaves hold ``(bounds, object_id)`` entries. Box queries descend only
+    into nodes whose bounds intersect the query; nearest-neighbour queries
+    expand nodes best-first by box distance. Layer and type filters use
+    hash indexes, so a query touches O(log n + k) nodes for k results.
+    """
+
+    NODE_CAPACITY = 16
+
+    def __init__(self, objects: Iterable[Dict[str, Any]] = ()):
+        self._root: Optional[_Node] = None
+        self._bounds: Dict[str, Bounds] = {}
+        self._by_layer: Dict[str, Set[str]] = defaultdict(set)
+        self._by_type: Dict[str, Set[str]] = defaultdict(set)
+        self._ids: Set[str] = set()
+        self.build(objects)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def build(self, objects: Iterable[Dict[str, Any]]) -> None:
+        """Index a set of document objects, replacing the current contents"""
+        self._bounds.clear()
+        self._by_layer.clear()
+        self._by_type.clear()
+        self._ids.clear()
+        for obj in objects:
+            if "id" not in obj:
+                continue
+            object_id = str(obj["id"])
+            self._ids.add(object_id)
+            if obj.get("layer") is not None:
+                self._by_layer[str(obj["layer"]).lower()].add(object_id)
+            if obj.get("type") is not None:
+                self._by_type[str(obj["type"]).lower()].add(object_id)
+            bounds = object_bounds(obj)
+            if bounds is not None:
+                self._bounds[object_id] = bounds
+
+        level: List[Any] = [(bounds, object_id) for object_id, bounds in self._bounds.items()]
+        if not level:
+            self._root = None
+            return
+        leaf = True
+        while True:
+            nodes = [
+                _Node(_union(child[0] if leaf else child.bounds for child in group), group, leaf)
+                for group in self._pack(level, leaf)
+            ]
+            if len(nodes) == 1:
+                self._root = nodes[0]
+                return
+            level, leaf = nodes, False
+
+    def window(self, bounds: Bounds, layer: Optional[str] = None,
+               object_type: Optional[str] = None) -> List[str]:
+        """Objects entirely inside ``bounds``"""
+        return self._filter(self._search(bounds, inside=True), layer, object_type)
+
+    def crossing(self, bounds: Bounds, layer: Optional[str] = None,
+                 object_type: Optional[str] = None) -> List[str]:
+        """Objects inside or touching ``bounds``"""
+        return self._filter(self._search(bounds, inside=False), layer, object_type)
+
+    def nearest(self, point: Sequence[float], count: int = 1, layer: Optional[str] = None,
+                object_type: Optional[str] = None) -> List[str]:
+        """The ``count`` objects whose boxes are closest to ``point``"""
+        if self._root is None or count <= 0:
+            return []
+        point = (*point, 0.0, 0.0)[:3]
+        allowed = self._allowed(layer, object_type)
+        results: List[str] = []
+        heap: List[Tuple[float, int, Any]] = [(0.0, 0, self._root)]
+        tiebreak = 1
+        while heap and len(results) < count:
+            _, _, item = heapq.heappop(heap)
+            if isinstance(item, str):
+                results.append(item)
+                continue
+            for child in item.children:
+                if item.leaf:
+                    bounds, object_id = child
+                    if allowed is not None and object_id not in allowed:
+                        continue
+                    entry: Any = object_id
+                else:
+                    bounds, entry = child.bounds, child
+                heapq.heappush(heap, (_distance_sq(bounds, point), tiebreak, entry))
+                tiebreak += 1
+        return results
+
+    def select(self, layer: Optional[str] = None, object_type: Optional[str] = None) -> List[str]:
+        """Objects on a layer and/or of a type, with or without a bounding box"""
+        allowed = self._allowed(layer, object_type)
+        return sorted(self._ids if allowed is None else allowed)
+
+    def _search(self, query: Bounds, inside: bool) -> List[str]:
+        """Depth-first box query"""
+        if self._root is None:
+            return []
+        test = _contains if inside else _intersects
+        results: List[str] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.leaf:
+                results.extend(object_id for bounds, object_id in node.children if test(query, bounds))
+            else:
+                stack.extend(child for child in node.children if _intersects(query, child.bounds))
+        return results
+
+    def _allowed(self, layer: Optional[str], object_type: Optional[str]) -> Optional[Set[str]]:
+        """Ids passing the layer and type filters (None: no filter)"""
+        allowed: Optional[Set[str]] = None
+        if layer is not None:
+            allowed = self._by_layer.get(layer.lower(), set())
+        if object_type is not None:
+            by_type = self._by_type.get(object_type.lower(), set())
+            allowed = by_type if allowed is None else allowed & by_type
+        return allowed
+
+    def _filter(self, object_ids: List[str], layer: Optional[str],
+                object_type: Optional[str]) -> List[str]:
+        allowed = self._allowed(layer, object_type)
+        return object_ids if allowed is None else [i for i in object_ids if i in allowed]
+
+    def _pack(self, entries: List[Any], leaf: bool) -> List[List[Any]]:
+        """Group entries into nodes by tiling their centers along x, y and z"""
+        capacity = self.NODE_CAPACITY
+
+        def center(entry: Any, axis: int) -> float:
+            bounds = entry[0] if leaf else entry.bounds
+            return bounds[axis] + bounds[axis + 3]
+
+        def tiles(items: List[Any], axis: int) -> List[List[Any]]:
+            if axis == 2 or len(items) <= capacity:
+                items = sorted(items, key=lambda e: center(e, 2))
+                return [items[i:i + capacity] for i in range(0, len(items), capacity)]
+            # Slabs per axis so the remaining axes split the rest evenly
+            remaining = 3 - axis
+            slabs = math.ceil(math.ceil(len(items) / capacity) ** (1 / remaining))
+            items = sorted(items, key=lambda e: center(e, axis))
+            size = math.ceil(len(items) / slabs)
+            return [group for i in range(0, len(items), size) for group in tiles(items[i:i + size], axis + 1)]
+
+        return tiles(entries, 0)
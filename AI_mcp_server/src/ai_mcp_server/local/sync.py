@@ -0,0 +1,436 @@
+"""
+Incremental synchronization between Rhino and Grasshopper
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..utils import codec
+from ..utils.tracing import tracer
+
+
+# Bumped when the on-disk layout changes
+SYNC_FORMAT = 1
+
+DEFAULT_SYNC_STATE_PATH = Path.home() / ".ai_mcp_server" / "sync_state.json"
+
+DIRECTIONS = ("rhino_to_grasshopper", "grasshopper_to_rhino")
+
+# Fields that change without the item itself changing
+_VOLATILE_KEYS = frozenset({"id", "version", "selected", "x", "y", "position", "pivot"})
+
+# Grid for components placed on the Grasshopper canvas
+_CANVAS_COLUMNS = 20
+_CANVAS_SPACING = (150, 100)
+
+
+def map_geometry_to_component(geometry_type: str) -> Optional[str]:
+    """Map geometry type to Grasshopper component type"""
+    mapping = {
+        "box": "Box",
+        "sphere": "Sphere",
+        "cylinder": "Cylinder",
+        "cone": "Cone",
+        "circle": "Circle",
+        "line": "Line",
+        "point": "Point",
+        "plane": "XY Plane"
+    }
+    return mapping.get(geometry_type.lower())
+
+
+def map_component_to_geometry(component_type: str) -> Optional[str]:
+    """Map Grasshopper component type to geometry type"""
+    mapping = {
+        "box": "BOX",
+        "sphere": "SPHERE",
+        "cylinder": "CYLINDER",
+        "cone": "CONE",
+        "circle": "CIRCLE",
+        "line": "LINE",
+        "point": "POINT"
+    }
+    return mapping.get(component_type.lower())
+
+
+def default_geometry_params(geometry_type: str) -> Dict[str, Any]:
+    """Get default parameters for geometry type"""
+    defaults = {
+        "BOX": {"width": 1.0, "length": 1.0, "height": 1.0},
+        "SPHERE": {"radius": 1.0},
+        "CYLINDER": {"radius": 1.0, "height": 2.0},
+        "CONE": {"radius": 1.0, "height": 2.0},
+        "CIRCLE": {"center": [0, 0, 0], "radius": 1.0},
+        "LINE": {"start": [0, 0, 0], "end": [1, 1, 1]},
+        "POINT": {"x": 0, "y": 0, "z": 0}
+    }
+    return dict(defaults.get(geometry_type, {}))
+
+
+def fingerprint(item: Dict[str, Any]) -> str:
+    """Content hash of an object or component, ignoring volatile fields"""
+    content = {key: value for key, value in item.items() if key not in _VOLATILE_KEYS}
+    return hashlib.sha1(codec.dumps(content, sort_keys=True)).hexdigest()[:16]
+
+
+def _result_id(result: Dict[str, Any]) -> Optional[str]:
+    """Id of the object or component a create command reports"""
+    value = result.get("result") if result.get("status") == "success" else None
+    if isinstance(value, dict):
+        for key in ("id", "componentId", "object_id"):
+            if value.get(key) is not None:
+                return str(value[key])
+    return None
+
+
+@dataclass
+class SyncReport:
+    """Outcome of one sync run"""
+    direction: str
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    # Targets of removed sources that the target platform cannot delete
+    left: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """One-line description of the run"""
+        text = (f"Sync {self.direction}: {self.added} added, {self.updated} updated, "
+                f"{self.deleted} deleted, {self.unchanged} unchanged")
+        if self.skipped:
+            text += f", {self.skipped} without a counterpart type"
+        if self.left:
+            text += f", {self.left} left in place"
+        text += f" in {self.seconds:.2f}s"
+        if self.errors:
+            shown = "; ".join(self.errors[:10])
+            more = len(self.errors) - 10
+            text += f". Errors: {shown}" + (f" (and {more} more)" if more > 0 else "")
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the report"""
+        return {
+            "direction": self.direction,
+            "added": self.added,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "left": self.left,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class SyncState:
+    """Source-to-target id mappings persisted between sync runs
+
+    Each mapping is keyed by direction and source document and holds, per
+    source id, the target id, the target type and the source fingerprint
+    the target was last synced from. Targets that could not be deleted
+    because the target platform lacks the command are listed under
+    ``left`` and not tried again.
+    """
+
+    def __init__(self, path: Optional[Path] = None, logger: Optional[logging.Logger] = None):
+        self.path = Path(path) if path else DEFAULT_SYNC_STATE_PATH
+        self.logger = logger or logging.getLogger(__name__)
+        self.mappings: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+
+    def mapping(self, key: str) -> Dict[str, Any]:
+        """The mapping stored under ``key``, created if missing"""
+        return self.mappings.setdefault(key, {"items": {}, "next_slot": 0})
+
+    def load(self) -> None:
+        """Load the state persisted on disk, if any"""
+        self.loaded = True
+        try:
+            data = codec.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable sync state {self.path}: {e}")
+            return
+        if data.get("format") != SYNC_FORMAT:
+            self.logger.info("Ignoring sync state in an older format")
+            return
+        self.mappings = data.get("mappings", {})
+
+    def save(self) -> None:
+        """Persist the state to disk"""
+        data = {"format": SYNC_FORMAT, "mappings": self.mappings}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_bytes(codec.dumps(data))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save sync state to {self.path}: {e}")
+
+
+@dataclass
+class _Plan:
+    """Commands one sync run has to send"""
+    # (source id, target type, fingerprint, creation spec)
+    creates: List[Tuple[str, str, str, Dict[str, Any]]] = field(default_factory=list)
+    # (source id, target id, fingerprint, new parameters)
+    updates: List[Tuple[str, str, str, Dict[str, Any]]] = field(default_factory=list)
+    # (source id, target id, whether the target is being replaced)
+    deletes: List[Tuple[str, str, bool]] = field(default_factory=list)
+    # Sources that were deleted along with their targets
+    dropped: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    skipped: int = 0
+
+
+class SyncEngine:
+    """Diff-based sync of Rhino objects and Grasshopper components
+
+    Every source item is fingerprinted by content hash. A run compares the
+    fingerprints with the persisted mapping and sends only what changed:
+
+    - new sources, and sources whose target was deleted, are created
+    - changed sources whose counterpart type changed are replaced;
+      changed components update their Rhino object's parameters
+    - targets of deleted sources are deleted
+
+    Commands go out in batch envelopes of ``batch_size`` items, at most
+    ``concurrency`` batches at a time. The first delete of a session goes
+    out alone: Grasshopper plugins without ``delete_component`` reject
+    it, and their targets are then left in place rather than sent again.
+    """
+
+    def __init__(self, rhino_bridge: Any, grasshopper_bridge: Any, logger: logging.Logger,
+                 state_path: Optional[Path] = None, batch_size: int = 500, concurrency: int = 4):
+        self.rhino_bridge = rhino_bridge
+        self.grasshopper_bridge = grasshopper_bridge
+        self.logger = logger
+        self.state = SyncState(state_path, logger)
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        # Per direction, None until the target platform has answered a delete
+        self.deletes_supported: Dict[str, Optional[bool]] = {}
+        self._lock = asyncio.Lock()
+
+    async def sync(self, direction: str) -> SyncReport:
+        """Bring the target platform in line with the source platform"""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown sync direction: {direction}")
+
+        async with self._lock:
+            started = time.perf_counter()
+            if not self.state.loaded:
+                self.state.load()
+
+            rhino_info, components = await asyncio.gather(
+                self.rhino_bridge.get_document_info(), self._grasshopper_components()
+            )
+            objects = rhino_info.get("objects", []) if isinstance(rhino_info, dict) else []
+            if direction == "rhino_to_grasshopper":
+                sources, targets, document = objects, components, rhino_info.get("name", "")
+            else:
+                sources, targets, document = components, objects, ""
+            mapping = self.state.mapping(f"{direction}:{document}")
+
+            report = SyncReport(direction)
+            with tracer.span("sync.plan", sources=len(sources), targets=len(targets)):
+                plan = self._plan(direction, sources, {str(t["id"]) for t in targets if "id" in t}, mapping)
+            with tracer.span("sync.apply"):
+                await self._apply(direction, plan, mapping, report)
+            report.unchanged = plan.unchanged
+            report.skipped = plan.skipped
+            self.state.save()
+            report.seconds = time.perf_counter() - started
+            self.logger.info(report.summary())
+            return report
+
+    async def _grasshopper_components(self) -> List[Dict[str, Any]]:
+        """Every component on the Grasshopper canvas"""
+        components: List[Dict[str, Any]] = []
+        async for page in self.grasshopper_bridge.iter_component_pages(page_size=2000):
+            components.extend(page.items)
+        return components
+
+    def _plan(self, direction: str, sources: List[Dict[str, Any]], target_ids: Set[str],
+              mapping: Dict[str, Any]) -> _Plan:
+        """Diff the source items against the mapping"""
+        plan = _Plan()
+        items: Dict[str, Dict[str, Any]] = mapping["items"]
+        seen: Set[str] = set()
+
+        for source in sources:
+            if not isinstance(source, dict) or "id" not in source:
+                continue
+            source_id = str(source["id"])
+            target_type = self._target_type(direction, source)
+            if target_type is None:
+                plan.skipped += 1
+                continue
+            seen.add(source_id)
+            digest = fingerprint(source)
+            entry = items.get(source_id)
+
+            if entry is None or entry["target"] not in target_ids:
+                plan.creates.append((source_id, target_type, digest, self._spec(direction, target_type, source)))
+            elif entry["hash"] == digest:
+                plan.unchanged += 1
+            elif entry["type"] != target_type:
+                plan.deletes.append((source_id, entry["target"], True))
+                plan.creates.append((source_id, target_type, digest, self._spec(direction, target_type, source)))
+            elif direction == "grasshopper_to_rhino":
+                params = self._spec(direction, target_type, source)["params"]
+                plan.updates.append((source_id, entry["target"], digest, params))
+            else:
+                # Components carry no geometry; only the fingerprint moves on
+                entry["hash"] = digest
+                plan.unchanged += 1
+
+        for source_id in set(items) - seen:
+            target = items[source_id]["target"]
+            if target in target_ids:
+                plan.deletes.append((source_id, target, False))
+            else:
+                plan.dropped.append(source_id)
+        return plan
+
+    @staticmethod
+    def _target_type(direction: str, source: Dict[str, Any]) -> Optional[str]:
+        source_type = str(source.get("type") or "")
+        if direction == "rhino_to_grasshopper":
+            return map_geometry_to_component(source_type)
+        return map_component_to_geometry(source_type)
+
+    @staticmethod
+    def _spec(direction: str, target_type: str, source: Dict[str, Any]) -> Dict[str, Any]:
+        """Creation parameters of a source item's counterpart"""
+        if direction == "rhino_to_grasshopper":
+            return {"type": target_type}
+        params = default_geometry_params(target_type)
+        overrides = source.get("params")
+        if isinstance(overrides, dict):
+            params.update({key: value for key, value in overrides.items() if key in params})
+        return {"type": target_type, "params": params}
+
+    async def _apply(self, direction: str, plan: _Plan, mapping: Dict[str, Any],
+                     report: SyncReport) -> None:
+        """Send the planned commands and record the outcome in the mapping"""
+        items: Dict[str, Dict[str, Any]] = mapping["items"]
+        to_rhino = direction == "grasshopper_to_rhino"
+
+        for source_id in plan.dropped:
+            items.pop(source_id, None)
+        report.deleted += len(plan.dropped)
+
+        # Deletes go first so a replaced target is never left behind
+        failed: Set[str] = set()
+        if plan.deletes:
+            results = await self._delete(direction, [target for _, target, _ in plan.deletes])
+            if results is None:
+                command = "delete_object" if to_rhino else "delete_component"
+                report.errors.append(f"{'Rhino' if to_rhino else 'Grasshopper'} does not support {command}; "
+                                     f"{len(plan.deletes)} targets left in place")
+                # Recorded so later runs do not send the deletes again
+                left = mapping.setdefault("left", [])
+                for source_id, target, replaced in plan.deletes:
+                    left.append(target)
+                    if not replaced:
+                        items.pop(source_id, None)
+                        report.left += 1
+                results = []
+            for (source_id, target, replaced), result in zip(plan.deletes, results):
+                if result.get("status") == "error":
+                    # Kept in the mapping, so the next run tries again
+                    report.errors.append(f"Delete {target}: {result.get('message', 'Unknown error')}")
+                    failed.add(source_id)
+                elif not replaced:
+                    items.pop(source_id, None)
+                    report.deleted += 1
+
+        creates = [create for create in plan.creates if create[0] not in failed]
+        if creates:
+            if to_rhino:
+                specs = [spec for _, _, _, spec in creates]
+                results = await self._batched(specs, self.rhino_bridge.create_objects)
+            else:
+                specs = []
+                for _ in creates:
+                    slot = mapping["next_slot"]
+                    mapping["next_slot"] = slot + 1
+                    column, row = slot % _CANVAS_COLUMNS, slot // _CANVAS_COLUMNS
+                    specs.append({
+                        "x": 100 + column * _CANVAS_SPACING[0],
+                        "y": 100 + row * _CANVAS_SPACING[1],
+                    })
+                specs = [dict(spec, type=create[1]) for spec, create in zip(specs, creates)]
+                results = await self._batched(specs, self.grasshopper_bridge.add_components)
+            for (source_id, target_type, digest, _), result in zip(creates, results):
+                target = _result_id(result)
+                if target is None:
+                    report.errors.append(f"Create {target_type} for {source_id}: "
+                                         f"{result.get('message', 'no id returned')}")
+                    continue
+                replaced = source_id in items
+                items[source_id] = {"target": target, "type": target_type, "hash": digest}
+                if replaced:
+                    report.updated += 1
+                else:
+                    report.added += 1
+
+        if plan.updates:
+            modifications = [{"object_id": target, "params": params} for _, target, _, params in plan.updates]
+            results = await self._batched(modifications, self.rhino_bridge.modify_objects)
+            for (source_id, target, digest, _), result in zip(plan.updates, results):
+                if result.get("status") == "error":
+                    report.errors.append(f"Update {target}: {result.get('message', 'Unknown error')}")
+                    continue
+                items[source_id]["hash"] = digest
+                report.updated += 1
+
+    async def _delete(self, direction: str, targets: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Delete targets in batches, or return None if the target platform cannot"""
+        to_rhino = direction == "grasshopper_to_rhino"
+        results: List[Dict[str, Any]] = []
+        if self.deletes_supported.get(direction) is None:
+            delete_one = self.rhino_bridge.delete_object if to_rhino else self.grasshopper_bridge.delete_component
+            try:
+                await delete_one(targets[0])
+                self.deletes_supported[direction] = True
+                results.append({"status": "success"})
+            except (ConnectionError, asyncio.TimeoutError) as e:
+                # Unanswered, so support is still unknown
+                results.append({"status": "error", "message": str(e) or type(e).__name__})
+            except Exception as e:
+                self.logger.info(f"Deletes rejected for {direction} ({e}); leaving targets in place")
+                self.deletes_supported[direction] = False
+        if self.deletes_supported.get(direction) is False:
+            return None
+        delete = self.rhino_bridge.delete_objects if to_rhino else self.grasshopper_bridge.delete_components
+        return results + await self._batched(targets[len(results):], delete)
+
+    async def _batched(self, items: List[Any],
+                       send: Callable[[List[Any]], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Send items in batches of ``batch_size``, ``concurrency`` batches at a time"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: List[Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await send(batch)
+                except Exception as e:
+                    return [{"status": "error", "message": str(e)} for _ in batch]
+
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [result for batch_results in results for result in batch_results]
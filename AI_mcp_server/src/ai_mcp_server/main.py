@@ -1,33 +1,39 @@
-"""
-Main entry point for AI MCP Server
-"""
-
-import asyncio
-import sys
-from pathlib import Path
-from typing import Optional
-
-from .core.config import Config
-from .core.server import AIServer
-
-
-def main():
-    """Main entry point"""
-    try:
-        # Load configuration
-        config = Config.from_env()
-        
-        # Create and run server
-        server = AIServer(config)
-        server.run()
-        
-    except KeyboardInterrupt:
-        print("\nServer stopped by user")
-        sys.exit(0)
-    except Exception as e:
-        print(f"Server error: {e}")
-        sys.exit(1)
-
-
-if __name__ == "__main__":
-    main()
+"""
+Main entry point for AI MCP Server
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .core.startup import StartupReport
+
+
+def main():
+    """Main entry point"""
+    try:
+        # Imported here so the startup report can time the MCP SDK import
+        startup = StartupReport()
+        with startup.phase("import"):
+            from .core.config import Config
+            from .core.server import AIServer
+        
+        # Load configuration
+        with startup.phase("config"):
+            config = Config.from_env()
+        
+        # Create and run server
+        server = AIServer(config, startup)
+        server.run()
+        
+    except KeyboardInterrupt:
+        print("\nServer stopped by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Server error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Local Rhino and Grasshopper simulators for development and testing
+"""
+
+from .grasshopper import GrasshopperSimulator
+from .rhino import RhinoSimulator
+from .server import PlatformSimulator, SimulatorOptions
+
+__all__ = ["GrasshopperSimulator", "PlatformSimulator", "RhinoSimulator", "SimulatorOptions"]
@@ -0,0 +1,55 @@
+"""
+Run the Rhino and Grasshopper simulators on their default ports
+"""
+
+import argparse
+import asyncio
+import logging
+
+from .grasshopper import GrasshopperSimulator
+from .rhino import RhinoSimulator
+from .server import SimulatorOptions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulated Rhino and Grasshopper plugins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rhino-port", type=int, default=1999)
+    parser.add_argument("--grasshopper-port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per command")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random latency spread in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Chance of an error reply")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Chance of closing the connection")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Chance of never replying")
+    parser.add_argument("--objects", type=int, default=0, help="Objects in the initial Rhino document")
+    parser.add_argument("--object-padding", type=int, default=0, help="Extra bytes per Rhino object")
+    parser.add_argument("--components", type=int, default=0, help="Components on the initial canvas")
+    parser.add_argument("--catalog-size", type=int, default=0, help="Generated catalog components")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    options = SimulatorOptions(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        drop_rate=args.drop_rate, hang_rate=args.hang_rate, objects=args.objects,
+        object_padding=args.object_padding, components=args.components,
+        catalog_size=args.catalog_size, seed=args.seed
+    )
+    rhino = RhinoSimulator(options, args.host, args.rhino_port)
+    grasshopper = GrasshopperSimulator(options, args.host, args.grasshopper_port)
+    await rhino.start()
+    await grasshopper.start()
+    await asyncio.gather(rhino.serve_forever(), grasshopper.serve_forever())
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(run(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Simulated Grasshopper plugin over an in-memory canvas
+"""
+
+import copy
+import hashlib
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import codec
+from .server import PlatformSimulator, SimulatedError, page
+
+
+def _param(name: str, nickname: str, kind: str) -> Dict[str, str]:
+    return {"name": name, "nickname": nickname, "type": kind}
+
+
+# name: (nickname, category, subcategory, description, inputs, outputs)
+BUILTIN_COMPONENTS: Dict[str, Tuple[str, str, str, str, List[Dict[str, str]], List[Dict[str, str]]]] = {
+    "Number Slider": ("Slider", "Params", "Input", "Numeric slider for single values",
+                      [], [_param("Number", "N", "Number")]),
+    "Panel": ("Panel", "Params", "Input", "Custom note or data viewer",
+              [_param("Input", "I", "Generic")], [_param("Output", "O", "Generic")]),
+    "Construct Point": ("Pt", "Vector", "Point", "Construct a point from xyz coordinates",
+                        [_param("X coordinate", "X", "Number"), _param("Y coordinate", "Y", "Number"),
+                         _param("Z coordinate", "Z", "Number")],
+                        [_param("Point", "Pt", "Point")]),
+    "Series": ("Series", "Sets", "Sequence", "Create a series of numbers",
+               [_param("Start", "S", "Number"), _param("Step", "N", "Number"), _param("Count", "C", "Integer")],
+               [_param("Series", "S", "Number")]),
+    "Addition": ("A+B", "Maths", "Operators", "Mathematical addition",
+                 [_param("A", "A", "Generic"), _param("B", "B", "Generic")], [_param("Result", "R", "Generic")]),
+    "Line": ("Ln", "Curve", "Primitive", "Create a line between two points",
+             [_param("Start Point", "A", "Point"), _param("End Point", "B", "Point")],
+             [_param("Line", "L", "Curve")]),
+    "Circle": ("Cir", "Curve", "Primitive", "Create a circle defined by base plane and radius",
+               [_param("Plane", "P", "Plane"), _param("Radius", "R", "Number")],
+               [_param("Circle", "C", "Curve")]),
+    "Divide Curve": ("Divide", "Curve", "Division", "Divide a curve into equal length segments",
+                     [_param("Curve", "C", "Curve"), _param("Count", "N", "Integer")],
+                     [_param("Points", "P", "Point"), _param("Tangents", "T", "Vector"),
+                      _param("Parameters", "t", "Number")]),
+    "Move": ("Move", "Transform", "Euclidean", "Translate (move) an object along a vector",
+             [_param("Geometry", "G", "Geometry"), _param("Motion", "T", "Vector")],
+             [_param("Geometry", "G", "Geometry"), _param("Transform", "X", "Transform")]),
+    "Unit Z": ("Z", "Vector", "Vector", "Unit vector parallel to the world Z-axis",
+               [_param("Factor", "F", "Number")], [_param("Unit vector", "V", "Vector")]),
+    "Extrude": ("Extr", "Surface", "Freeform", "Extrude curves and surfaces along a vector",
+                [_param("Base", "B", "Geometry"), _param("Direction", "D", "Vector")],
+                [_param("Extrusion", "E", "Brep")]),
+    "Loft": ("Loft", "Surface", "Freeform", "Create a lofted surface through a set of section curves",
+             [_param("Curves", "C", "Curve"), _param("Options", "O", "Generic")],
+             [_param("Loft", "L", "Brep")]),
+    "Point": ("Pt", "Params", "Geometry", "Contains a collection of three-dimensional points",
+              [], [_param("Point", "Pt", "Point")]),
+    "XY Plane": ("XY", "Vector", "Plane", "World XY plane",
+                 [_param("Origin", "O", "Point")], [_param("Plane", "P", "Plane")]),
+    "Box": ("Box", "Surface", "Primitive", "Create a box from a base plane and dimensions",
+            [_param("Base", "B", "Plane"), _param("X Size", "X", "Number"), _param("Y Size", "Y", "Number"),
+             _param("Z Size", "Z", "Number")],
+            [_param("Box", "B", "Brep")]),
+    "Sphere": ("Sph", "Surface", "Primitive", "Create a spherical surface",
+               [_param("Base", "B", "Plane"), _param("Radius", "R", "Number")], [_param("Sphere", "S", "Brep")]),
+    "Cylinder": ("Cyl", "Surface", "Primitive", "Create a cylindrical surface",
+                 [_param("Base", "B", "Plane"), _param("Radius", "R", "Number"), _param("Length", "L", "Number")],
+                 [_param("Cylinder", "C", "Brep")]),
+    "Cone": ("Cone", "Surface", "Primitive", "Create a conical surface",
+             [_param("Base", "B", "Plane"), _param("Radius", "R", "Number"), _param("Length", "L", "Number")],
+             [_param("Cone", "C", "Brep")]),
+    "Voronoi": ("Voronoi", "Mesh", "Triangulation", "Planar voronoi diagram for a collection of points",
+                [_param("Points", "P", "Point"), _param("Radius", "R", "Number"), _param("Boundary", "B", "Curve")],
+                [_param("Cells", "C", "Curve")]),
+}
+
+# Pattern name: (description, components wired output 0 to input 0 in order)
+PATTERNS: Dict[str, Tuple[str, List[str]]] = {
+    "Circle from slider": ("Circle whose radius is driven by a slider", ["Number Slider", "Circle"]),
+    "Point series": ("Points along X from a number series", ["Series", "Construct Point"]),
+    "Extruded circle": ("Circle extruded along Z", ["Circle", "Extrude"]),
+    "Divided line": ("Line divided into equal segments", ["Line", "Divide Curve"]),
+}
+
+
+def _catalog_entry(name: str, spec: Tuple[str, str, str, str, List[Dict[str, str]], List[Dict[str, str]]],
+                   guid: str) -> Dict[str, Any]:
+    nickname, category, subcategory, description, inputs, outputs = spec
+    return {
+        "name": name, "nickname": nickname, "category": category, "subcategory": subcategory,
+        "description": description, "guid": guid, "inputs": inputs, "outputs": outputs,
+    }
+
+
+class GrasshopperSimulator(PlatformSimulator):
+    """Simulated Grasshopper listener implementing the ``GrasshopperBridge`` command set
+
+    The component catalog holds the built-in components plus
+    ``catalog_size`` generated ones. Saved documents are kept in memory
+    under their path, so ``save_document`` and ``load_document`` never
+    touch the file system.
+    """
+
+    platform = "grasshopper"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.catalog = self._build_catalog(self.options.catalog_size)
+        self.catalog_version = hashlib.sha256(codec.dumps(self.catalog, sort_keys=True)).hexdigest()[:16]
+        self._by_name = {entry["name"].lower(): entry for entry in self.catalog}
+        self._by_name.update({entry["nickname"].lower(): entry for entry in self.catalog
+                              if entry["nickname"].lower() not in self._by_name})
+        self.components: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.connections: List[Dict[str, Any]] = []
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.populate(self.options.components)
+
+    def _build_catalog(self, extra: int) -> List[Dict[str, Any]]:
+        catalog = [
+            _catalog_entry(name, spec, str(uuid.uuid5(uuid.NAMESPACE_URL, f"gh:{name}")))
+            for name, spec in BUILTIN_COMPONENTS.items()
+        ]
+        for index in range(extra):
+            name = f"Generated Component {index + 1}"
+            spec = (f"Gen{index + 1}", "Generated", f"Group {index % 10}", f"Generated test component {index + 1}",
+                    [_param("Input", "I", "Generic")], [_param("Output", "O", "Generic")])
+            catalog.append(_catalog_entry(name, spec, str(uuid.uuid5(uuid.NAMESPACE_URL, f"gh:{name}"))))
+        return catalog
+
+    def populate(self, count: int) -> None:
+        """Add ``count`` panels in a column"""
+        for index in range(count):
+            self._add("Panel", 0.0, index * 40.0)
+
+    def reset(self) -> None:
+        """Empty the canvas"""
+        self.components.clear()
+        self.connections = []
+
+    def _entry(self, component_type: Any) -> Dict[str, Any]:
+        entry = self._by_name.get(str(component_type).lower())
+        if entry is None:
+            raise SimulatedError(f"Unknown component type: {component_type}")
+        return entry
+
+    def _get(self, component_id: Any) -> Dict[str, Any]:
+        component = self.components.get(str(component_id))
+        if component is None:
+            raise SimulatedError(f"Component not found: {component_id}")
+        return component
+
+    def _add(self, component_type: str, x: float, y: float) -> Dict[str, Any]:
+        entry = self._entry(component_type)
+        component_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+        component = {
+            "id": component_id,
+            "type": entry["name"],
+            "name": entry["name"],
+            "nickname": entry["nickname"],
+            "x": float(x),
+            "y": float(y),
+            "inputs": [dict(p) for p in entry["inputs"]],
+            "outputs": [dict(p) for p in entry["outputs"]],
+        }
+        self.components[component_id] = component
+        return component
+
+    @staticmethod
+    def _find_param(params: List[Dict[str, Any]], name: Optional[str], index: Optional[int],
+                    side: str) -> Tuple[int, Dict[str, Any]]:
+        if not params:
+            raise SimulatedError(f"Component has no {side} parameters")
+        if name is not None:
+            for position, param in enumerate(params):
+                if name.lower() in (param["name"].lower(), param["nickname"].lower()):
+                    return position, param
+            raise SimulatedError(f"No {side} parameter named '{name}'")
+        index = 0 if index is None else int(index)
+        if not 0 <= index < len(params):
+            raise SimulatedError(f"{side.capitalize()} parameter index {index} out of range")
+        return index, params[index]
+
+    def _resolve(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        source = self._get(params["sourceId"])
+        target = self._get(params["targetId"])
+        source_index, source_param = self._find_param(
+            source["outputs"], params.get("sourceParam"), params.get("sourceParamIndex"), "output")
+        target_index, target_param = self._find_param(
+            target["inputs"], params.get("targetParam"), params.get("targetParamIndex"), "input")
+        return {
+            "sourceId": source["id"], "sourceParam": source_param["name"], "sourceParamIndex": source_index,
+            "targetId": target["id"], "targetParam": target_param["name"], "targetParamIndex": target_index,
+        }
+
+    def handle_add_component(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(self._add(params["type"], params.get("x", 0.0), params.get("y", 0.0)))
+
+    def handle_delete_component(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        component = self._get(params["componentId"])
+        del self.components[component["id"]]
+        self.connections = [c for c in self.connections
+                            if component["id"] not in (c["sourceId"], c["targetId"])]
+        return {"message": "Component deleted", "id": component["id"]}
+
+    def handle_connect_components(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        connection = self._resolve(params)
+        if connection in self.connections:
+            raise SimulatedError("Components are already connected")
+        self.connections.append(connection)
+        return dict(connection, message="Components connected")
+
+    def handle_validate_connection(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            connection = self._resolve(params)
+        except SimulatedError as e:
+            return {"valid": False, "reason": str(e)}
+        return {"valid": True, "connection": connection}
+
+    def handle_get_document_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": "Simulated.gh",
+            "component_count": len(self.components),
+            "connection_count": len(self.connections),
+        }
+
+    def handle_get_all_components(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return page(list(self.components.values()), "components", params)
+
+    def handle_get_component_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        component = dict(self._get(params["componentId"]))
+        component["connections"] = [c for c in self.connections
+                                    if component["id"] in (c["sourceId"], c["targetId"])]
+        return component
+
+    def handle_get_connections(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return page(self.connections, "connections", params)
+
+    def handle_search_components(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        query = str(params.get("query", "")).lower()
+        results = [
+            entry for entry in self.catalog
+            if not query or any(query in entry[key].lower() for key in ("name", "nickname", "category", "description"))
+        ]
+        return {"results": results, "count": len(results)}
+
+    def handle_get_component_parameters(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self._entry(params["componentType"])
+        return {"name": entry["name"], "inputs": entry["inputs"], "outputs": entry["outputs"]}
+
+    def handle_get_component_catalog(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.options.catalog:
+            raise SimulatedError("Unknown command type: get_component_catalog")
+        if params.get("known_version") == self.catalog_version:
+            return {"unchanged": True, "version": self.catalog_version}
+        return {"version": self.catalog_version, "components": self.catalog}
+
+    def handle_get_available_patterns(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        query = str(params.get("query", "")).lower()
+        patterns = [
+            {"name": name, "description": description, "components": components}
+            for name, (description, components) in PATTERNS.items()
+            if not query or query in name.lower() or query in description.lower()
+        ]
+        return {"patterns": patterns}
+
+    def handle_create_pattern(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        description = str(params["description"]).lower()
+        name = next(
+            (name for name, (text, _) in PATTERNS.items()
+             if name.lower() in description or any(len(word) > 4 and word in description for word in name.lower().split())),
+            None
+        )
+        if name is None:
+            raise SimulatedError(f"No pattern matches '{params['description']}'")
+        created = [self._add(component_type, index * 200.0, 0.0)
+                   for index, component_type in enumerate(PATTERNS[name][1])]
+        for source, target in zip(created, created[1:]):
+            self.connections.append(self._resolve({"sourceId": source["id"], "targetId": target["id"]}))
+        return {"pattern": name, "components": [c["id"] for c in created],
+                "message": f"Created pattern '{name}'"}
+
+    def handle_clear_document(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        removed = len(self.components)
+        self.components.clear()
+        self.connections = []
+        return {"message": "Document cleared", "removed": removed}
+
+    def handle_save_document(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        path = str(params["path"])
+        self.files[path] = copy.deepcopy({"components": self.components, "connections": self.connections})
+        return {"message": f"Document saved to {path}", "path": path}
+
+    def handle_load_document(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        path = str(params["path"])
+        if path not in self.files:
+            raise SimulatedError(f"File not found: {path}")
+        saved = copy.deepcopy(self.files[path])
+        self.components, self.connections = saved["components"], saved["connections"]
+        return {"message": f"Document loaded from {path}", "path": path,
+                "component_count": len(self.components)}
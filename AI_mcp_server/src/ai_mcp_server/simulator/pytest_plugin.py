@@ -0,0 +1,98 @@
+"""
+Pytest fixtures serving simulated Rhino and Grasshopper plugins
+
+Enable with ``pytest_plugins = ["ai_mcp_server.simulator.pytest_plugin"]``
+in a ``conftest.py``. Simulator behaviour is set per test with the
+``simulator`` marker, whose keywords are ``SimulatorOptions`` fields::
+
+    @pytest.mark.simulator(latency=0.01, error_rate=0.1, objects=1000)
+    async def test_listing(rhino_bridge, rhino_simulator):
+        ...
+
+The ``bridge`` marker's keywords are passed on to the ``RhinoConfig`` or
+``GrasshopperConfig`` of the bridge fixtures, e.g.
+``@pytest.mark.bridge(deadlines={"batch": 0.5})``.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict
+
+import pytest
+import pytest_asyncio
+
+from ..bridges.grasshopper_bridge import GrasshopperBridge
+from ..bridges.rhino_bridge import RhinoBridge
+from ..core.config import Config, GrasshopperConfig, RhinoConfig, ServerConfig
+from .grasshopper import GrasshopperSimulator
+from .rhino import RhinoSimulator
+from .server import SimulatorOptions
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "simulator(**options): SimulatorOptions for the simulator fixtures")
+    config.addinivalue_line("markers", "bridge(**settings): config fields for the bridge fixtures")
+
+
+@pytest.fixture
+def simulator_options(request: pytest.FixtureRequest) -> SimulatorOptions:
+    """Options from the test's ``simulator`` marker"""
+    marker = request.node.get_closest_marker("simulator")
+    return SimulatorOptions(**(marker.kwargs if marker else {}))
+
+
+@pytest.fixture
+def bridge_settings(request: pytest.FixtureRequest) -> Dict[str, Any]:
+    """Config fields from the test's ``bridge`` marker"""
+    marker = request.node.get_closest_marker("bridge")
+    return dict(marker.kwargs) if marker else {}
+
+
+@pytest_asyncio.fixture
+async def rhino_simulator(simulator_options: SimulatorOptions) -> AsyncIterator[RhinoSimulator]:
+    """Simulated Rhino listener on a free port"""
+    async with RhinoSimulator(simulator_options) as simulator:
+        yield simulator
+
+
+@pytest_asyncio.fixture
+async def grasshopper_simulator(simulator_options: SimulatorOptions) -> AsyncIterator[GrasshopperSimulator]:
+    """Simulated Grasshopper listener on a free port"""
+    async with GrasshopperSimulator(simulator_options) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def simulated_config(rhino_simulator: RhinoSimulator, grasshopper_simulator: GrasshopperSimulator,
+                     tmp_path: Path) -> Config:
+    """Server configuration pointing at both simulators, with state files under ``tmp_path``"""
+    return Config(
+        server=ServerConfig(sync_state_path=str(tmp_path / "sync_state.json")),
+        rhino=RhinoConfig(host=rhino_simulator.host, port=rhino_simulator.port),
+        grasshopper=GrasshopperConfig(host=grasshopper_simulator.host, port=grasshopper_simulator.port,
+                                      catalog_path=str(tmp_path / "grasshopper_catalog.json")),
+    )
+
+
+@pytest_asyncio.fixture
+async def rhino_bridge(rhino_simulator: RhinoSimulator,
+                       bridge_settings: Dict[str, Any]) -> AsyncIterator[RhinoBridge]:
+    """Rhino bridge connected to the simulator"""
+    config = RhinoConfig(**dict(bridge_settings, host=rhino_simulator.host, port=rhino_simulator.port))
+    bridge = RhinoBridge(config, logging.getLogger("rhino_bridge"))
+    await bridge.initialize()
+    yield bridge
+    await bridge.cleanup()
+
+
+@pytest_asyncio.fixture
+async def grasshopper_bridge(grasshopper_simulator: GrasshopperSimulator, tmp_path: Path,
+                             bridge_settings: Dict[str, Any]) -> AsyncIterator[GrasshopperBridge]:
+    """Grasshopper bridge connected to the simulator, with its catalog under ``tmp_path``"""
+    config = GrasshopperConfig(**dict(bridge_settings, host=grasshopper_simulator.host,
+                                      port=grasshopper_simulator.port,
+                                      catalog_path=str(tmp_path / "grasshopper_catalog.json")))
+    bridge = GrasshopperBridge(config, logging.getLogger("grasshopper_bridge"))
+    await bridge.initialize()
+    yield bridge
+    await bridge.cleanup()
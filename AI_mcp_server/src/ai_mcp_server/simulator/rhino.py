@@ -0,0 +1,275 @@
+"""
+Simulated Rhino plugin over an in-memory document
+"""
+
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..bridges.binary import pack_rows
+from ..local.mirror import document_hash
+from .server import PlatformSimulator, SimulatedError, page, rows
+
+
+DEFAULT_LAYER = "Default"
+
+
+def _vector(value: Any, default: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> List[float]:
+    if value is None:
+        return list(default)
+    value = rows(value)
+    return [float(v) for v in (value + [0.0, 0.0, 0.0])[:3]]
+
+
+def _grouped(values: List[Any], width: Optional[int]) -> List[List[Any]]:
+    """Rows of a mesh array sent either nested or flat"""
+    if not values or isinstance(values[0], list):
+        return values
+    width = width or 3
+    return [values[i:i + width] for i in range(0, len(values), width)]
+
+
+def _bounding_box(object_type: str, params: Dict[str, Any], center: List[float]) -> List[List[float]]:
+    """Rough bounding box of a created object"""
+    if object_type == "MESH" and params.get("vertices"):
+        points = params["vertices"]
+    elif params.get("points"):
+        points = [_vector(p) for p in params["points"]]
+    elif object_type == "LINE" and "start" in params:
+        points = [_vector(params["start"]), _vector(params.get("end"))]
+    else:
+        if object_type == "POINT":
+            half = [0.0, 0.0, 0.0]
+        elif "radius" in params:
+            radius = float(params["radius"])
+            half = [radius, radius, radius]
+        else:
+            half = [float(params.get(key, 1.0)) / 2 for key in ("width", "length", "height")]
+        return [[c - h for c, h in zip(center, half)], [c + h for c, h in zip(center, half)]]
+    return [
+        [min(float(p[axis]) for p in points) for axis in range(3)],
+        [max(float(p[axis]) for p in points) for axis in range(3)],
+    ]
+
+
+class RhinoSimulator(PlatformSimulator):
+    """Simulated Rhino listener implementing the ``RhinoBridge`` command set
+
+    Objects live in an ordered dict with a per-object ``version`` and a
+    document version bumped on every change, so document mirrors can
+    follow ``get_document_changes`` and verify ``get_document_hash``.
+    Scripts are recorded in ``scripts`` rather than run.
+    """
+
+    platform = "rhino"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.objects: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.meshes: Dict[str, Dict[str, List[List[float]]]] = {}
+        self.layers: Dict[str, Dict[str, Any]] = {DEFAULT_LAYER: {"name": DEFAULT_LAYER, "color": [0, 0, 0]}}
+        self.current_layer = DEFAULT_LAYER
+        self.selected: List[str] = []
+        self.scripts: List[str] = []
+        self.version = 0
+        # (version, change, object id), oldest first
+        self._changes: List[Tuple[int, str, str]] = []
+        self._oldest_version = 0
+        self.populate(self.options.objects)
+
+    def populate(self, count: int, padding: Optional[int] = None) -> None:
+        """Add ``count`` boxes laid out on a grid, with ``padding`` bytes of user text each"""
+        side = max(1, int(count ** 0.5))
+        for index in range(count):
+            obj = self._create({"type": "BOX", "params": {"width": 1, "length": 1, "height": 1},
+                                "translation": [(index % side) * 2.0, (index // side) * 2.0, 0.0]})
+            if padding is not None:
+                obj["user_text"] = "x" * padding
+
+    def reset(self) -> None:
+        """Empty the document; clients must reload it rather than follow changes"""
+        self.objects.clear()
+        self.meshes.clear()
+        self.selected = []
+        self.version += 1
+        self._changes.clear()
+        self._oldest_version = self.version
+
+    def _record(self, change: str, object_id: str) -> None:
+        self.version += 1
+        self._changes.append((self.version, change, object_id))
+        if len(self._changes) > self.options.history:
+            dropped = len(self._changes) - self.options.history
+            self._oldest_version = self._changes[dropped - 1][0]
+            del self._changes[:dropped]
+
+    def _get(self, object_id: Any) -> Dict[str, Any]:
+        obj = self.objects.get(str(object_id))
+        if obj is None:
+            raise SimulatedError(f"Object not found: {object_id}")
+        return obj
+
+    def _create(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        object_type = str(params.get("type", "BOX")).upper()
+        type_params = dict(params.get("params") or {})
+        if object_type == "MESH":
+            if "vertices" not in type_params or "faces" not in type_params:
+                raise SimulatedError("MESH requires vertices and faces")
+            for key, width in (("vertices", 3), ("faces", None), ("normals", 3)):
+                if key in type_params:
+                    type_params[key] = _grouped(rows(type_params[key]), width)
+        center = _vector(params.get("translation") or type_params.get("center"))
+        layer = params.get("layer", self.current_layer)
+        object_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+        obj = {
+            "id": object_id,
+            "name": params.get("name") or f"{object_type.lower()}_{len(self.objects) + 1}",
+            "type": object_type,
+            "layer": layer,
+            "color": params.get("color") or self.layers.get(layer, {}).get("color", [0, 0, 0]),
+            "version": 1,
+            "bounding_box": _bounding_box(object_type, type_params, center),
+        }
+        if self.options.object_padding:
+            obj["user_text"] = "x" * self.options.object_padding
+        if object_type == "MESH":
+            self.meshes[object_id] = {key: type_params[key] for key in ("vertices", "faces", "normals")
+                                      if key in type_params}
+            obj["vertex_count"] = len(type_params["vertices"])
+            obj["face_count"] = len(type_params["faces"])
+        self.objects[object_id] = obj
+        self._record("added", object_id)
+        return obj
+
+    def handle_create_object(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(self._create(params))
+
+    def handle_create_objects_columnar(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.options.columnar:
+            raise SimulatedError("Unknown command type: create_objects_columnar")
+        count = int(params["count"])
+        positions = rows(params["positions"])
+        if len(positions) != count * 3:
+            raise SimulatedError(f"Expected {count * 3} position values, got {len(positions)}")
+        colors = rows(params["colors"]) if params.get("colors") is not None else None
+        names = params.get("names")
+        columns = {key: rows(value) if isinstance(value, list) or hasattr(value, "tolist") else None
+                   for key, value in (params.get("params") or {}).items()}
+        ids: List[str] = []
+        for row in range(count):
+            type_params = {key: column[row] if column is not None else params["params"][key]
+                           for key, column in columns.items()}
+            command: Dict[str, Any] = {"type": params["type"], "params": type_params,
+                                       "translation": positions[row * 3:row * 3 + 3]}
+            if colors is not None:
+                command["color"] = colors[row * 3:row * 3 + 3]
+            if names:
+                command["name"] = names[row]
+            ids.append(self._create(command)["id"])
+        return {"created": len(ids), "ids": ids, "errors": []}
+
+    def handle_get_object_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        object_id = str(params["object_id"])
+        info = dict(self._get(object_id))
+        mesh = self.meshes.get(object_id)
+        if mesh:
+            # Sent as binary buffers when the connection negotiated them
+            info["vertices"] = pack_rows(mesh["vertices"], 3, "float32")
+            info["faces"] = pack_rows(mesh["faces"], None, "int32")
+            if "normals" in mesh:
+                info["normals"] = pack_rows(mesh["normals"], 3, "float32")
+        return info
+
+    def handle_modify_object(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        obj = self._get(params["object_id"])
+        changes = params.get("params") or {}
+        for key in ("name", "color", "layer"):
+            if key in changes:
+                obj[key] = changes[key]
+        if changes.get("translation") is not None:
+            offset = _vector(changes["translation"])
+            obj["bounding_box"] = [[c + o for c, o in zip(corner, offset)] for corner in obj["bounding_box"]]
+        obj["version"] += 1
+        self._record("modified", obj["id"])
+        return {"message": "Object modified", "id": obj["id"], "name": obj["name"]}
+
+    def handle_delete_object(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        obj = self._get(params["object_id"])
+        del self.objects[obj["id"]]
+        self.meshes.pop(obj["id"], None)
+        if obj["id"] in self.selected:
+            self.selected.remove(obj["id"])
+        self._record("deleted", obj["id"])
+        return {"message": "Object deleted", "id": obj["id"]}
+
+    def handle_get_document_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return page(list(self.objects.values()), "objects", params,
+                    name="Simulated.3dm", units="Millimeters", version=self.version,
+                    object_count=len(self.objects), current_layer=self.current_layer,
+                    layers=list(self.layers.values()))
+
+    def handle_get_document_changes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        since = params.get("since")
+        if not isinstance(since, int) or since < self._oldest_version or since > self.version:
+            return {"resync": True, "version": self.version}
+        added, modified, deleted = set(), set(), set()
+        for version, change, object_id in self._changes:
+            if version <= since:
+                continue
+            if change == "added":
+                added.add(object_id)
+            elif change == "modified" and object_id not in added:
+                modified.add(object_id)
+            elif change == "deleted":
+                if object_id in added:
+                    added.discard(object_id)
+                else:
+                    modified.discard(object_id)
+                    deleted.add(object_id)
+        return {
+            "version": self.version,
+            "added": [self.objects[i] for i in added if i in self.objects],
+            "modified": [self.objects[i] for i in modified if i in self.objects],
+            "deleted": sorted(deleted),
+        }
+
+    def handle_get_document_hash(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"hash": document_hash(self.objects.values()), "version": self.version}
+
+    def handle_select_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        filters = params.get("filters") or {}
+        selected = [
+            obj["id"] for obj in self.objects.values()
+            if all(self._matches(obj, key, value) for key, value in filters.items())
+        ]
+        self.selected = selected
+        return {"count": len(selected), "ids": selected}
+
+    @staticmethod
+    def _matches(obj: Dict[str, Any], key: str, value: Any) -> bool:
+        actual = obj.get(key)
+        if isinstance(value, list) and not isinstance(actual, list):
+            return actual in value
+        if isinstance(value, str) and isinstance(actual, str):
+            return actual.lower() == value.lower()
+        return actual == value
+
+    def handle_execute_rhinoscript_python_code(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.scripts.append(params["script"])
+        return {"message": "Script executed", "output": ""}
+
+    def handle_create_layer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params["name"]
+        if name in self.layers:
+            raise SimulatedError(f"Layer already exists: {name}")
+        self.layers[name] = {"name": name, "color": params.get("color") or [0, 0, 0]}
+        return {"message": f"Layer '{name}' created", "layer": self.layers[name]}
+
+    def handle_get_or_set_current_layer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name: Optional[str] = params.get("layer_name")
+        if name is not None:
+            if name not in self.layers:
+                raise SimulatedError(f"Layer not found: {name}")
+            self.current_layer = name
+            return {"message": f"Current layer set to '{name}'", "layer": self.layers[name]}
+        return {"name": self.current_layer, "layer": self.layers[self.current_layer]}
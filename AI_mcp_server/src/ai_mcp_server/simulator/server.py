@@ -0,0 +1,314 @@
+"""
+Protocol simulator base: framing, negotiation, batching and fault injection
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+from ..bridges.binary import find_buffers
+from ..bridges.framing import FrameReader, encode_binary_frame, encode_frame
+from ..utils import codec
+
+
+# Commands that are part of the protocol rather than the platform
+PROTOCOL_COMMANDS = {"negotiate", "cancel", "batch"}
+# Listing parameters a plugin without paging ignores
+PAGING_PARAMS = ("offset", "limit", "cursor")
+
+
+class SimulatedError(Exception):
+    """A command failure reported to the client as an error reply"""
+
+
+@dataclass
+class SimulatorOptions:
+    """Behaviour of a simulated platform
+
+    Latency is ``latency`` seconds per command plus a uniform random
+    ``jitter`` in either direction, with ``command_latency`` overriding
+    the base for individual command types. Each fault rate is the chance
+    (0 to 1) that a command gets that fault instead of its normal reply:
+    ``error_rate`` answers with an error, ``drop_rate`` closes the
+    connection and ``hang_rate`` never replies. ``fault_commands`` limits
+    faults to the named command types.
+
+    The ``echo_ids``, ``pipelining``, ``batching``, ``columnar``,
+    ``negotiation``, ``catalog`` and ``paging`` switches turn protocol
+    features off to exercise the bridges' fallbacks for older plugins.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    command_latency: Dict[str, float] = field(default_factory=dict)
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    hang_rate: float = 0.0
+    fault_commands: Optional[Set[str]] = None
+    # Initial document size and per-item payload
+    objects: int = 0
+    object_padding: int = 0
+    components: int = 0
+    catalog_size: int = 0
+    # Protocol features
+    echo_ids: bool = True
+    pipelining: bool = True
+    batching: bool = True
+    columnar: bool = True
+    negotiation: bool = True
+    compression: bool = True
+    binary: bool = True
+    cancel: bool = True
+    # Answer cancel messages, as some plugins answer every message
+    cancel_replies: bool = False
+    catalog: bool = True
+    paging: bool = True
+    # Document changes kept for get_document_changes
+    history: int = 10000
+    seed: Optional[int] = None
+
+
+class _Session:
+    """Protocol state of one client connection"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.compress_threshold: Optional[int] = None
+        self.binary = False
+        self.tasks: Dict[Any, asyncio.Task] = {}
+
+
+class PlatformSimulator:
+    """In-process stand-in for a platform plugin's socket listener
+
+    Speaks the bridge protocol: newline-delimited JSON commands
+    ``{"type", "params"}`` answered with ``{"status", "result"}`` or
+    ``{"status": "error", "message"}``, plus the optional ``negotiate``
+    handshake, request ids, ``cancel`` messages, ``batch`` envelopes and
+    compressed or binary frames. Subclasses implement the platform
+    commands as ``handle_<command>`` methods over an in-memory document.
+
+    Every received command type is counted in ``commands`` and client
+    connections in ``accepted``.
+    """
+
+    platform = "platform"
+
+    def __init__(self, options: Optional[SimulatorOptions] = None, host: str = "127.0.0.1",
+                 port: int = 0, logger: Optional[logging.Logger] = None):
+        self.options = options or SimulatorOptions()
+        self.host = host
+        self.port = port
+        self.logger = logger or logging.getLogger(__name__)
+        self.random = random.Random(self.options.seed)
+        self.commands: Counter = Counter()
+        self.faults: Counter = Counter()
+        self.cancelled = 0
+        self.accepted = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sessions: Set[_Session] = set()
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    async def start(self) -> "PlatformSimulator":
+        """Start listening; with port 0 a free port is chosen and kept across restarts"""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"{self.platform} simulator listening on {self.address}")
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and drop every open connection"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for session in list(self._sessions):
+            self._close_session(session)
+        await asyncio.sleep(0)
+
+    async def disconnect_clients(self) -> None:
+        """Drop every open connection but keep listening"""
+        for session in list(self._sessions):
+            self._close_session(session)
+        await asyncio.sleep(0)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def __aenter__(self) -> "PlatformSimulator":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = _Session(writer)
+        self._sessions.add(session)
+        self.accepted += 1
+        frames = FrameReader(reader)
+        # Without echoed ids, replies must go out in request order
+        concurrent = self.options.pipelining and self.options.echo_ids
+        try:
+            while True:
+                command = await frames.read_message()
+                if not isinstance(command, dict):
+                    await self._reply(session, command, {"status": "error", "message": "Invalid command"})
+                    continue
+                if command.get("type") == "cancel":
+                    self._cancel(session, (command.get("params") or {}).get("id"))
+                    if self.options.cancel_replies:
+                        await self._reply(session, command, {"status": "success", "result": {}})
+                    continue
+                if concurrent:
+                    task = asyncio.create_task(self._respond(session, command))
+                    request_id = command.get("id")
+                    if request_id is not None:
+                        session.tasks[request_id] = task
+                        task.add_done_callback(lambda _, key=request_id: session.tasks.pop(key, None))
+                else:
+                    await self._respond(session, command)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            self.logger.warning(f"{self.platform} simulator dropped a connection: {e}")
+        finally:
+            self._close_session(session)
+
+    def _close_session(self, session: _Session) -> None:
+        for task in list(session.tasks.values()):
+            task.cancel()
+        session.writer.close()
+        self._sessions.discard(session)
+
+    def _cancel(self, session: _Session, request_id: Any) -> None:
+        # Cancel messages get no reply unless ``cancel_replies`` is set
+        task = session.tasks.pop(request_id, None)
+        if task is not None:
+            task.cancel()
+            self.cancelled += 1
+
+    async def _respond(self, session: _Session, command: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        command_type = command.get("type")
+        self.commands[command_type] += 1
+
+        fault = self._pick_fault(command_type)
+        try:
+            await self._delay(command_type)
+            if fault == "hang":
+                # Held until the client cancels the request or disconnects
+                await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            return
+        if fault == "drop":
+            self._close_session(session)
+            return
+        if fault == "error":
+            reply = {"status": "error", "message": f"Simulated failure of {command_type}"}
+        else:
+            reply = self.dispatch(command_type, command.get("params") or {}, session)
+        reply["server_time_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        await self._reply(session, command, reply)
+
+    def _pick_fault(self, command_type: str) -> Optional[str]:
+        options = self.options
+        if command_type in ("negotiate", "cancel"):
+            return None
+        if options.fault_commands is not None and command_type not in options.fault_commands:
+            return None
+        roll = self.random.random()
+        for fault, rate in (("error", options.error_rate), ("drop", options.drop_rate),
+                            ("hang", options.hang_rate)):
+            if roll < rate:
+                self.faults[fault] += 1
+                return fault
+            roll -= rate
+        return None
+
+    async def _delay(self, command_type: str) -> None:
+        base = self.options.command_latency.get(command_type, self.options.latency)
+        jitter = self.options.jitter
+        delay = base + self.random.uniform(-jitter, jitter) if jitter else base
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _reply(self, session: _Session, command: Any, reply: Dict[str, Any]) -> None:
+        if self.options.echo_ids and isinstance(command, dict) and "id" in command:
+            reply["id"] = command["id"]
+        if session.binary and find_buffers(reply):
+            parts = encode_binary_frame(reply)
+        else:
+            parts = [encode_frame(codec.dumps(reply), session.compress_threshold)]
+        try:
+            session.writer.writelines(parts)
+            await session.writer.drain()
+        except (ConnectionError, RuntimeError):
+            self._close_session(session)
+
+    def dispatch(self, command_type: Optional[str], params: Dict[str, Any],
+                 session: Optional[_Session] = None) -> Dict[str, Any]:
+        """Run one command and build its reply"""
+        if command_type == "negotiate" and self.options.negotiation and session is not None:
+            return {"status": "success", "result": self._negotiate(session, params)}
+        if command_type == "batch" and self.options.batching:
+            return {"status": "success", "result": {"results": [
+                self.dispatch(item.get("type"), item.get("params") or {}, session)
+                for item in params.get("commands", [])
+            ]}}
+        handler = getattr(self, f"handle_{command_type}", None) if command_type not in PROTOCOL_COMMANDS else None
+        if handler is None:
+            return {"status": "error", "message": f"Unknown command type: {command_type}"}
+        if not self.options.paging:
+            params = {key: value for key, value in params.items() if key not in PAGING_PARAMS}
+        try:
+            return {"status": "success", "result": handler(params)}
+        except SimulatedError as e:
+            return {"status": "error", "message": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"status": "error", "message": f"Invalid parameters for {command_type}: {e}"}
+
+    def _negotiate(self, session: _Session, params: Dict[str, Any]) -> Dict[str, Any]:
+        accepted: Dict[str, Any] = {}
+        if self.options.compression and "zlib" in params.get("compression", []):
+            session.compress_threshold = int(params.get("compression_threshold", 16384))
+            accepted["compression"] = "zlib"
+        if self.options.binary and params.get("binary"):
+            session.binary = True
+            accepted["binary"] = True
+        if self.options.cancel and params.get("cancel"):
+            accepted["cancel"] = True
+        return accepted
+
+    def handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"message": "pong", "platform": self.platform, "simulated": True}
+
+
+def page(items: list, key: str, params: Dict[str, Any], **info: Any) -> Dict[str, Any]:
+    """Listing reply, paged when the command carries paging parameters"""
+    if "limit" not in params and "offset" not in params:
+        return dict(info, **{key: items})
+    offset = int(params.get("offset", 0))
+    limit = int(params.get("limit", len(items)))
+    stop = offset + limit
+    return dict(info, **{
+        key: items[offset:stop],
+        "offset": offset,
+        "total": len(items),
+        "next_cursor": str(stop) if stop < len(items) else None,
+    })
+
+
+def rows(value: Any) -> list:
+    """Nested lists from a JSON list or a received binary buffer"""
+    return value.tolist() if hasattr(value, "tolist") else list(value)
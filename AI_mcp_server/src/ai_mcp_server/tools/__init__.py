@@ -1,9 +1,19 @@
-"""
-Tool modules for MCP functionality
-"""
-
-from .unified_tools import register_unified_tools
-from .rhino_tools import register_rhino_tools
-from .grasshopper_tools import register_grasshopper_tools
-
-__all__ = ["register_unified_tools", "register_rhino_tools", "register_grasshopper_tools"]
+"""
+Tool modules for MCP functionality
+"""
+
+__all__ = ["register_unified_tools", "register_rhino_tools", "register_grasshopper_tools"]
+
+_MODULES = {
+    "register_unified_tools": "unified_tools",
+    "register_rhino_tools": "rhino_tools",
+    "register_grasshopper_tools": "grasshopper_tools",
+}
+
+
+def __getattr__(name):
+    # Tool modules are imported when first needed
+    if name in _MODULES:
+        import importlib
+        return getattr(importlib.import_module(f".{_MODULES[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,157 +1,317 @@
-"""
-Rhino-specific MCP tools
-"""
-
-from typing import Dict, Any, List, Optional
-from mcp.server.fastmcp import FastMCP, Context
-from ..bridges.rhino_bridge import RhinoBridge
-
-
-def register_rhino_tools(server: FastMCP, rhino_bridge: RhinoBridge):
-    """Register Rhino-specific tools"""
-    
-    @server.tool()
-    async def create_rhino_object(
-        ctx: Context,
-        type: str = "BOX",
-        name: Optional[str] = None,
-        color: Optional[List[int]] = None,
-        params: Dict[str, Any] = {},
-        translation: Optional[List[float]] = None,
-        rotation: Optional[List[float]] = None,
-        scale: Optional[List[float]] = None,
-    ) -> str:
-        """
-        Create a new object in the Rhino document.
-        
-        Parameters:
-        - type: Object type ("POINT", "LINE", "POLYLINE", "CIRCLE", "ARC", "ELLIPSE", "CURVE", "BOX", "SPHERE", "CONE", "CYLINDER", "PIPE", "SURFACE")
-        - name: Optional name for the object
-        - color: Optional [r, g, b] color values (0-255) for the object
-        - params: Type-specific parameters dictionary
-        - translation: Optional [x, y, z] translation vector
-        - rotation: Optional [x, y, z] rotation in radians
-        - scale: Optional [x, y, z] scale factors
-        
-        Returns:
-        A message indicating the created object name.
-        """
-        try:
-            result = await rhino_bridge.create_object(
-                type, params, name=name, color=color,
-                translation=translation, rotation=rotation, scale=scale
-            )
-            return f"Created {type} object: {result.get('name', 'Unknown')}"
-        except Exception as e:
-            return f"Error creating object: {str(e)}"
-    
-    @server.tool()
-    async def get_rhino_document_info(ctx: Context) -> str:
-        """Get detailed information about the current Rhino document"""
-        try:
-            result = await rhino_bridge.get_document_info()
-            import json
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return f"Error getting document info: {str(e)}"
-    
-    @server.tool()
-    async def get_rhino_object_info(ctx: Context, object_id: str) -> str:
-        """Get information about a specific Rhino object"""
-        try:
-            result = await rhino_bridge.get_object_info(object_id)
-            import json
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return f"Error getting object info: {str(e)}"
-    
-    @server.tool()
-    async def modify_rhino_object(ctx: Context, object_id: str, params: Dict[str, Any]) -> str:
-        """Modify a Rhino object"""
-        try:
-            result = await rhino_bridge.modify_object(object_id, params)
-            return f"Modified object {object_id}: {result.get('message', 'Success')}"
-        except Exception as e:
-            return f"Error modifying object: {str(e)}"
-    
-    @server.tool()
-    async def delete_rhino_object(ctx: Context, object_id: str) -> str:
-        """Delete a Rhino object"""
-        try:
-            result = await rhino_bridge.delete_object(object_id)
-            return f"Deleted object {object_id}: {result.get('message', 'Success')}"
-        except Exception as e:
-            return f"Error deleting object: {str(e)}"
-    
-    @server.tool()
-    async def select_rhino_objects(ctx: Context, filters: Dict[str, Any]) -> str:
-        """Select objects in Rhino based on filters"""
-        try:
-            result = await rhino_bridge.select_objects(filters)
-            return f"Selected objects: {result.get('count', 0)} objects"
-        except Exception as e:
-            return f"Error selecting objects: {str(e)}"
-    
-    @server.tool()
-    async def execute_rhino_script(ctx: Context, script: str) -> str:
-        """Execute RhinoScript Python code in Rhino"""
-        try:
-            result = await rhino_bridge.execute_script(script)
-            return f"Script executed: {result.get('message', 'Success')}"
-        except Exception as e:
-            return f"Error executing script: {str(e)}"
-    
-    @server.tool()
-    async def create_rhino_layer(ctx: Context, name: str, color: Optional[List[int]] = None) -> str:
-        """Create a new layer in Rhino"""
-        try:
-            result = await rhino_bridge.create_layer(name, color)
-            return f"Created layer '{name}': {result.get('message', 'Success')}"
-        except Exception as e:
-            return f"Error creating layer: {str(e)}"
-    
-    @server.tool()
-    async def get_rhino_current_layer(ctx: Context) -> str:
-        """Get current layer information in Rhino"""
-        try:
-            result = await rhino_bridge.get_current_layer()
-            import json
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return f"Error getting current layer: {str(e)}"
-    
-    @server.tool()
-    async def set_rhino_current_layer(ctx: Context, layer_name: str) -> str:
-        """Set current layer in Rhino"""
-        try:
-            result = await rhino_bridge.set_current_layer(layer_name)
-            return f"Set current layer to '{layer_name}': {result.get('message', 'Success')}"
-        except Exception as e:
-            return f"Error setting current layer: {str(e)}"
-    
-    @server.tool()
-    async def create_rhino_objects(ctx: Context, objects: List[Dict[str, Any]]) -> str:
-        """Create multiple objects in Rhino"""
-        try:
-            created_count = 0
-            errors = []
-            
-            for obj_data in objects:
-                try:
-                    obj_type = obj_data.get("type", "BOX")
-                    params = obj_data.get("params", {})
-                    name = obj_data.get("name")
-                    color = obj_data.get("color")
-                    
-                    await rhino_bridge.create_object(obj_type, params, name=name, color=color)
-                    created_count += 1
-                except Exception as e:
-                    errors.append(f"Object {obj_data}: {str(e)}")
-            
-            result_msg = f"Created {created_count} objects"
-            if errors:
-                result_msg += f". Errors: {'; '.join(errors)}"
-            
-            return result_msg
-        except Exception as e:
-            return f"Error creating objects: {str(e)}"
+"""
+Rhino-specific MCP tools
+"""
+
+from typing import Dict, Any, List, Optional
+from mcp.server.fastmcp import FastMCP, Context
+from ..bridges.rhino_bridge import RhinoBridge
+from ..utils.codec import dumps_text
+from ..utils.metrics import metered_tool
+
+
+def register_rhino_tools(server: FastMCP, rhino_bridge: RhinoBridge):
+    """Register Rhino-specific tools"""
+    tool = metered_tool(server)
+    
+    @tool()
+    async def create_rhino_object(
+        ctx: Context,
+        type: str = "BOX",
+        name: Optional[str] = None,
+        color: Optional[List[int]] = None,
+        params: Dict[str, Any] = {},
+        translation: Optional[List[float]] = None,
+        rotation: Optional[List[float]] = None,
+        scale: Optional[List[float]] = None,
+    ) -> str:
+        """
+        Create a new object in the Rhino document.
+        
+        Parameters:
+        - type: Object type ("POINT", "LINE", "POLYLINE", "CIRCLE", "ARC", "ELLIPSE", "CURVE", "BOX", "SPHERE", "CONE", "CYLINDER", "PIPE", "SURFACE")
+        - name: Optional name for the object
+        - color: Optional [r, g, b] color values (0-255) for the object
+        - params: Type-specific parameters dictionary
+        - translation: Optional [x, y, z] translation vector
+        - rotation: Optional [x, y, z] rotation in radians
+        - scale: Optional [x, y, z] scale factors
+        
+        Returns:
+        A message indicating the created object name.
+        """
+        try:
+            result = await rhino_bridge.create_object(
+                type, params, name=name, color=color,
+                translation=translation, rotation=rotation, scale=scale
+            )
+            return f"Created {type} object: {result.get('name', 'Unknown')}"
+        except Exception as e:
+            return f"Error creating object: {str(e)}"
+    
+    @tool()
+    async def get_rhino_document_info(
+        ctx: Context,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> str:
+        """
+        Get detailed information about the current Rhino document
+        
+        Args:
+            offset: Index of the first object to return when paging
+            limit: Maximum number of objects to return (omit for the whole document)
+            cursor: Cursor from a previous page's next_cursor
+        
+        Returns:
+            Document information as JSON; paged results include next_cursor
+        """
+        try:
+            if limit is None and cursor is None and offset == 0:
+                result = await rhino_bridge.get_document_info()
+                return dumps_text(result)
+            
+            page = await rhino_bridge.get_document_info_page(offset, limit or 500, cursor)
+            return dumps_text(page.to_dict("objects"))
+        except Exception as e:
+            return f"Error getting document info: {str(e)}"
+    
+    @tool()
+    async def get_rhino_object_info(ctx: Context, object_id: str) -> str:
+        """Get information about a specific Rhino object"""
+        try:
+            result = await rhino_bridge.get_object_info(object_id)
+            return dumps_text(result)
+        except Exception as e:
+            return f"Error getting object info: {str(e)}"
+    
+    @tool()
+    async def modify_rhino_object(ctx: Context, object_id: str, params: Dict[str, Any]) -> str:
+        """Modify a Rhino object"""
+        try:
+            result = await rhino_bridge.modify_object(object_id, params)
+            return f"Modified object {object_id}: {result.get('message', 'Success')}"
+        except Exception as e:
+            return f"Error modifying object: {str(e)}"
+    
+    @tool()
+    async def delete_rhino_object(ctx: Context, object_id: str) -> str:
+        """Delete a Rhino object"""
+        try:
+            result = await rhino_bridge.delete_object(object_id)
+            return f"Deleted object {object_id}: {result.get('message', 'Success')}"
+        except Exception as e:
+            return f"Error deleting object: {str(e)}"
+    
+    @tool()
+    async def select_rhino_objects(ctx: Context, filters: Dict[str, Any]) -> str:
+        """Select objects in Rhino based on filters"""
+        try:
+            result = await rhino_bridge.select_objects(filters)
+            return f"Selected objects: {result.get('count', 0)} objects"
+        except Exception as e:
+            return f"Error selecting objects: {str(e)}"
+    
+    @tool()
+    async def find_rhino_objects(
+        ctx: Context,
+        window: Optional[List[float]] = None,
+        crossing: Optional[List[float]] = None,
+        near: Optional[List[float]] = None,
+        count: int = 10,
+        layer: Optional[str] = None,
+        type: Optional[str] = None,
+        select: bool = False
+    ) -> str:
+        """
+        Find Rhino objects by region, proximity, layer and type without scripting
+        
+        Args:
+            window: Box [min_x, min_y, min_z, max_x, max_y, max_z]; objects entirely inside
+            crossing: Box [min_x, min_y, min_z, max_x, max_y, max_z]; objects inside or touching
+            near: Point [x, y, z]; the closest objects by bounding box
+            count: Number of objects to return with near
+            layer: Only objects on this layer
+            type: Only objects of this type (e.g. 'BOX', 'CURVE')
+            select: Select the matching objects in Rhino
+        
+        Returns:
+            Matching object ids as JSON
+        """
+        try:
+            object_ids = await rhino_bridge.find_objects(window, crossing, near, count, layer, type)
+            if select:
+                await rhino_bridge.select_object_ids(object_ids)
+            return dumps_text({"ids": object_ids, "count": len(object_ids), "selected": select})
+        except Exception as e:
+            return f"Error finding objects: {str(e)}"
+    
+    @tool()
+    async def execute_rhino_script(ctx: Context, script: str, timeout: Optional[float] = None) -> str:
+        """
+        Execute RhinoScript Python code in Rhino
+        
+        Args:
+            script: Python code to run
+            timeout: Seconds to wait for the script (default: the long-command deadline)
+        """
+        try:
+            result = await rhino_bridge.execute_script(script, timeout)
+            return f"Script executed: {result.get('message', 'Success')}"
+        except Exception as e:
+            return f"Error executing script: {str(e)}"
+    
+    @tool()
+    async def create_rhino_layer(ctx: Context, name: str, color: Optional[List[int]] = None) -> str:
+        """Create a new layer in Rhino"""
+        try:
+            result = await rhino_bridge.create_layer(name, color)
+            return f"Created layer '{name}': {result.get('message', 'Success')}"
+        except Exception as e:
+            return f"Error creating layer: {str(e)}"
+    
+    @tool()
+    async def get_rhino_current_layer(ctx: Context) -> str:
+        """Get current layer information in Rhino"""
+        try:
+            result = await rhino_bridge.get_current_layer()
+            return dumps_text(result)
+        except Exception as e:
+            return f"Error getting current layer: {str(e)}"
+    
+    @tool()
+    async def set_rhino_current_layer(ctx: Context, layer_name: str) -> str:
+        """Set current layer in Rhino"""
+        try:
+            result = await rhino_bridge.set_current_layer(layer_name)
+            return f"Set current layer to '{layer_name}': {result.get('message', 'Success')}"
+        except Exception as e:
+            return f"Error setting current layer: {str(e)}"
+    
+    @tool()
+    async def create_rhino_objects(ctx: Context, objects: List[Dict[str, Any]]) -> str:
+        """Create multiple objects in Rhino"""
+        try:
+            results = await rhino_bridge.create_objects(objects)
+            return _summarize_batch("Created", "objects", objects, results)
+        except Exception as e:
+            return f"Error creating objects: {str(e)}"
+    
+    @tool()
+    async def create_rhino_objects_columnar(
+        ctx: Context,
+        type: str,
+        positions: List[Any],
+        params: Dict[str, Any] = {},
+        colors: Optional[List[Any]] = None,
+        names: Optional[List[str]] = None,
+        return_ids: bool = False
+    ) -> str:
+        """
+        Create many objects of one type from columns instead of one dict per object
+        
+        Args:
+            type: Object type shared by every object (e.g. "POINT", "BOX", "SPHERE")
+            positions: [[x, y, z], ...] or a flat [x0, y0, z0, x1, ...] list of insertion points
+            params: Type-specific parameters; each value is a list with one entry
+                per object (e.g. {"radius": [1, 2, 3]}) or a single shared value
+            colors: Optional [[r, g, b], ...] per object
+            names: Optional name per object
+            return_ids: Include the ids of the created objects
+        
+        Returns:
+            Number of created objects and any errors
+        """
+        try:
+            result = await rhino_bridge.create_objects_columnar(type, positions, params, colors, names)
+            result_msg = f"Created {result['created']} of {result['count']} {type} objects"
+            if result["errors"]:
+                shown = "; ".join(result["errors"][:10])
+                more = len(result["errors"]) - 10
+                result_msg += f". Errors: {shown}" + (f" (and {more} more)" if more > 0 else "")
+            if return_ids:
+                result_msg += f". Ids: {dumps_text(result['ids'])}"
+            return result_msg
+        except Exception as e:
+            return f"Error creating objects: {str(e)}"
+
+    @tool()
+    async def create_rhino_mesh(
+        ctx: Context,
+        vertices: List[List[float]],
+        faces: List[List[int]],
+        normals: Optional[List[List[float]]] = None,
+        name: Optional[str] = None,
+        color: Optional[List[int]] = None
+    ) -> str:
+        """
+        Create a mesh from vertices and faces
+
+        Args:
+            vertices: [[x, y, z], ...] vertex positions
+            faces: [[a, b, c], ...] triangles and/or [[a, b, c, d], ...] quads of vertex indices
+            normals: Optional [[x, y, z], ...] per-vertex normals
+            name: Optional object name
+            color: Optional [r, g, b] color
+
+        Returns:
+            Result message with the created mesh information
+        """
+        try:
+            result = await rhino_bridge.create_mesh(vertices, faces, normals, name=name, color=color)
+            return f"Created mesh with {len(vertices)} vertices and {len(faces)} faces: {dumps_text(result)}"
+        except Exception as e:
+            return f"Error creating mesh: {str(e)}"
+
+    @tool()
+    async def modify_rhino_objects(ctx: Context, modifications: List[Dict[str, Any]]) -> str:
+        """
+        Modify multiple Rhino objects
+        
+        Args:
+            modifications: List of {"object_id": str, "params": dict} entries
+        
+        Returns:
+            Number of modified objects and any per-object errors
+        """
+        try:
+            results = await rhino_bridge.modify_objects(modifications)
+            return _summarize_batch("Modified", "objects", modifications, results)
+        except Exception as e:
+            return f"Error modifying objects: {str(e)}"
+    
+    @tool()
+    async def delete_rhino_objects(ctx: Context, object_ids: List[str]) -> str:
+        """Delete multiple Rhino objects"""
+        try:
+            results = await rhino_bridge.delete_objects(object_ids)
+            return _summarize_batch("Deleted", "objects", object_ids, results)
+        except Exception as e:
+            return f"Error deleting objects: {str(e)}"
+    
+    @tool()
+    async def get_rhino_objects_info(ctx: Context, object_ids: List[str]) -> str:
+        """Get information about multiple Rhino objects"""
+        try:
+            results = await rhino_bridge.get_objects_info(object_ids)
+            return dumps_text({
+                object_id: result.get("result") if result["status"] == "success" else {"error": result["message"]}
+                for object_id, result in zip(object_ids, results)
+            })
+        except Exception as e:
+            return f"Error getting objects info: {str(e)}"
+
+
+def _summarize_batch(verb: str, noun: str, items: List[Any], results: List[Dict[str, Any]]) -> str:
+    """Summarize per-item batch results as a tool message"""
+    errors = [
+        f"Object {item}: {result['message']}"
+        for item, result in zip(items, results)
+        if result["status"] == "error"
+    ]
+    
+    result_msg = f"{verb} {len(results) - len(errors)} {noun}"
+    if errors:
+        result_msg += f". Errors: {'; '.join(errors)}"
+    
+    return result_msg
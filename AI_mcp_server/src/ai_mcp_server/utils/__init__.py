@@ -0,0 +1,14 @@
+"""
+Shared utilities for AI MCP Server
+"""
+
+from .codec import dumps, dumps_text, loads
+from .fanout import FanOut, FanOutResult
+from .metrics import MetricsRegistry, metrics
+from .recording import SessionRecorder, recorder
+from .tracing import Tracer, tracer
+
+__all__ = [
+    "dumps", "dumps_text", "loads", "FanOut", "FanOutResult",
+    "MetricsRegistry", "metrics", "SessionRecorder", "recorder", "Tracer", "tracer",
+]
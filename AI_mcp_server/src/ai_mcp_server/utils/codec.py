@@ -0,0 +1,79 @@
+"""
+JSON codec shared by the bridge and tool layers
+"""
+
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+# Name of the encoder/decoder chosen at import time
+BACKEND = "orjson" if orjson is not None else "json"
+
+# NumPy arrays are serialized natively, without a list per array
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+# Tool results are compact unless pretty output is turned on
+_pretty = False
+
+
+def set_pretty(enabled: bool) -> None:
+    """Set the default layout of tool output"""
+    global _pretty
+    _pretty = enabled
+
+
+def _default(obj: Any) -> Any:
+    """Encode packed numeric buffers (NumPy arrays, array.array) as lists"""
+    if isinstance(obj, memoryview):
+        return obj.tolist()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode an object as compact UTF-8 JSON bytes
+
+    With ``sort_keys`` the output is canonical, for hashing.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # Values orjson rejects (e.g. integers over 64 bits) go through stdlib
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys,
+                      default=_default).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode JSON from bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps_text(obj: Any, pretty: Optional[bool] = None) -> str:
+    """Encode an object as JSON text for tool results
+
+    Output is compact by default to keep responses small; pass
+    ``pretty=True`` (or enable it with ``set_pretty``) for indented output.
+    """
+    if pretty is None:
+        pretty = _pretty
+    if not pretty:
+        return dumps(obj).decode("utf-8")
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_default)
@@ -0,0 +1,117 @@
+"""
+Concurrent fan-out of platform queries with a shared deadline
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class Section:
+    """Outcome of one fanned-out call"""
+    status: str  # "ok", "error" or "timeout"
+    value: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def timing(self) -> Dict[str, Any]:
+        """Status and duration for reporting"""
+        return {"status": self.status, "ms": round(self.elapsed_ms, 1)}
+
+
+@dataclass
+class FanOutResult:
+    """Sections of a fan-out, keyed by name"""
+    sections: Dict[str, Section] = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        """Whether any section failed or missed the deadline"""
+        return any(not section.ok for section in self.sections.values())
+
+    @property
+    def missing(self) -> List[str]:
+        """Names of sections without a value"""
+        return [name for name, section in self.sections.items() if not section.ok]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Values keyed by section, plus per-section timing
+
+        A section that failed holds ``{"error": ...}``; one that missed the
+        deadline holds ``{"timeout": true}``.
+        """
+        data: Dict[str, Any] = {}
+        for name, section in self.sections.items():
+            if section.ok:
+                data[name] = section.value
+            elif section.status == "timeout":
+                data[name] = {"timeout": True}
+            else:
+                data[name] = {"error": section.error}
+        data["timing"] = {name: section.timing() for name, section in self.sections.items()}
+        data["partial"] = self.partial
+        return data
+
+
+class FanOut:
+    """Run independent calls concurrently and return what finishes in time
+
+    Calls still running at the deadline are reported as timed out and
+    left to finish in the background, where their results are dropped;
+    cancelling them would cost a reconnect on connections without cancel
+    messages. When the caller itself is cancelled, every call still
+    running is cancelled with it, which the bridges turn into a cancel
+    message or a closed connection.
+    """
+
+    def __init__(self, deadline: float = 5.0, logger: Optional[logging.Logger] = None):
+        self.deadline = deadline
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def run(self, calls: Dict[str, Callable[[], Awaitable[Any]]],
+                  deadline: Optional[float] = None) -> FanOutResult:
+        """Start every call at once and wait at most ``deadline`` seconds"""
+        deadline = self.deadline if deadline is None else deadline
+        started = time.perf_counter()
+        finished: Dict[str, float] = {}
+
+        def stamp(name: str) -> Callable[[asyncio.Task], None]:
+            return lambda _: finished.setdefault(name, time.perf_counter())
+
+        tasks: Dict[str, asyncio.Task] = {}
+        for name, call in calls.items():
+            task = asyncio.ensure_future(call())
+            task.add_done_callback(stamp(name))
+            tasks[name] = task
+        if tasks:
+            try:
+                await asyncio.wait(tasks.values(), timeout=deadline)
+            except asyncio.CancelledError:
+                for task in tasks.values():
+                    task.cancel()
+                raise
+
+        result = FanOutResult()
+        for name, task in tasks.items():
+            elapsed = (finished.get(name, time.perf_counter()) - started) * 1000
+            if not task.done():
+                self.logger.warning(f"{name} did not answer within {deadline}s; returning partial results")
+                task.add_done_callback(self._discard)
+                result.sections[name] = Section("timeout", elapsed_ms=elapsed)
+            elif task.exception() is not None:
+                result.sections[name] = Section("error", error=str(task.exception()), elapsed_ms=elapsed)
+            else:
+                result.sections[name] = Section("ok", value=task.result(), elapsed_ms=elapsed)
+        return result
+
+    def _discard(self, task: asyncio.Task) -> None:
+        """Consume the outcome of a call that missed its deadline"""
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.debug(f"Late call failed: {task.exception()}")
@@ -0,0 +1,31 @@
+"""
+Deferred imports of optional heavy dependencies
+"""
+
+import importlib
+import sys
+from typing import Any, Optional, Set
+
+# Optional modules found not to be installed
+_missing: Set[str] = set()
+
+
+def optional_module(name: str) -> Optional[Any]:
+    """Import an optional module on first use; None if it is not installed"""
+    module = sys.modules.get(name)
+    if module is not None or name in _missing:
+        return module
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        _missing.add(name)
+        return None
+
+
+def loaded_module(name: str) -> Optional[Any]:
+    """A module only if something has already imported it
+
+    Lets type checks such as ``isinstance(value, numpy.ndarray)`` skip the
+    import: no value can be an instance of a module never imported.
+    """
+    return sys.modules.get(name)
@@ -0,0 +1,264 @@
+"""
+In-process metrics: latency histograms and counters with Prometheus export
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .recording import recorder
+from .tracing import tracer
+
+# Upper bounds in seconds: 50 microseconds to about five minutes, each
+# bucket sqrt(2) times wider than the one before
+BUCKETS: Tuple[float, ...] = tuple(50e-6 * 2 ** (i / 2) for i in range(46))
+PREFIX = "ai_mcp_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds
+
+    Percentiles are interpolated within a bucket, so they are accurate to
+    the bucket width (about 40%) and never beyond the observed maximum.
+    """
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Estimated ``q`` quantile (0 to 1)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKETS[index - 1] if index > 0 else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count and millisecond percentiles"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """Named histograms and counters, each split by labels
+
+    Metrics are created on first use; names follow Prometheus conventions
+    (``_seconds`` for histograms, ``_total`` for counters).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Add a duration to a histogram"""
+        series = self._histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add to a counter"""
+        series = self._counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0) + value
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        return self._histograms.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def reset(self) -> None:
+        """Drop every recorded value"""
+        self.started = time.time()
+        self._histograms.clear()
+        self._counters.clear()
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Any]:
+        """All metrics as plain data, optionally only names starting with ``prefix``"""
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "histograms": {
+                name: [dict(labels=dict(key), **histogram.summary()) for key, histogram in sorted(series.items())]
+                for name, series in sorted(self._histograms.items()) if name.startswith(prefix)
+            },
+            "counters": {
+                name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items()) if name.startswith(prefix)
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for name, series in sorted(self._histograms.items()):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            for key, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(key, le=f'{bound:.6g}')} {cumulative}")
+                lines.append(f"{PREFIX}{name}_bucket{_labels(key, le='+Inf')} {histogram.count}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(key)} {histogram.sum:.6f}")
+                lines.append(f"{PREFIX}{name}_count{_labels(key)} {histogram.count}")
+        for name, series in sorted(self._counters.items()):
+            lines.append(f"# TYPE {PREFIX}{name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{PREFIX}{name}{_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+# Process-wide registry shared by the tool, bridge and socket layers
+metrics = MetricsRegistry()
+
+
+def timed_tool(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Wrap a tool function to record its latency and errors, in a trace span
+    and in the session recording when one is running
+
+    Tools report failures by returning an ``"Error ..."`` message, so
+    those count as errors along with raised exceptions.
+    """
+    labels = {"tool": fn.__name__}
+    span_name = f"tool {fn.__name__}"
+    defaults = {
+        name: parameter.default for name, parameter in inspect.signature(fn).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        arguments: Dict[str, Any] = {}
+        if recorder.enabled:
+            # Only what the client passed: the MCP context is per request and
+            # FastMCP fills in defaults a replay would have to validate again
+            arguments = {
+                key: value for key, value in kwargs.items()
+                if key != "ctx" and not (key in defaults and value == defaults[key])
+            }
+        with tracer.span(span_name, **labels) as span, recorder.call("tool", fn.__name__, arguments) as call:
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception:
+                metrics.inc("tool_errors_total", **labels)
+                raise
+            finally:
+                metrics.observe("tool_seconds", time.perf_counter() - started, **labels)
+            if call is not None:
+                call.response = result
+            if isinstance(result, str) and result.startswith("Error"):
+                metrics.inc("tool_errors_total", **labels)
+                if span is not None:
+                    span.error = result
+                if call is not None:
+                    call.error = result
+        return result
+
+    return wrapper
+
+
+def metered_tool(server: Any) -> Callable[..., Callable]:
+    """``server.tool`` that times every tool it registers"""
+    def tool(*args: Any, **kwargs: Any) -> Callable:
+        register = server.tool(*args, **kwargs)
+        return lambda fn: register(timed_tool(fn))
+    return tool
+
+
+async def serve_prometheus(host: str, port: int, registry: Optional[MetricsRegistry] = None,
+                           logger: Optional[logging.Logger] = None) -> asyncio.AbstractServer:
+    """Serve the registry in Prometheus text format over plain HTTP"""
+    registry = registry or metrics
+    logger = logger or logging.getLogger(__name__)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Skip the request headers
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass
+            path = request.split()[1].decode("ascii", "replace") if len(request.split()) > 1 else "/"
+            if path.split("?")[0] in ("/", "/metrics"):
+                status, body = "200 OK", registry.to_prometheus().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def write_prometheus(path: Path, registry: Optional[MetricsRegistry] = None) -> None:
+    """Write the registry in Prometheus text format, replacing the file atomically"""
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_text((registry or metrics).to_prometheus(), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+async def export_loop(path: Path, interval: float, registry: Optional[MetricsRegistry] = None,
+                      logger: Optional[logging.Logger] = None) -> None:
+    """Rewrite the Prometheus text file every ``interval`` seconds"""
+    logger = logger or logging.getLogger(__name__)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            write_prometheus(path, registry)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {path}: {e}")
@@ -0,0 +1,212 @@
+"""
+Session recording of tool calls and bridge commands for replay
+"""
+
+import asyncio
+import gzip
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import codec
+
+RECORDING_FORMAT = 1
+LAYERS = ("tool", "bridge")
+
+
+class RecordedCall:
+    """One tool call or bridge command while it runs and until it is written"""
+
+    __slots__ = ("seq", "parent", "layer", "platform", "name", "params",
+                 "offset", "duration", "response", "error")
+
+    def __init__(self, seq: int, parent: Optional[int], layer: str, platform: Optional[str],
+                 name: str, params: Dict[str, Any], offset: float):
+        self.seq = seq
+        self.parent = parent
+        self.layer = layer
+        self.platform = platform
+        self.name = name
+        self.params = params
+        self.offset = offset
+        self.duration = 0.0
+        self.response: Any = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record as written, with the response reduced to its encoded size"""
+        if self.response is None:
+            size = 0
+        elif isinstance(self.response, str):
+            size = len(self.response.encode("utf-8"))
+        else:
+            size = len(codec.dumps(self.response))
+        record = {
+            "seq": self.seq,
+            "parent": self.parent,
+            "layer": self.layer,
+            "name": self.name,
+            "t": round(self.offset, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "response_bytes": size,
+            "status": "error" if self.error else "success",
+            "params": self.params,
+        }
+        if self.platform:
+            record["platform"] = self.platform
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+# Sequence number of the recorded call the running task is inside, so
+# bridge commands name the tool call that issued them
+_parent: ContextVar[Optional[int]] = ContextVar("ai_mcp_recorded_call", default=None)
+
+
+class _CallScope:
+    """Context manager that times a recorded call and queues it when done"""
+
+    __slots__ = ("_recorder", "_call", "_started", "_token")
+
+    def __init__(self, recorder: "SessionRecorder", call: RecordedCall):
+        self._recorder = recorder
+        self._call = call
+        self._started = 0.0
+        self._token = None
+
+    def __enter__(self) -> RecordedCall:
+        self._started = time.perf_counter()
+        self._token = _parent.set(self._call.seq)
+        return self._call
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _parent.reset(self._token)
+        self._call.duration = time.perf_counter() - self._started
+        if exc is not None:
+            self._call.error = str(exc) or exc_type.__name__
+        self._recorder.finish(self._call)
+
+
+class _NoCall:
+    """Stand-in returned while recording is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NO_CALL = _NoCall()
+
+
+class SessionRecorder:
+    """Records tool calls and bridge commands to a JSONL file for replay
+
+    Each record holds the call's name, parameters, start offset from the
+    beginning of the recording, duration, response size and outcome.
+    Bridge commands carry the ``seq`` of the tool call that issued them as
+    ``parent``. A file ending in ``.gz`` is gzip-compressed; each
+    recording session appends a ``{"session": ...}`` header line.
+
+    Responses are kept by reference and only encoded, to measure their
+    size, when ``flush`` writes them off the event loop.
+    """
+
+    def __init__(self, max_pending: int = 100000):
+        self.path: Optional[Path] = None
+        self.layers: frozenset = frozenset()
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: List[Any] = []
+        self._seq = itertools.count(1)
+        self._started = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and bool(self.layers)
+
+    def configure(self, path: Optional[Path], layers: Any = LAYERS) -> None:
+        """Start a recording session into ``path``, or stop recording with None"""
+        unknown = set(layers) - set(LAYERS)
+        if unknown:
+            raise ValueError(f"Unknown recording layers: {', '.join(sorted(unknown))}")
+        self.path = Path(path).expanduser() if path else None
+        self.layers = frozenset(layers) if path else frozenset()
+        self._seq = itertools.count(1)
+        self._started = time.perf_counter()
+        if self.path is not None:
+            self._pending.append({
+                "session": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "format": RECORDING_FORMAT,
+                "layers": sorted(self.layers),
+            })
+
+    def call(self, layer: str, name: str, params: Optional[Dict[str, Any]] = None,
+             platform: Optional[str] = None) -> Any:
+        """Context manager recording one call of ``layer``
+
+        Yields the ``RecordedCall``, whose ``response`` the caller sets, or
+        None when the layer is not recorded.
+        """
+        if layer not in self.layers:
+            return _NO_CALL
+        call = RecordedCall(next(self._seq), _parent.get(), layer, platform, name,
+                            params if params is not None else {}, time.perf_counter() - self._started)
+        return _CallScope(self, call)
+
+    def finish(self, call: RecordedCall) -> None:
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(call)
+
+    async def flush(self) -> None:
+        """Write the calls finished since the last flush"""
+        if not self._pending or self.path is None:
+            return
+        entries, self._pending = self._pending, []
+        await asyncio.to_thread(self._write, self.path, entries)
+
+    @staticmethod
+    def _write(path: Path, entries: List[Any]) -> None:
+        lines = b"".join(
+            codec.dumps(entry.to_dict() if isinstance(entry, RecordedCall) else entry) + b"\n"
+            for entry in entries
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Appending to a gzip file adds a member; readers see one stream
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "ab") as file:
+            file.write(lines)
+
+    async def flush_loop(self, interval: float, logger: Optional[logging.Logger] = None) -> None:
+        """Flush every ``interval`` seconds"""
+        logger = logger or logging.getLogger(__name__)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Could not write the session recording: {e}")
+
+
+def read_recording(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records of a recording file in order, session headers included"""
+    path = Path(path).expanduser()
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as file:
+        for line in file:
+            if line.strip():
+                yield codec.loads(line)
+
+
+# Process-wide recorder; off until the server configures a file
+recorder = SessionRecorder()
@@ -0,0 +1,275 @@
+"""
+Lightweight tracing spans with JSONL and OTLP export
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import random
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Coroutine, Dict, List, Optional
+
+from . import codec
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes to the span"""
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header naming this span as the parent"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# Innermost open span of the running task; None outside traces and in
+# traces that were not sampled
+_current: ContextVar[Optional[Span]] = ContextVar("ai_mcp_span", default=None)
+# Set inside a trace that was not sampled, so its children are skipped too
+_unsampled: ContextVar[bool] = ContextVar("ai_mcp_unsampled", default=False)
+
+
+def background_task(coroutine: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Start a task outside the caller's trace
+
+    Tasks copy the context they are created in, so a long-lived loop
+    started inside a span would keep adding spans to a trace that has
+    already ended.
+    """
+    return contextvars.Context().run(asyncio.create_task, coroutine)
+
+
+class _SpanScope:
+    """Context manager that opens a span and makes it current"""
+
+    __slots__ = ("_tracer", "_span", "_token", "_skip_token")
+
+    def __init__(self, tracer: "Tracer", span: Optional[Span]):
+        self._tracer = tracer
+        self._span = span
+        self._token = None
+        self._skip_token = None
+
+    def __enter__(self) -> Optional[Span]:
+        if self._span is None:
+            self._skip_token = _unsampled.set(True)
+        else:
+            self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._span is None:
+            _unsampled.reset(self._skip_token)
+            return
+        _current.reset(self._token)
+        if exc is not None:
+            self._span.error = str(exc) or exc_type.__name__
+        self._tracer.finish(self._span)
+
+
+class _NoSpan:
+    """Stand-in returned while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Creates spans, samples traces and batches finished spans for export
+
+    The sampling decision is made once per trace, when its root span
+    opens; child spans follow it. Finished spans are exported in batches
+    by ``flush``, which the server calls periodically and at shutdown.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional["SpanExporter"] = None,
+                 max_pending: int = 10000):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: List[Span] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 and self.exporter is not None
+
+    def configure(self, sample_rate: float, exporter: Optional["SpanExporter"]) -> None:
+        """Set the sampling rate (0 to 1) and where spans go"""
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Context manager for a span, a child of the current one if any
+
+        Yields the ``Span``, or None when the trace is not recorded.
+        """
+        if not self.enabled or _unsampled.get():
+            return _NO_SPAN
+        parent = _current.get()
+        if parent is None:
+            if random.random() >= self.sample_rate:
+                return _SpanScope(self, None)
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        span = Span(name, trace_id, f"{random.getrandbits(64):016x}", parent_id,
+                    time.time_ns(), attributes=attributes)
+        return _SpanScope(self, span)
+
+    def record(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """Add an already finished child of the current span"""
+        parent = _current.get()
+        if parent is None or not self.enabled:
+            return
+        span = Span(name, parent.trace_id, f"{random.getrandbits(64):016x}", parent.span_id,
+                    start_ns, end_ns, attributes)
+        self._pending.append(span)
+
+    def current(self) -> Optional[Span]:
+        """The innermost recorded span of the running task"""
+        return _current.get()
+
+    def finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(span)
+
+    async def flush(self) -> None:
+        """Export the spans finished since the last flush"""
+        if not self._pending or self.exporter is None:
+            return
+        spans, self._pending = self._pending, []
+        await asyncio.to_thread(self.exporter.export, spans)
+
+    async def flush_loop(self, interval: float, logger: Optional[logging.Logger] = None) -> None:
+        """Flush every ``interval`` seconds"""
+        logger = logger or logging.getLogger(__name__)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Could not export traces: {e}")
+
+
+class SpanExporter(ABC):
+    """Destination of finished spans"""
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Send a batch of finished spans"""
+        pass
+
+
+class JsonlExporter(SpanExporter):
+    """Append spans to a file, one JSON object per line"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path).expanduser()
+
+    def export(self, spans: List[Span]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as file:
+            for span in spans:
+                file.write(codec.dumps(span.to_dict()) + b"\n")
+
+
+class OtlpExporter(SpanExporter):
+    """Post spans to an OTLP/HTTP collector using the JSON encoding"""
+
+    def __init__(self, endpoint: str, service_name: str = "ai-mcp-server", timeout: float = 5.0):
+        endpoint = endpoint.rstrip("/")
+        self.endpoint = endpoint if endpoint.endswith("/v1/traces") else endpoint + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        body = json.dumps(self.encode(spans)).encode()
+        request = urllib.request.Request(
+            self.endpoint, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def encode(self, spans: List[Span]) -> Dict[str, Any]:
+        """OTLP ``ExportTraceServiceRequest`` as JSON"""
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "ai_mcp_server"},
+                "spans": [self._encode_span(span) for span in spans],
+            }],
+        }]}
+
+    @staticmethod
+    def _encode_span(span: Span) -> Dict[str, Any]:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# Process-wide tracer; off until the server configures an exporter
+tracer = Tracer()
@@ -1,8 +1,8 @@
-@echo off
-echo Starting AI MCP Server...
-echo.
-echo Server will start with stdio transport for MCP client integration.
-echo Press Ctrl+C to stop the server.
-echo.
-python run_server.py
-pause
+@echo off
+echo Starting AI MCP Server...
+echo.
+echo Server will start with stdio transport for MCP client integration.
+echo Press Ctrl+C to stop the server.
+echo.
+python run_server.py
+pause
@@ -0,0 +1,5 @@
+"""
+Shared fixtures: simulated Rhino and Grasshopper plugins
+"""
+
+pytest_plugins = ["ai_mcp_server.simulator.pytest_plugin"]
@@ -0,0 +1,60 @@
+"""
+Batch envelope and columnar fallbacks against the simulated Rhino plugin
+"""
+
+import asyncio
+
+import pytest
+
+BOX = {"type": "BOX", "params": {"width": 1, "length": 1, "height": 1}}
+
+
+@pytest.mark.simulator(command_latency={"batch": 1.0})
+@pytest.mark.bridge(deadlines={"create_object": 0.5})
+async def test_batch_timeout_is_not_resent(rhino_bridge, rhino_simulator):
+    results = await rhino_bridge.create_objects([BOX] * 3)
+    assert [result["status"] for result in results] == ["error"] * 3
+
+    # The plugin ran the envelope after all; nothing was sent again
+    await asyncio.sleep(1.0)
+    assert len(rhino_simulator.objects) == 3
+    assert rhino_simulator.commands["create_object"] == 0
+
+    # Batching is still on once the plugin answers in time
+    rhino_simulator.options.command_latency = {}
+    results = await rhino_bridge.create_objects([BOX] * 3)
+    assert [result["status"] for result in results] == ["success"] * 3
+    assert rhino_simulator.commands["batch"] == 2
+    assert len(rhino_simulator.objects) == 6
+
+
+@pytest.mark.simulator(batching=False)
+@pytest.mark.bridge(max_frame_size=200)
+async def test_rejected_batch_falls_back_to_single_commands(rhino_bridge, rhino_simulator):
+    results = await rhino_bridge.create_objects([BOX] * 5)
+    assert [result["status"] for result in results] == ["success"] * 5
+    assert rhino_simulator.commands["batch"] == 1
+    assert rhino_simulator.commands["create_object"] == 5
+    assert len(rhino_simulator.objects) == 5
+
+
+@pytest.mark.simulator(command_latency={"create_objects_columnar": 1.0})
+@pytest.mark.bridge(deadlines={"create_objects_columnar": 0.5})
+async def test_columnar_timeout_is_not_resent(rhino_bridge, rhino_simulator):
+    result = await rhino_bridge.create_objects_columnar("POINT", [[0, 0, 0], [1, 1, 1]])
+    assert result["created"] == 0
+    assert len(result["errors"]) == 1
+
+    await asyncio.sleep(1.0)
+    assert len(rhino_simulator.objects) == 2
+    assert rhino_simulator.commands["batch"] == 0
+    assert rhino_simulator.commands["create_object"] == 0
+
+
+@pytest.mark.simulator(columnar=False)
+async def test_rejected_columnar_falls_back_to_batches(rhino_bridge, rhino_simulator):
+    result = await rhino_bridge.create_objects_columnar("POINT", [[0, 0, 0], [1, 1, 1]])
+    assert result["created"] == 2
+    assert not result["errors"]
+    assert rhino_simulator.commands["create_objects_columnar"] == 1
+    assert len(rhino_simulator.objects) == 2
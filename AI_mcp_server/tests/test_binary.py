@@ -0,0 +1,80 @@
+"""
+Binary mesh buffers, on their own and over the simulated Rhino plugin
+"""
+
+import asyncio
+
+import pytest
+
+from ai_mcp_server.bridges.binary import decode_binary, encode_binary, has_buffers, is_buffer, pack_rows
+from ai_mcp_server.bridges.framing import FrameReader, encode_binary_frame
+
+VERTICES = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 1]]
+FACES = [[0, 1, 2, 3], [0, 1, 4]]
+
+
+def test_faces_mixing_triangles_and_quads_pack_four_wide():
+    faces = pack_rows(FACES, None, "int32")
+    assert faces.tolist() == [[0, 1, 2, 3], [0, 1, 4, 4]]
+    assert pack_rows([[0, 1, 2]], None, "int32").tolist() == [[0, 1, 2]]
+    with pytest.raises(ValueError):
+        pack_rows([[0, 1]], 3, "float32")
+
+
+def test_buffers_round_trip_aligned():
+    message = {
+        "type": "create_object",
+        "params": {
+            "vertices": pack_rows(VERTICES, 3, "float32"),
+            "faces": pack_rows(FACES, None, "int32"),
+            "name": "mesh",
+        },
+    }
+    parts = encode_binary(message)
+    # Header and each buffer start on 8-byte boundaries
+    assert len(parts[0]) % 8 == 0
+    assert sum(len(part) for part in parts) % 8 == 0
+
+    decoded = decode_binary(bytearray(b"".join(bytes(part) for part in parts)))
+    params = decoded["params"]
+    assert params["name"] == "mesh"
+    assert params["vertices"].tolist() == VERTICES
+    assert params["faces"].tolist() == [[0, 1, 2, 3], [0, 1, 4, 4]]
+    assert is_buffer(params["vertices"])
+    assert "buffers" not in decoded
+
+
+async def test_binary_frame_round_trip():
+    frame = b"".join(bytes(part) for part in encode_binary_frame(
+        {"vertices": pack_rows(VERTICES, 3, "float64")}
+    ))
+    reader = asyncio.StreamReader()
+    reader.feed_data(frame + b'{"status":"success"}\n')
+    reader.feed_eof()
+    frames = FrameReader(reader)
+    assert (await frames.read_message())["vertices"].tolist() == VERTICES
+    assert await frames.read_message() == {"status": "success"}
+
+
+@pytest.mark.bridge(binary_frames=True)
+async def test_mesh_buffers_travel_as_binary_frames(rhino_bridge, rhino_simulator):
+    created = await rhino_bridge.create_mesh(VERTICES, FACES)
+    info = await rhino_bridge.get_object_info(created["id"])
+    assert has_buffers(info)
+    assert info["vertices"].tolist() == VERTICES
+    assert info["faces"].tolist() == [[0, 1, 2, 3], [0, 1, 4, 4]]
+    assert rhino_bridge.transfer_stats.binary_frames == 2
+
+    # Replies holding buffers are not cached
+    await rhino_bridge.get_object_info(created["id"])
+    assert rhino_simulator.commands["get_object_info"] == 2
+
+
+@pytest.mark.simulator(binary=False)
+@pytest.mark.bridge(binary_frames=True)
+async def test_declined_binary_frames_send_json_lists(rhino_bridge, rhino_simulator):
+    created = await rhino_bridge.create_mesh(VERTICES, FACES)
+    info = await rhino_bridge.get_object_info(created["id"])
+    assert info["vertices"] == VERTICES
+    assert info["faces"] == [[0, 1, 2, 3], [0, 1, 4, 4]]
+    assert rhino_bridge.transfer_stats.binary_frames == 0
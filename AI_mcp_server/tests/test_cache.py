@@ -0,0 +1,110 @@
+"""
+Response cache and its invalidation by document changes
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from ai_mcp_server.bridges.cache import ResponseCache
+
+
+def test_hits_decode_fresh_copies():
+    cache = ResponseCache(1024)
+    key = cache.key("get_component_info", {"componentId": "a"})
+    cache.put(key, {"inputs": []}, ttl=10.0)
+    cache.get(key)["inputs"].append("changed")
+    assert cache.get(key) == {"inputs": []}
+    assert cache.stats.hits == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(1024)
+    key = cache.key("search_components", {"query": "circle"})
+    cache.put(key, [1], ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get(key) is None
+    assert cache.stats.expirations == 1
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = ResponseCache(30)
+    first, second, third = (cache.key("q", {"n": n}) for n in range(3))
+    cache.put(first, "x" * 10, ttl=10.0)
+    cache.put(second, "y" * 10, ttl=10.0)
+    cache.get(first)
+    cache.put(third, "z" * 10, ttl=10.0)
+    assert cache.get(second) is None
+    assert cache.get(first) == "x" * 10
+    assert cache.stats.evictions == 1
+
+
+def test_invalidation_keeps_other_objects_and_document_independent_entries():
+    cache = ResponseCache(1024)
+    keys = {name: cache.key("q", {"name": name}) for name in ("a", "b", "doc", "library")}
+    cache.put(keys["a"], 1, ttl=10.0, object_id="a")
+    cache.put(keys["b"], 2, ttl=10.0, object_id="b")
+    cache.put(keys["doc"], 3, ttl=10.0)
+    cache.put(keys["library"], 4, ttl=10.0, document=False)
+
+    cache.invalidate({"a"})
+    assert cache.get(keys["a"]) is None
+    assert cache.get(keys["doc"]) is None
+    assert cache.get(keys["b"]) == 2
+    assert cache.get(keys["library"]) == 4
+
+    cache.invalidate()
+    assert cache.get(keys["b"]) is None
+    assert cache.get(keys["library"]) == 4
+
+
+def test_reply_from_before_an_invalidation_is_not_stored():
+    cache = ResponseCache(1024)
+    key = cache.key("q", {})
+    generation = cache.generation
+    cache.invalidate()
+    cache.put(key, 1, ttl=10.0, generation=generation)
+    assert cache.get(key) is None
+
+
+async def test_component_info_is_served_from_cache(grasshopper_bridge, grasshopper_simulator):
+    component = await grasshopper_bridge.add_component("Circle", 0, 0)
+    for _ in range(3):
+        await grasshopper_bridge.get_component_info(component["id"])
+    assert grasshopper_simulator.commands["get_component_info"] == 1
+    assert grasshopper_bridge.cache_stats.hits == 2
+
+
+async def test_connecting_invalidates_both_ends(grasshopper_bridge, grasshopper_simulator):
+    slider = await grasshopper_bridge.add_component("Number Slider", 0, 0)
+    circle = await grasshopper_bridge.add_component("Circle", 100, 0)
+    assert not (await grasshopper_bridge.get_component_info(slider["id"]))["connections"]
+    assert not (await grasshopper_bridge.get_component_info(circle["id"]))["connections"]
+
+    await grasshopper_bridge.connect_components(slider["id"], circle["id"], target_param="Radius")
+    assert (await grasshopper_bridge.get_component_info(slider["id"]))["connections"]
+    assert (await grasshopper_bridge.get_component_info(circle["id"]))["connections"]
+
+
+async def test_delete_invalidates_connected_components(grasshopper_bridge, grasshopper_simulator):
+    slider = await grasshopper_bridge.add_component("Number Slider", 0, 0)
+    circle = await grasshopper_bridge.add_component("Circle", 100, 0)
+    await grasshopper_bridge.connect_components(slider["id"], circle["id"], target_param="Radius")
+    assert (await grasshopper_bridge.get_component_info(circle["id"]))["connections"]
+
+    await grasshopper_bridge.delete_component(slider["id"])
+    assert not (await grasshopper_bridge.get_component_info(circle["id"]))["connections"]
+
+
+@pytest.mark.simulator(command_latency={"get_component_info": 0.2})
+@pytest.mark.bridge(pool_size=2)
+async def test_query_in_flight_during_a_change_is_not_cached(grasshopper_bridge, grasshopper_simulator):
+    slider = await grasshopper_bridge.add_component("Number Slider", 0, 0)
+    circle = await grasshopper_bridge.add_component("Circle", 100, 0)
+    query = asyncio.create_task(grasshopper_bridge.get_component_info(circle["id"]))
+    await asyncio.sleep(0.05)
+    await grasshopper_bridge.connect_components(slider["id"], circle["id"], target_param="Radius")
+    await query
+    assert (await grasshopper_bridge.get_component_info(circle["id"]))["connections"]
+    assert grasshopper_simulator.commands["get_component_info"] == 2
@@ -0,0 +1,45 @@
+"""
+Component catalog sync against plugins with and without the catalog command
+"""
+
+import pytest
+
+from ai_mcp_server.local.catalog import ComponentCatalog
+
+
+@pytest.mark.simulator(catalog=False, error_rate=1.0, fault_commands={"search_components"})
+async def test_failed_catalog_sync_is_not_retried_per_search(grasshopper_bridge, grasshopper_simulator):
+    for _ in range(3):
+        with pytest.raises(Exception):
+            await grasshopper_bridge.find_components("circle")
+    assert grasshopper_simulator.commands["get_component_catalog"] == 1
+    assert grasshopper_simulator.commands["search_components"] == 1
+    assert grasshopper_bridge.catalog_supported is False
+
+
+@pytest.mark.simulator(catalog=False)
+async def test_catalog_built_from_listing_without_catalog_command(grasshopper_bridge, grasshopper_simulator):
+    assert await grasshopper_bridge.find_components("circle")
+    assert await grasshopper_bridge.find_components("slider")
+    assert grasshopper_simulator.commands["get_component_catalog"] == 1
+    assert grasshopper_simulator.commands["search_components"] == 1
+
+
+async def test_signature_has_the_same_shape_on_hit_and_miss(grasshopper_bridge, grasshopper_simulator):
+    hit = await grasshopper_bridge.get_component_signature("Circle")
+    assert set(hit) == {"inputs", "outputs"}
+
+    del grasshopper_bridge.catalog.get("Circle")["signature"]
+    miss = await grasshopper_bridge.get_component_signature("Circle")
+    assert miss == hit
+    assert grasshopper_simulator.commands["get_component_parameters"] == 1
+    assert await grasshopper_bridge.get_component_signature("Circle") == hit
+
+
+def test_signature_of_unknown_component_is_searchable(tmp_path):
+    catalog = ComponentCatalog(tmp_path / "catalog.json")
+    catalog.replace([{"name": "Circle", "nickname": "Cir", "category": "Curve"}])
+    catalog.set_signature("Voronoi Cells", {"inputs": [], "outputs": []})
+    assert catalog.search("voronoi")[0]["name"] == "Voronoi Cells"
+    assert catalog.search("circle")[0]["name"] == "Circle"
+    assert catalog.signature("voronoi cells") == {"inputs": [], "outputs": []}
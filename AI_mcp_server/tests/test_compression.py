@@ -0,0 +1,56 @@
+"""
+zlib frame compression, negotiated with the simulated Rhino plugin
+"""
+
+import asyncio
+
+import pytest
+
+from ai_mcp_server.bridges.framing import FrameReader, encode_frame
+from ai_mcp_server.utils import codec
+
+
+async def read_frame(frame: bytes):
+    reader = asyncio.StreamReader()
+    reader.feed_data(frame)
+    reader.feed_eof()
+    return await FrameReader(reader).read_message()
+
+
+async def test_large_frames_are_compressed_above_threshold():
+    payload = codec.dumps({"objects": [{"id": i, "name": "box"} for i in range(200)]})
+    frame = encode_frame(payload, compress_threshold=1024)
+    assert frame.startswith(b"#z")
+    assert len(frame) < len(payload)
+    assert await read_frame(frame) == codec.loads(payload)
+
+
+def test_small_or_incompressible_frames_stay_delimited():
+    assert encode_frame(b'{"a":1}', compress_threshold=1024) == b'{"a":1}\n'
+    assert encode_frame(b'{"a":1}') == b'{"a":1}\n'
+
+
+@pytest.mark.simulator(objects=200, object_padding=100)
+@pytest.mark.bridge(compression=True, compression_threshold=1024)
+async def test_negotiated_compression_shrinks_both_directions(rhino_bridge, rhino_simulator):
+    info = await rhino_bridge.send_command("get_document_info", {})
+    assert len(info["objects"]) == 200
+    await rhino_bridge.send_command("execute_rhinoscript_python_code", {"script": "x = 1\n" * 1000})
+    assert rhino_simulator.scripts[-1] == "x = 1\n" * 1000
+
+    stats = rhino_bridge.transfer_stats
+    assert stats.compressed_frames >= 2
+    assert stats.wire_bytes_in < stats.raw_bytes_in
+    assert stats.wire_bytes_out < stats.raw_bytes_out
+
+
+@pytest.mark.simulator(objects=200, object_padding=100, compression=False)
+@pytest.mark.bridge(compression=True, compression_threshold=1024)
+async def test_declined_compression_sends_plain_frames(rhino_bridge, rhino_simulator):
+    info = await rhino_bridge.send_command("get_document_info", {})
+    assert len(info["objects"]) == 200
+    await rhino_bridge.send_command("execute_rhinoscript_python_code", {"script": "x = 1\n" * 1000})
+
+    stats = rhino_bridge.transfer_stats
+    assert stats.compressed_frames == 0
+    assert stats.bytes_saved == 0
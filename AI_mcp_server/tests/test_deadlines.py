@@ -0,0 +1,44 @@
+"""
+Command deadlines and cancellation against the simulated Rhino plugin
+"""
+
+import asyncio
+import time
+
+import pytest
+
+
+@pytest.mark.simulator(command_latency={"execute_rhinoscript_python_code": 3.0})
+async def test_queue_wait_counts_against_the_deadline(rhino_bridge):
+    script = asyncio.create_task(rhino_bridge.send_command("execute_rhinoscript_python_code", {"script": "x = 1"}))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        await rhino_bridge.send_command("get_document_info", {}, timeout=0.5)
+    assert time.perf_counter() - started < 0.8
+    script.cancel()
+
+
+@pytest.mark.simulator(command_latency={"execute_rhinoscript_python_code": 0.4, "get_document_info": 0.4})
+async def test_reply_gets_what_the_queue_left(rhino_bridge):
+    script = asyncio.create_task(rhino_bridge.send_command("execute_rhinoscript_python_code", {"script": "x = 1"}))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    # Answered 0.75s from now, had the reply been given the whole 0.6s
+    with pytest.raises(asyncio.TimeoutError):
+        await rhino_bridge.send_command("get_document_info", {}, timeout=0.6)
+    assert time.perf_counter() - started < 0.7
+    await script
+
+
+@pytest.mark.simulator(hang_rate=1.0, fault_commands={"create_object"}, cancel_replies=True,
+                       command_latency={"get_document_hash": 0.3})
+@pytest.mark.bridge(pipelining=True)
+async def test_answered_cancel_is_not_taken_for_a_reply(rhino_bridge, rhino_simulator):
+    pending = asyncio.create_task(rhino_bridge.send_command("get_document_hash", {}))
+    with pytest.raises(asyncio.TimeoutError):
+        await rhino_bridge.send_command("create_object", {"type": "BOX"}, timeout=0.1)
+
+    assert "hash" in await pending
+    assert rhino_simulator.cancelled == 1
+    assert rhino_bridge._pool._connections[0].multiplexed is True
@@ -0,0 +1,37 @@
+"""
+Cross-platform fan-out deadlines and cancellation
+"""
+
+import asyncio
+
+from ai_mcp_server.utils.fanout import FanOut
+
+
+async def test_partial_results_at_deadline():
+    async def fast():
+        return 1
+
+    async def slow():
+        await asyncio.sleep(1.0)
+
+    result = await FanOut().run({"fast": fast, "slow": slow}, deadline=0.05)
+    assert result.sections["fast"].value == 1
+    assert result.missing == ["slow"]
+
+
+async def test_cancelling_caller_cancels_calls():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5.0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    task = asyncio.create_task(FanOut(deadline=10.0).run({"a": slow, "b": slow}))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert cancelled == [True, True]
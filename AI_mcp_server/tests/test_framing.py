@@ -0,0 +1,40 @@
+"""
+Frame splitting of replies from plugins that may not delimit them
+"""
+
+import asyncio
+
+import pytest
+
+from ai_mcp_server.bridges.framing import FrameReader
+
+
+async def read_all(data: bytes, chunk_size: int = 7) -> list:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    frames = FrameReader(reader, chunk_size=chunk_size)
+    messages = []
+    with pytest.raises(ConnectionError):
+        while True:
+            messages.append(await asyncio.wait_for(frames.read_message(), 1.0))
+    return messages
+
+
+async def test_brace_inside_string_in_first_frame():
+    data = b'{"status":"success","result":{"output":"def f(): {"}}\n{"status":"success"}\n'
+    messages = await read_all(data)
+    assert messages == [
+        {"status": "success", "result": {"output": "def f(): {"}},
+        {"status": "success"},
+    ]
+
+
+async def test_escaped_quotes_and_braces_in_first_frame():
+    data = b'{"a":"x\\\\"}\n{"b":"\\"{\\"}"}\n'
+    assert await read_all(data) == [{"a": "x\\"}, {"b": '"{"}'}]
+
+
+async def test_undelimited_pretty_printed_reply():
+    data = b'{\n  "output": "}}\\"",\n  "result": {}\n}'
+    assert await read_all(data) == [{"output": '}}"', "result": {}}]
@@ -0,0 +1,122 @@
+"""
+Latency histograms, percentiles and Prometheus export
+"""
+
+import asyncio
+import random
+
+from ai_mcp_server.utils.metrics import BUCKETS, Histogram, MetricsRegistry, metrics, serve_prometheus, timed_tool
+from ai_mcp_server.utils.metrics import write_prometheus
+
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, int(q * len(ordered) + 0.5) - 1)]
+
+
+def test_percentiles_within_a_bucket_of_exact():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(-5, 1.5) for _ in range(10000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+    for q in (0.5, 0.95, 0.99):
+        exact = exact_percentile(values, q)
+        assert exact / 1.5 <= histogram.percentile(q) <= exact * 1.5
+    assert histogram.percentile(1.0) <= max(values) == histogram.max
+    assert histogram.count == len(values)
+
+
+def test_percentiles_never_exceed_the_maximum():
+    histogram = Histogram()
+    for _ in range(10):
+        histogram.observe(0.101)
+    assert histogram.percentile(0.99) <= 0.101
+    histogram.observe(1e6)
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(1.0) == 1e6
+    assert Histogram().percentile(0.5) == 0.0
+    assert Histogram().summary()["mean_ms"] == 0.0
+
+
+def test_prometheus_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    for seconds in (0.001, 0.002, 0.5, 1000.0):
+        registry.observe("tool_seconds", seconds, tool="get_status")
+    registry.inc("tool_errors_total", tool="get_status")
+    registry.inc("tool_errors_total", 2, tool="get_status")
+    text = registry.to_prometheus()
+
+    lines = text.splitlines()
+    assert "# TYPE ai_mcp_tool_seconds histogram" in lines
+    assert "# TYPE ai_mcp_tool_errors_total counter" in lines
+    buckets = [line for line in lines if line.startswith("ai_mcp_tool_seconds_bucket")]
+    assert len(buckets) == len(BUCKETS) + 1
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1] == 'ai_mcp_tool_seconds_bucket{tool="get_status",le="+Inf"} 4'
+    assert counts[-2] == 3
+    assert 'ai_mcp_tool_seconds_count{tool="get_status"} 4' in lines
+    assert 'ai_mcp_tool_seconds_sum{tool="get_status"} 1000.503000' in lines
+    assert 'ai_mcp_tool_errors_total{tool="get_status"} 3' in lines
+    assert text.endswith("\n")
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.inc("bridge_errors_total", command='say "hi"\\now')
+    assert 'ai_mcp_bridge_errors_total{command="say \\"hi\\"\\\\now"} 1' in registry.to_prometheus()
+
+
+def test_snapshot_filters_by_prefix():
+    registry = MetricsRegistry()
+    registry.observe("tool_seconds", 0.01, tool="a")
+    registry.observe("socket_roundtrip_seconds", 0.01, platform="rhino")
+    registry.inc("tool_errors_total", tool="a")
+    snapshot = registry.snapshot("tool_")
+    assert list(snapshot["histograms"]) == ["tool_seconds"]
+    assert snapshot["histograms"]["tool_seconds"][0]["labels"] == {"tool": "a"}
+    assert snapshot["counters"]["tool_errors_total"] == [{"labels": {"tool": "a"}, "value": 1}]
+
+
+async def test_timed_tool_counts_error_replies():
+    @timed_tool
+    async def metrics_test_tool(fail: bool = False) -> str:
+        return "Error: failed" if fail else "ok"
+
+    errors = metrics.counter("tool_errors_total", tool="metrics_test_tool")
+    await metrics_test_tool()
+    await metrics_test_tool(fail=True)
+    assert metrics.counter("tool_errors_total", tool="metrics_test_tool") == errors + 1
+    assert metrics.histogram("tool_seconds", tool="metrics_test_tool").count >= 2
+
+
+async def test_served_and_written_exposition(tmp_path):
+    registry = MetricsRegistry()
+    registry.inc("bridge_reconnects_total", platform="rhino")
+    server = await serve_prometheus("127.0.0.1", 0, registry)
+    try:
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+    head, body = response.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert body.decode() == registry.to_prometheus()
+
+    path = tmp_path / "metrics" / "ai_mcp.prom"
+    write_prometheus(path, registry)
+    assert path.read_text(encoding="utf-8") == registry.to_prometheus()
+    assert not path.with_suffix(".prom.tmp").exists()
+
+
+async def test_bridge_commands_are_timed(rhino_bridge):
+    roundtrips = metrics.histogram("socket_roundtrip_seconds", platform="rhino", command="get_document_info")
+    before = roundtrips.count if roundtrips else 0
+    await rhino_bridge.send_command("get_document_info", {})
+    roundtrips = metrics.histogram("socket_roundtrip_seconds", platform="rhino", command="get_document_info")
+    assert roundtrips.count == before + 1
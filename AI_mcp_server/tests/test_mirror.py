@@ -0,0 +1,38 @@
+"""
+Local Rhino document mirror under slow and limited plugins
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.mark.simulator(objects=10)
+@pytest.mark.bridge(deadlines={"get_document_changes": 0.3, "get_document_hash": 0.3},
+                    mirror_verify_interval=0.01)
+async def test_timeout_does_not_disable_deltas(rhino_bridge, rhino_simulator):
+    mirror = rhino_bridge.mirror
+    await mirror.refresh(force=True)
+
+    rhino_simulator.options.command_latency = {"get_document_changes": 1.0, "get_document_hash": 1.0}
+    mirror.mark_stale()
+    with pytest.raises(asyncio.TimeoutError):
+        await mirror.refresh(force=True)
+    assert mirror.deltas_supported is not False
+    assert mirror.hash_supported is not False
+
+    rhino_simulator.options.command_latency = {}
+    await asyncio.sleep(1.0)
+    await mirror.refresh(force=True)
+    assert mirror.deltas_supported is True
+
+
+@pytest.mark.simulator(objects=10)
+async def test_rejected_deltas_fall_back_to_snapshots(rhino_bridge, rhino_simulator):
+    rhino_simulator.handle_get_document_changes = None
+    mirror = rhino_bridge.mirror
+    await mirror.refresh(force=True)
+    mirror.mark_stale()
+    await mirror.refresh(force=True)
+    assert mirror.deltas_supported is False
+    assert len(mirror.objects) == 10
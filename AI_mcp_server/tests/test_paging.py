@@ -0,0 +1,27 @@
+"""
+Paged listings, with and without plugin support for paging
+"""
+
+import pytest
+
+
+async def collect(bridge, page_size: int) -> list:
+    ids = []
+    async for page in bridge.iter_document_pages(page_size):
+        assert len(page.items) <= page_size
+        ids.extend(obj["id"] for obj in page.items)
+    return ids
+
+
+@pytest.mark.simulator(objects=5000, paging=False)
+async def test_ignored_paging_fetches_listing_once(rhino_bridge, rhino_simulator):
+    ids = await collect(rhino_bridge, 500)
+    assert len(ids) == len(set(ids)) == 5000
+    assert rhino_simulator.commands["get_document_info"] == 1
+
+
+@pytest.mark.simulator(objects=5000)
+async def test_paging_fetches_one_page_per_call(rhino_bridge, rhino_simulator):
+    ids = await collect(rhino_bridge, 500)
+    assert len(ids) == len(set(ids)) == 5000
+    assert rhino_simulator.commands["get_document_info"] == 10
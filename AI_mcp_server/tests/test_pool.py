@@ -0,0 +1,70 @@
+"""
+Connection pool checkout while connections are being opened
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from ai_mcp_server.bridges.connection_pool import ConnectionPool
+from ai_mcp_server.bridges.rhino_bridge import RhinoBridge
+from ai_mcp_server.core.config import RhinoConfig
+
+
+def make_bridge(simulator, **settings) -> RhinoBridge:
+    config = RhinoConfig(host=simulator.host, port=simulator.port, heartbeat_interval=0, **settings)
+    return RhinoBridge(config, logging.getLogger("rhino_bridge"))
+
+
+@pytest.mark.simulator(command_latency={"negotiate": 0.2})
+async def test_command_during_warm_up_waits_for_the_connection(rhino_simulator):
+    bridge = make_bridge(rhino_simulator, pipelining=True)
+    warm_up = asyncio.create_task(bridge.connect())
+    await asyncio.sleep(0.05)
+    try:
+        started = time.perf_counter()
+        assert (await bridge.send_command("ping", {}, timeout=2.0))["message"] == "pong"
+        assert time.perf_counter() - started < 1.0
+        assert await warm_up
+        assert rhino_simulator.accepted == 1
+    finally:
+        await bridge.cleanup()
+
+
+@pytest.mark.simulator(command_latency={"negotiate": 1.0})
+async def test_failed_warm_up_wakes_waiting_commands(rhino_simulator):
+    bridge = make_bridge(rhino_simulator, pipelining=True, timeout=0.2, auto_reconnect=False)
+    bridge.retry.max_retries = 0
+    warm_up = asyncio.create_task(bridge.connect())
+    await asyncio.sleep(0.05)
+    try:
+        started = time.perf_counter()
+        with pytest.raises((ConnectionError, asyncio.TimeoutError)):
+            await bridge.send_command("ping", {}, timeout=5.0)
+        assert time.perf_counter() - started < 1.0
+        assert not await warm_up
+    finally:
+        await bridge.cleanup()
+
+
+async def test_acquire_gives_up_at_timeout(rhino_simulator):
+    pool = ConnectionPool(RhinoConfig(host=rhino_simulator.host, port=rhino_simulator.port),
+                          logging.getLogger("pool"))
+    try:
+        connection = await pool.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire(timeout=0.1)
+        await pool.release(connection)
+        assert await pool.acquire(timeout=0.1) is connection
+    finally:
+        await pool.close()
+
+
+@pytest.mark.bridge(pool_size=3)
+async def test_pool_opens_connections_up_to_its_size(rhino_bridge, rhino_simulator):
+    rhino_simulator.options.latency = 0.1
+    await asyncio.gather(*(rhino_bridge.send_command("ping", {}) for _ in range(6)))
+    assert rhino_bridge._pool.open_connections == 3
+    assert rhino_simulator.accepted == 3
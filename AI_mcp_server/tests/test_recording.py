@@ -0,0 +1,100 @@
+"""
+Session recording and its replay against the simulators
+"""
+
+import pytest
+
+from ai_mcp_server.benchmark.replay import load_trace, run_replay
+from ai_mcp_server.core.server import AIServer
+from ai_mcp_server.simulator import SimulatorOptions
+from ai_mcp_server.utils.recording import SessionRecorder, read_recording, recorder
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Path the process-wide recorder writes to during the test"""
+    path = tmp_path / "session.jsonl"
+    recorder.configure(path)
+    yield path
+    recorder.configure(None)
+
+
+@pytest.mark.parametrize("name", ["session.jsonl", "session.jsonl.gz"])
+async def test_records_nest_bridge_commands_under_tool_calls(tmp_path, name):
+    session = SessionRecorder()
+    session.configure(tmp_path / name)
+    with session.call("tool", "get_status", {"verbose": True}) as tool_call:
+        with session.call("bridge", "ping", {}, platform="rhino") as command:
+            command.response = {"message": "pong"}
+        tool_call.response = "ok"
+    with pytest.raises(RuntimeError):
+        with session.call("bridge", "ping", {}, platform="grasshopper"):
+            raise RuntimeError("connection lost")
+    await session.flush()
+
+    header, ping, tool, failed = read_recording(tmp_path / name)
+    assert header["layers"] == ["bridge", "tool"]
+    assert (tool["seq"], tool["parent"], tool["params"]) == (1, None, {"verbose": True})
+    assert (ping["seq"], ping["parent"], ping["platform"]) == (2, 1, "rhino")
+    assert ping["response_bytes"] == len(b'{"message":"pong"}')
+    assert tool["response_bytes"] == 2
+    assert (failed["parent"], failed["status"], failed["error"]) == (None, "error", "connection lost")
+
+
+async def test_unrecorded_layers_and_overflow(tmp_path):
+    session = SessionRecorder(max_pending=2)
+    with pytest.raises(ValueError):
+        session.configure(tmp_path / "session.jsonl", ["tool", "socket"])
+    session.configure(tmp_path / "session.jsonl", ["tool"])
+    with session.call("bridge", "ping") as command:
+        assert command is None
+    for _ in range(3):
+        with session.call("tool", "get_status"):
+            pass
+    assert session.dropped == 2
+    await session.flush()
+    assert [entry.get("name") for entry in read_recording(tmp_path / "session.jsonl")] == [None, "get_status"]
+
+
+async def test_sessions_in_one_file_are_laid_end_to_end(tmp_path):
+    path = tmp_path / "session.jsonl"
+    session = SessionRecorder()
+    for _ in range(2):
+        session.configure(path, ["bridge"])
+        with session.call("bridge", "ping", {}, platform="rhino"):
+            pass
+        await session.flush()
+
+    layer, records = load_trace(path)
+    assert layer == "bridge"
+    first, second = records
+    assert second["at"] >= first["at"] + first["duration_ms"] / 1000
+    assert load_trace(path, "tool") == ("tool", [])
+
+
+async def test_recorded_tool_calls_replay_against_simulators(simulated_config, recording):
+    server = AIServer(simulated_config)
+    try:
+        for kind in ("SPHERE", "BOX"):
+            await server.mcp_server.call_tool("create_rhino_object", {"type": kind})
+        await server.mcp_server.call_tool("get_rhino_document_info", {})
+        await recorder.flush()
+    finally:
+        await server.rhino_bridge.cleanup()
+        await server.grasshopper_bridge.cleanup()
+
+    layer, records = load_trace(recording)
+    assert layer == "tool"
+    assert [record["name"] for record in records] == ["create_rhino_object"] * 2 + ["get_rhino_document_info"]
+    # Arguments equal to their defaults are left out, as FastMCP fills them in again
+    assert [record["params"] for record in records[:2]] == [{"type": "SPHERE"}, {}]
+    tool_seqs = {record["seq"] for record in records}
+    bridge = [entry for entry in read_recording(recording) if entry.get("layer") == "bridge"]
+    assert bridge and all(entry["parent"] in tool_seqs for entry in bridge)
+
+    report = await run_replay(records, layer, options=SimulatorOptions(), speed=0)
+    assert report.calls == 3
+    assert {result.name: (result.iterations, result.errors) for result in report.replayed} == {
+        "create_rhino_object": (2, 0), "get_rhino_document_info": (1, 0),
+    }
+    assert [result.name for result in report.recorded] == [result.name for result in report.replayed]
@@ -0,0 +1,129 @@
+"""
+Retry backoff and circuit breaking, on their own and over the simulated Rhino plugin
+"""
+
+import logging
+
+import pytest
+import pytest_asyncio
+
+from ai_mcp_server.bridges import resilience
+from ai_mcp_server.bridges.resilience import Backoff, CircuitBreaker, CircuitOpenError, RetryPolicy
+from ai_mcp_server.bridges.rhino_bridge import RhinoBridge
+from ai_mcp_server.core.config import RhinoConfig
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+@pytest_asyncio.fixture
+async def bridge(rhino_simulator):
+    """Rhino bridge retrying twice, quickly, with its breaker opening at the third failure"""
+    config = RhinoConfig(host=rhino_simulator.host, port=rhino_simulator.port,
+                         auto_reconnect=False, heartbeat_interval=0)
+    policy = RetryPolicy(max_retries=2, retry_delay=0.01, max_delay=0.05, failure_threshold=3, reset_timeout=10.0)
+    bridge = RhinoBridge(config, logging.getLogger("rhino_bridge"), policy)
+    await bridge.initialize()
+    yield bridge
+    await bridge.cleanup()
+
+
+def test_backoff_doubles_up_to_the_cap():
+    backoff = Backoff(0.5, 4.0)
+    assert [backoff.ceiling(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+    assert backoff.ceiling(1000) == 4.0
+    assert all(0 <= backoff.delay(attempt) <= backoff.ceiling(attempt) for attempt in range(50))
+    assert Backoff(2.0, 1.0).cap == 2.0
+
+
+def test_breaker_opens_at_the_threshold_and_rejects(clock):
+    breaker = CircuitBreaker("rhino", RetryPolicy(failure_threshold=3, reset_timeout=5.0))
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected == 1
+    # Never open for less than the reset timeout
+    clock.now += 4.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker("rhino", RetryPolicy(failure_threshold=1, reset_timeout=5.0, max_delay=60.0))
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now += 6.25
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # A failed probe opens the circuit again, for twice as long
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 9.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 2.7
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.to_dict() == {"state": "closed", "consecutive_failures": 0, "retry_in_s": None, "rejected": 2}
+
+
+def test_cancelled_probe_frees_the_slot(clock):
+    breaker = CircuitBreaker("rhino", RetryPolicy(failure_threshold=1, reset_timeout=5.0))
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now += 6.25
+    breaker.before_call()
+    breaker.abandon()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+@pytest.mark.simulator(drop_rate=1.0, fault_commands={"get_document_info", "create_object"})
+async def test_only_idempotent_commands_are_retried(bridge, rhino_simulator):
+    with pytest.raises(ConnectionError):
+        await bridge.send_command("create_object", {"type": "BOX"})
+    assert rhino_simulator.commands["create_object"] == 1
+
+    with pytest.raises(ConnectionError):
+        await bridge.send_command("get_document_info", {})
+    # The breaker opened at the third failure, which ended the retries
+    assert rhino_simulator.commands["get_document_info"] == 2
+    assert bridge.breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.simulator(drop_rate=1.0, fault_commands={"get_document_info"})
+async def test_open_circuit_fails_without_touching_the_network(bridge, rhino_simulator):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await bridge.send_command("get_document_info", {})
+    sent = rhino_simulator.commands["get_document_info"]
+
+    with pytest.raises(CircuitOpenError):
+        await bridge.send_command("get_document_info", {})
+    with pytest.raises(CircuitOpenError):
+        await bridge.send_command("create_object", {"type": "BOX"})
+    assert rhino_simulator.commands["get_document_info"] == sent
+    assert rhino_simulator.commands["create_object"] == 0
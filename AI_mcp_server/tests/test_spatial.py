@@ -0,0 +1,105 @@
+"""
+R-tree window, crossing and nearest queries against brute force
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from ai_mcp_server.local.spatial import SpatialIndex, object_bounds
+
+
+def make_objects(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    objects = []
+    for index in range(count):
+        low = [rng.uniform(0, 1000) for _ in range(3)]
+        high = [value + rng.uniform(0, 20) for value in low]
+        objects.append({
+            "id": f"obj{index}",
+            "type": rng.choice(["BOX", "SPHERE"]),
+            "layer": rng.choice(["Walls", "Floors"]),
+            "bounding_box": [low, high],
+        })
+    return objects
+
+
+def distance_sq(bounds, point) -> float:
+    return sum(max(bounds[axis] - point[axis], 0.0, point[axis] - bounds[axis + 3]) ** 2 for axis in range(3))
+
+
+@pytest.fixture(scope="module")
+def objects():
+    return make_objects(2000)
+
+
+@pytest.fixture(scope="module")
+def index(objects):
+    return SpatialIndex(objects)
+
+
+def test_window_and_crossing_match_brute_force(objects, index):
+    query = (200.0, 300.0, 100.0, 500.0, 600.0, 700.0)
+    boxes = {obj["id"]: object_bounds(obj) for obj in objects}
+    inside = {i for i, b in boxes.items() if all(query[a] <= b[a] and b[a + 3] <= query[a + 3] for a in range(3))}
+    touching = {i for i, b in boxes.items() if all(b[a] <= query[a + 3] and query[a] <= b[a + 3] for a in range(3))}
+    assert inside and touching > inside
+    assert set(index.window(query)) == inside
+    assert set(index.crossing(query)) == touching
+
+
+def test_nearest_matches_brute_force(objects, index):
+    point = (500.0, 500.0, 500.0)
+    distances = sorted(distance_sq(object_bounds(obj), point) for obj in objects)
+    found = index.nearest(point, 10)
+    by_id = {obj["id"]: obj for obj in objects}
+    assert [distance_sq(object_bounds(by_id[i]), point) for i in found] == distances[:10]
+
+
+def test_filters_by_layer_and_type(objects, index):
+    expected = sorted(obj["id"] for obj in objects if obj["layer"] == "Walls" and obj["type"] == "BOX")
+    assert index.select("walls", "box") == expected
+    query = (0.0, 0.0, 0.0, 1000.0, 1000.0, 1000.0)
+    assert set(index.crossing(query, "Walls", "BOX")) <= set(expected)
+    assert all(i in expected for i in index.nearest((0, 0, 0), 20, "Walls", "BOX"))
+
+
+def test_bounding_box_formats():
+    expected = (0.0, 1.0, 2.0, 3.0, 4.0, 5.0)
+    assert object_bounds({"bounding_box": [[0, 1, 2], [3, 4, 5]]}) == expected
+    assert object_bounds({"bbox": {"min": [0, 1, 2], "max": [3, 4, 5]}}) == expected
+    assert object_bounds({"bounding_box": [0, 1, 2, 3, 4, 5]}) == expected
+    assert object_bounds({"bounding_box": "invalid"}) is None
+    assert object_bounds({}) is None
+
+
+def test_objects_without_bounds_are_only_selectable():
+    index = SpatialIndex([{"id": "a", "layer": "L"}, {"id": "b", "bounding_box": [[0, 0, 0], [1, 1, 1]]}])
+    assert index.select("L") == ["a"]
+    assert index.crossing((0, 0, 0, 1, 1, 1)) == ["b"]
+    assert index.nearest((0, 0, 0), 5) == ["b"]
+
+
+@pytest.mark.simulator(objects=50)
+async def test_selecting_found_objects_keeps_cache_and_mirror(rhino_bridge, rhino_simulator):
+    object_ids = await rhino_bridge.find_objects(near=[0, 0, 0], count=5)
+    await rhino_bridge.get_object_info(object_ids[0])
+    invalidations = rhino_bridge.cache_stats.invalidations
+    snapshots = rhino_bridge.mirror.snapshots
+
+    await rhino_bridge.select_object_ids(object_ids)
+    assert rhino_simulator.commands["execute_rhinoscript_python_code"] == 1
+    assert rhino_bridge.cache_stats.invalidations == invalidations
+    assert await rhino_bridge.find_objects(near=[0, 0, 0], count=5) == object_ids
+    await rhino_bridge.get_object_info(object_ids[0])
+    assert rhino_simulator.commands["get_object_info"] == 1
+    assert rhino_bridge.mirror.snapshots == snapshots
+    assert rhino_simulator.commands["get_document_changes"] == 0
+
+
+@pytest.mark.simulator(command_latency={"execute_rhinoscript_python_code": 1.0})
+@pytest.mark.bridge(deadlines={"quick": 0.2})
+async def test_selection_runs_under_the_quick_deadline(rhino_bridge):
+    with pytest.raises(asyncio.TimeoutError):
+        await rhino_bridge.select_object_ids(["a"])
@@ -0,0 +1,96 @@
+"""
+Diff-based sync between the simulated Rhino and Grasshopper plugins
+"""
+
+import logging
+
+import pytest
+
+from ai_mcp_server.local.sync import SyncEngine, SyncState, fingerprint
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / "sync_state.json"
+
+
+@pytest.fixture
+def engine(rhino_bridge, grasshopper_bridge, state_path):
+    return SyncEngine(rhino_bridge, grasshopper_bridge, logging.getLogger("sync"), state_path, batch_size=2)
+
+
+def test_fingerprint_ignores_volatile_fields():
+    obj = {"id": "a", "type": "BOX", "name": "box", "version": 1, "selected": False}
+    assert fingerprint(obj) == fingerprint(dict(obj, id="b", version=7, selected=True))
+    assert fingerprint(obj) != fingerprint(dict(obj, name="renamed"))
+
+
+@pytest.mark.simulator(objects=5)
+async def test_unchanged_documents_send_nothing(engine, rhino_bridge, grasshopper_simulator, state_path):
+    report = await engine.sync("rhino_to_grasshopper")
+    assert (report.added, report.errors) == (5, [])
+    assert len(grasshopper_simulator.components) == 5
+    envelopes = grasshopper_simulator.commands["batch"]
+    assert envelopes == 3
+
+    report = await engine.sync("rhino_to_grasshopper")
+    assert (report.added, report.unchanged) == (0, 5)
+    assert grasshopper_simulator.commands["batch"] == envelopes
+
+    # The mapping survives a restart
+    restarted = SyncEngine(rhino_bridge, engine.grasshopper_bridge, logging.getLogger("sync"), state_path)
+    report = await restarted.sync("rhino_to_grasshopper")
+    assert (report.added, report.unchanged) == (0, 5)
+    assert grasshopper_simulator.commands["batch"] == envelopes
+
+
+@pytest.mark.simulator(objects=3)
+async def test_removed_and_retyped_sources(engine, rhino_bridge, rhino_simulator, grasshopper_simulator):
+    await engine.sync("rhino_to_grasshopper")
+    first, second, _ = list(rhino_simulator.objects)
+    await rhino_bridge.delete_object(first)
+    await rhino_bridge.modify_object(second, {"name": "renamed"})
+    rhino_simulator.objects[second]["type"] = "SPHERE"
+    rhino_bridge.mirror.mark_stale()
+
+    report = await engine.sync("rhino_to_grasshopper")
+    assert (report.deleted, report.updated, report.unchanged, report.errors) == (1, 1, 1, [])
+    assert sorted(c["type"] for c in grasshopper_simulator.components.values()) == ["Box", "Sphere"]
+
+
+async def test_changed_components_update_rhino_objects(engine, rhino_simulator, grasshopper_bridge):
+    await grasshopper_bridge.add_component("Sphere", 0, 0)
+    report = await engine.sync("grasshopper_to_rhino")
+    assert report.added == 1
+    assert [obj["type"] for obj in rhino_simulator.objects.values()] == ["SPHERE"]
+
+    report = await engine.sync("grasshopper_to_rhino")
+    assert (report.added, report.updated, report.unchanged) == (0, 0, 1)
+    assert rhino_simulator.commands["create_object"] + rhino_simulator.commands["batch"] == 1
+
+
+@pytest.mark.simulator(objects=4)
+async def test_missing_delete_command_is_not_retried(engine, rhino_bridge, rhino_simulator,
+                                                     grasshopper_simulator, state_path):
+    grasshopper_simulator.handle_delete_component = None
+    await engine.sync("rhino_to_grasshopper")
+    removed = list(rhino_simulator.objects)[:2]
+    for object_id in removed:
+        await rhino_bridge.delete_object(object_id)
+
+    report = await engine.sync("rhino_to_grasshopper")
+    assert report.left == 2
+    assert report.errors == ["Grasshopper does not support delete_component; 2 targets left in place"]
+    assert grasshopper_simulator.commands["delete_component"] == 1
+    assert engine.deletes_supported["rhino_to_grasshopper"] is False
+
+    report = await engine.sync("rhino_to_grasshopper")
+    assert (report.left, report.errors, report.unchanged) == (0, [], 2)
+
+    # Also after a restart, once the state is read back
+    restarted = SyncEngine(rhino_bridge, engine.grasshopper_bridge, logging.getLogger("sync"), state_path)
+    report = await restarted.sync("rhino_to_grasshopper")
+    assert (report.left, report.errors) == (0, [])
+    assert grasshopper_simulator.commands["delete_component"] == 1
+    state = SyncState(state_path)
+    state.load()
+    assert len(next(iter(state.mappings.values()))["left"]) == 2
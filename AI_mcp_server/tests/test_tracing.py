@@ -0,0 +1,39 @@
+"""
+Tracing spans around bridge commands
+"""
+
+import asyncio
+
+import pytest
+
+from ai_mcp_server.utils.tracing import SpanExporter, tracer
+
+
+class MemoryExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemoryExporter()
+    tracer.configure(1.0, exporter)
+    yield exporter
+    tracer.configure(0.0, None)
+
+
+@pytest.mark.bridge(heartbeat_interval=0.05, pipelining=True)
+async def test_heartbeat_spans_stay_out_of_finished_traces(rhino_bridge, rhino_simulator, exporter):
+    with tracer.span("tool test") as root:
+        await rhino_bridge.send_command("ping", {})
+    await tracer.flush()
+    traced = len(exporter.spans)
+    assert {span.name for span in exporter.spans} >= {"send_command", "send", "recv"}
+
+    await asyncio.sleep(0.5)
+    await tracer.flush()
+    assert rhino_simulator.commands["ping"] > 3
+    assert not [span for span in exporter.spans[traced:] if span.trace_id == root.trace_id]